@@ -0,0 +1,660 @@
+"""
+Benchmarking tools for the parsing of IMPACT World+. The full IW+ source database is large and only released at
+specific times, which makes it impractical to track the runtime of the parser while developing. This module writes a
+synthetic SQLite database with the same tables and columns than the ones read by parse_iw.Parse, whose size is
+controlled by a scale factor, and times each step of the parsing on it at several scales. The runtimes are stored in a
+JSON report, along with the scaling exponent of each step (i.e., how its runtime grows with the scale factor), so that
+a step whose runtime grows quadratically stands out before a release.
+
+Usage:
+    python benchmark_iw.py --scales 1 2 4 --output benchmarks.json
+
+file name: benchmark_iw.py
+python version= 3.9
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import sys
+import json
+import math
+import time
+import sqlite3
+import logging
+import argparse
+import functools
+import platform
+import tempfile
+import uuid
+import pkg_resources
+from datetime import datetime
+
+from parse_iw import Parse, AGGREGATED_CF_TABLES, read_data_file
+
+# columns of the tables that are already in the IW+ format (i.e., the format of master_db)
+IW_COLUMNS = ['Impact category', 'CF unit', 'Compartment', 'Sub-compartment', 'Elem flow name', 'CAS number',
+              'CF value', 'Elem flow unit', 'MP or Damage', 'Native geographical resolution scale']
+
+# real ecoinvent regions, so that the linking steps have regionalized flows to match
+COUNTRIES = {'France': 'FR', 'Spain': 'ES', 'Norway': 'NO', 'Russia': 'RU', 'United Kingdom': 'GB', 'Andorra': 'AD',
+             'United States': 'US', 'Canada': 'CA', 'Mexico': 'MX', 'Brazil': 'BR', 'Chile': 'CL', 'China': 'CN',
+             'India': 'IN', 'Indonesia': 'ID', 'Japan': 'JP', 'Saudi Arabia': 'SA', 'Australia': 'AU', 'Gabon': 'GA',
+             'Kenya': 'KE', 'Somalia': 'SO', 'Uganda': 'UG', 'South Africa': 'ZA'}
+CONTINENTS = {'Europe': ('RER', ['France', 'Spain', 'Norway', 'Russia', 'United Kingdom', 'Andorra']),
+              'North America': ('RNA', ['United States', 'Canada']),
+              'Latin America': ('RLA', ['Mexico', 'Brazil', 'Chile']),
+              'Asia': ('RAS', ['China', 'India', 'Indonesia', 'Japan', 'Saudi Arabia']),
+              'Oceania': ('OCE', ['Australia']),
+              'Africa': ('RAF', ['Gabon', 'Kenya', 'Somalia', 'Uganda', 'South Africa'])}
+# countries of which the PM CFs are only given for sub-regions in the source database
+PM_AGGREGATED_COUNTRIES = ['Gabon', 'Kenya', 'Somalia', 'Uganda', 'South Africa', 'Russia', 'Norway', 'Spain',
+                           'United Kingdom', 'Mexico', 'Saudi Arabia', 'Canada', 'United States', 'Australia', 'Brazil',
+                           'China', 'India', 'Indonesia']
+
+# resources linked to the EXIOBASE extensions (see Parse.link_to_exiobase() and Parse.special_case_minerals_exiobase())
+EXIOBASE_FOSSILS = ['Oil, crude', 'Gas, natural/m3', 'Coal, hard', 'Coal, brown', 'Peat', 'Uranium',
+                    'Wood, hard, standing', 'Wood, soft, standing']
+EXIOBASE_MINERALS = ['Bauxite', 'Clay, unspecified', 'Gravel', 'Limestone', 'Salt, unspecified', 'Slate', 'Dolomite',
+                     'Gypsum', 'Phosphate ore', 'Tin', 'Magnesium', 'Gold', 'Lead', 'Copper', 'Silver', 'Iron',
+                     'Nickel', 'Zinc', 'Platinum', 'Perlite', 'Granite', 'Sand, quartz', 'Feldspar',
+                     'Metamorphous rock, graphite containing', 'Magnesium carbonate', 'Talc (Mg3H2(SiO3)4)',
+                     'Diatomite', 'Vermiculite', 'Basalt', 'Peat', 'Strontium', 'Pumice', 'Calcite']
+# data files of the package that are not distributed with it, replaced by synthetic versions when missing
+SYNTHETIC_DATA_FILES = ['Data/mappings/oLCA/v2.5/all_stressors.xlsx',
+                        'Data/mappings/exiobase/Mineral_extension_exio_detailed_2016.xlsx',
+                        'Data/mappings/exiobase/other_metals_matching.xlsx']
+# last stage of load_cfs() running the load_*_cfs loaders, the ones run in a process pool with n_jobs > 1
+LAST_LOADER_STAGE = 'fisheries'
+# steps of Parse timed after load_cfs(): (method, True for the brightway steps, path of the file or folder written by
+# the method in the output folder, None if it writes no file)
+EXPORT_STEPS = [('export_to_bw', True, None), ('export_to_sp', False, None), ('write_sp_files', False, ''),
+                ('export_to_olca_zip', False, 'impact_world_plus.zip')]
+
+
+# -------------------------------------------- Synthetic database ----------------------------------------------------
+def write_synthetic_database(path, scale=1, seed=0):
+    """
+    Writes a synthetic version of the IW+ source database. The database contains all the tables read by
+    parse_iw.Parse, with the same columns, and random CFs. The number of substances, regions, cities, species, etc.
+    is proportional to scale.
+    :param path: path of the SQLite database to create, overwritten if it exists
+    :param scale: scale factor of the number of rows of the tables
+    :param seed: seed of the random generator, the same seed and scale always produce the same database
+    :return: dictionary of the number of rows of each table
+    """
+
+    rng = np.random.default_rng(seed)
+    tables = synthetic_tables(rng, scale)
+
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    try:
+        for name, df in tables.items():
+            df.to_sql(name, conn, index=False)
+    finally:
+        conn.close()
+
+    return {name: len(df) for name, df in tables.items()}
+
+
+def synthetic_tables(rng, scale):
+    """
+    :param rng: numpy random generator
+    :param scale: scale factor of the number of rows of the tables
+    :return: dictionary of the synthetic tables, indexed by table name
+    """
+
+    def cfs(n):
+        return rng.lognormal(mean=-2, sigma=2, size=n)
+
+    regions = synthetic_regions(scale)
+    substances = synthetic_substances(scale)
+    tables = {}
+
+    # ------------------------------------------- Mappings ---------------------------------------------------------
+    tables['SI - Mapping with elementary flows'] = pd.DataFrame({
+        'Name IW+': substances.loc[:, 'name'],
+        'CAS IW+': substances.loc[:, 'cas'],
+        'CAS-Usetox2_FW': substances.loc[:, 'cas'],
+        'CAS-Usetox2_Mar_Terr': substances.loc[:, 'cas'],
+        'Name-ipcc': substances.loc[:, 'ipcc'].where(substances.loc[:, 'ghg']),
+        'Name-ODP': substances.loc[:, 'name'].where(substances.loc[:, 'ods']),
+        'Name-photochem': substances.loc[:, 'name'].where(substances.loc[:, 'voc'])})
+
+    tables['SI - Mapping with regions of ecoinvent'] = pd.DataFrame({
+        'Ecoinvent_short_name': regions.loc[:, 'ecoinvent'],
+        'PM': regions.loc[:, 'pm'],
+        'AWARE': regions.loc[:, 'aware']})
+    tables['SI - Mapping countries to continents'] = pd.DataFrame({
+        'country': regions.loc[:, 'ecoinvent'], 'continent': regions.loc[:, 'continent']})
+
+    # ------------------------------------- Not regionalized categories ----------------------------------------------
+    non_toxic = substances.loc[~substances.loc[:, 'toxic']]
+    toxic = substances.loc[substances.loc[:, 'toxic']]
+    tables['CF - not regionalized - IonizingRadiations'] = iw_table(rng, non_toxic.iloc[-10 * scale:], [
+        ('Ionizing radiations', 'kBq Co-60 eq', 'Midpoint'), ('Ionizing radiations, human health', 'DALY', 'Damage'),
+        ('Ionizing radiations, ecosystem quality', 'PDF.m2.yr', 'Damage')], ['Air', 'Water'], unit='kBq')
+    tables['CF - not regionalized - MarineAcidification'] = iw_table(rng, substances.loc[substances.loc[:, 'acid']], [
+        ('Marine acidification, short term', 'PDF.m2.yr', 'Damage'),
+        ('Marine acidification, long term', 'PDF.m2.yr', 'Damage')], ['Air'])
+    tables['CF - not regionalized - FossilResources'] = iw_table(rng, pd.DataFrame({
+        'name': EXIOBASE_FOSSILS + ['Wood, primary forest'] + ['Fossil fuel %d' % i for i in range(5 * scale)],
+        'cas': None}), [('Fossil and nuclear energy use', 'MJ deprived', 'Midpoint')], ['Raw'])
+    tables['CF - not regionalized - MineralResources'] = iw_table(rng, pd.DataFrame({
+        'name': EXIOBASE_MINERALS + [metal for metal in other_metals().index if metal not in EXIOBASE_MINERALS] +
+                ['Mineral %d' % i for i in range(20 * scale)], 'cas': None}), [
+        ('Mineral resources use', 'kg deprived', 'Midpoint')], ['Raw'], sub_compartment='in ground')
+    # the damage CFs of toxicity are split between short and long term, as the ones of the real database
+    for table, categories, midpoint_unit, damage_unit in [
+            ('HumanTox', ['Human toxicity cancer', 'Human toxicity non-cancer'], 'CTUh', 'DALY'),
+            ('FreshwaterEcotox', ['Freshwater ecotoxicity'], 'CTUe', 'PDF.m2.yr'),
+            ('MarineEcotox', ['Marine ecotoxicity'], None, 'PDF.m2.yr'),
+            ('TerrestrialEcotox', ['Terrestrial ecotoxicity'], None, 'PDF.m2.yr')]:
+        tables['CF - not regionalized - ' + table] = iw_table(rng, toxic, [
+            (category + term, unit, level) for category in categories
+            for term, unit, level in [('', midpoint_unit, 'Midpoint'), (', short term', damage_unit, 'Damage'),
+                                      (', long term', damage_unit, 'Damage')] if unit],
+            ['Air', 'Water', 'Soil'])
+
+    ghgs = substances.loc[substances.loc[:, 'ghg']]
+    indicators = ['Radiative Efficiency (W/m2/ppb)', 'AGWP-20 (pW/m2/yr/kg)', 'GWP-20', 'AGWP-100 (pW/m2/yr/kg)',
+                  'GWP-100', 'AGWP-500 (pW/m2/yr/kg)', 'GWP-500', 'AGTP-50 (pK/kg)', 'GTP-50', 'AGTP-100 (pK/kg)',
+                  'GTP-100']
+    # the CFs of carbon monoxide are derived from the ones of carbon dioxide by the parser
+    names = ghgs.loc[ghgs.loc[:, 'ipcc'] != 'Carbon monoxide', 'ipcc'].unique()
+    climate = pd.DataFrame({'Name': names, 'Formula': 'X', 'Lifetime (yr)': rng.uniform(1, 500, len(names))})
+    for indicator in indicators:
+        climate.loc[:, indicator] = cfs(len(names))
+    tables['CF - not regionalized - ClimateChange'] = climate
+    # the damage CFs of biogenic methane are derived from the ones of fossil methane by the parser
+    fate_ghgs = ghgs.loc[ghgs.loc[:, 'name'] != 'Methane, biogenic']
+    fate_factors = pd.DataFrame(cfs((len(fate_ghgs), 201)) * 1e-15, columns=[str(year) for year in range(201)])
+    fate_factors.insert(0, 'CAS IW+', fate_ghgs.loc[:, 'cas'].tolist())
+    fate_factors.insert(0, 'Name IW+', fate_ghgs.loc[:, 'name'].tolist())
+    tables['SI - Climate change - fate factors (K/kg)'] = fate_factors
+    tables['SI - Climate change - effect factors'] = pd.DataFrame({
+        'index': ['Total'], 'Human health (DALY/K/yr)': cfs(1),
+        'Ecosystem quality - terrestrial species (PDF.m2/K/yr)': cfs(1),
+        'Ecosystem quality - marine species (PDF.m2/K/yr)': cfs(1)})
+
+    ods = substances.loc[substances.loc[:, 'ods']]
+    tables['CF - not regionalized - OzoneLayerDepletion'] = pd.DataFrame({
+        'index': ods.loc[:, 'name'], 'CAS': ods.loc[:, 'cas'], 'ODP (infinite)': cfs(len(ods))})
+
+    vocs = substances.loc[substances.loc[:, 'voc']]
+    tables['CF - not regionalized - PhotochemOxid'] = pd.DataFrame({
+        'Substance name': vocs.loc[:, 'name'], 'CF HH (kg NOx-eq/kg)': cfs(len(vocs)),
+        'CF EQ (kg NOx-eq/kg)': cfs(len(vocs))})
+    tables['SI - Photochemical ozone formation - effect factors'] = pd.DataFrame({
+        'HH (DALY/kg NOx-eq)': cfs(1), 'EQ (species.yr/kg NOx-eq)': cfs(1),
+        'species density in ReCiPe (species/m2)': cfs(1)})
+
+    for table in ['ResourcesServicesDeficit', 'ResourcesServicesLossAdaptation']:
+        tables['CF - not regionalized - ' + table] = pd.DataFrame({
+            'Elem flow name': ['Element %d' % i for i in range(20 * scale)], 'CAS number': None,
+            'CF value': cfs(20 * scale), 'Status': 'element', 'Elem flow unit': 'kg'})
+
+    tables['CF - not regionalized - MarEutro'] = iw_table(rng, pd.DataFrame({
+        'name': ['Nitrate', 'Nitrite', 'Ammonium, ion', 'Nitrogen', 'Nitrogen, organic bound'], 'cas': None}), [
+        ('Marine eutrophication', 'kg N N-lim eq', 'Midpoint'), ('Marine eutrophication', 'PDF.m2.yr', 'Damage')],
+        ['Water'])
+
+    tables['CF - not regionalized - ThermallyPollutedWater'] = pd.DataFrame({'CF value': cfs(1)})
+
+    shapes = {'Beads/spheres': 1000, 'Film fragments': 100, 'Microfibers/cylinders': 10}
+    plastics = pd.DataFrame([(polymer, shape, size, comp, sub_comp)
+                             for polymer in ['EPS', 'HDPE', 'LDPE', 'PET', 'PP', 'PS', 'PVC', 'TRWP', 'Cotton']
+                             for shape, default_size in shapes.items()
+                             for size in [default_size, default_size * 5]
+                             for comp, sub_comp in [('Water', 'lake'), ('Water', 'ocean')]],
+                            columns=['Polymer type', 'Shape', 'Size', 'Compartment', 'Sub-compartment'])
+    plastics = pd.concat([plastics.assign(**{'CF unit': 'CTUe'}), plastics.assign(**{'CF unit': 'PDF.m2.yr'})])
+    plastics.loc[:, 'Recommended CF (geometric mean)'] = cfs(len(plastics))
+    for column in ['Geometric st.dev.', 'Lower limit 95% CI', 'Upper limit 95% CI']:
+        plastics.loc[:, column] = cfs(len(plastics))
+    plastics.loc[:, 'Elem flow unit'] = 'kg'
+    tables['CF - not regionalized - PhysicalImpactonBiota'] = plastics.reset_index(drop=True)
+
+    # --------------------------------------- Regionalized categories ------------------------------------------------
+    aggregated = pd.DataFrame({'Short name ecoinvent': list(regions.loc[:, 'ecoinvent']) + ['GLO', 'RoW']})
+    for category, table in [('Freshwater acidification', 'AcidFW'), ('Terrestrial acidification', 'AcidTerr'),
+                            ('Marine eutrophication', 'MarEutro'), ('Freshwater eutrophication', 'EutroFW')]:
+        spec = AGGREGATED_CF_TABLES[category]
+        df = aggregated.copy()
+        for flow, cas, molecule in spec['substances']:
+            for unit in [spec['midpoint unit'], 'PDF.m2.yr']:
+                df.loc[:, 'CF ' + molecule + ' (' + unit + ')'] = cfs(len(df))
+        tables['CF - regionalized - ' + table + ' - aggregated'] = df
+
+    tables['SI - Stoechiometry'] = pd.DataFrame([
+        ('Freshwater acidification', 'NH3', 'Air', 'Ammonium carbonate', '506-87-6', 0.35),
+        ('Freshwater acidification', 'NH3', 'Air', 'Ammonia, as N', '7664-41-7', 1.22),
+        ('Freshwater acidification', 'NOx', 'Air', 'Nitrogen dioxide', '10102-44-0', 1.0),
+        ('Freshwater acidification', 'SO2', 'Air', 'Sulfur trioxide', '7446-11-9', 0.8),
+        ('Terrestrial acidification', 'NH3', 'Air', 'Ammonium, ion', '14798-03-9', 0.94),
+        ('Terrestrial acidification', 'NOx', 'Air', 'Nitric oxide', '10102-43-9', 1.53),
+        ('Terrestrial acidification', 'SO2', 'Air', 'Sulfate', '14808-79-8', 0.67),
+        ('Marine eutrophication', 'NH3', 'Air', 'Ammonium nitrate', '6484-52-2', 0.43),
+        ('Marine eutrophication', 'HNO3', 'Air', 'Nitrate', '14797-55-8', 1.02),
+        ('Freshwater eutrophication', 'PO4', 'Water', 'Phosphorus', '7723-14-0', 3.07),
+        ('Freshwater eutrophication', 'PO4', 'Water', 'Phosphoric acid', '7664-38-2', 0.97)],
+        columns=['Impact category', 'Proxy molecule', 'Compartment', 'Elem flow name', 'CAS number', 'Proxy ratio'])
+
+    land_types = ['annual crops', 'permanent crops', 'pasture', 'pasture/meadow', 'artificial areas',
+                  'forest, intensive', 'forest, extensive', 'forest, used', 'unspecified'] + [
+        'land type %d' % i for i in range(4 * scale)]
+    land_regions = list(regions.loc[:, 'ecoinvent']) + ['GLO', 'RoW']
+    land_use = pd.DataFrame(
+        [('Occupation, ' + land + ', ' + region) for land in land_types for region in land_regions] +
+        [('Transformation, from ' + land + ', ' + region) for land in land_types for region in land_regions] +
+        [('Transformation, to ' + land + ', ' + region) for land in land_types for region in land_regions],
+        columns=['Elem flow name'])
+    land_use.loc[:, 'CFs (PDF.m2.yr)'] = cfs(len(land_use)) * np.where(
+        land_use.loc[:, 'Elem flow name'].str.contains('Transformation, from'), -1, 1)
+    tables['CF - regionalized - Land use - aggregated'] = land_use
+
+    tables['CF - regionalized - ParticulateMatter - native'] = synthetic_pm_table(rng, scale)
+    tables['SI - ParticulateMatter - secondary PM intake fractions'] = pd.DataFrame({
+        'precursor': ['SO2', 'NH3', 'NOx'], 'urban': cfs(3) * 1e-6, 'rural': cfs(3) * 1e-6,
+        'unspecified': cfs(3) * 1e-6})
+
+    aware = list(regions.loc[:, 'aware'].unique()) + ['GLO', 'RoW']
+    tables['CF - regionalized - WaterScarcity - aggregated'] = pd.DataFrame(
+        [(region, water_type, value) for region in aware for water_type, value in
+         zip(['unspecified', 'agri', 'non-agri'], cfs(3))],
+        columns=['ecoinvent_shortname', 'Water type', 'Annual'])
+    tables['CF - regionalized - WaterAvailability_HH - aggregated'] = pd.DataFrame({
+        'ecoinvent_shortname': aware, 'CF_tot': cfs(len(aware))})
+    tables['CF - regionalized - WaterAvailability_EQ_fw - native'] = pd.DataFrame({'CF value': cfs(100 * scale)})
+    tables['CF - regionalized - WaterAvailability_EQ_terr - aggregated'] = pd.DataFrame({
+        'ecoinvent_shortname': aware, 'CF (PDF.m2.yr/m3)': cfs(len(aware))})
+
+    species = pd.DataFrame({'ASFIS_spp_common': ['Species %d' % i for i in range(40 * scale)],
+                            'Type': rng.choice(['Demersal', 'Pelagic'], 40 * scale)})
+    fisheries = species.merge(pd.DataFrame({'FAO_num': rng.choice(np.arange(18, 90), 5 + scale, replace=False)}),
+                              how='cross')
+    fisheries.loc[:, 'class'] = rng.choice(['I', 'I', 'II'], len(fisheries))
+    fisheries.loc[:, 'CF (species/yr)'] = cfs(len(fisheries))
+    fisheries.loc[:, 'Area (m2)'] = rng.uniform(1e10, 1e12, len(fisheries))
+    fisheries.loc[:, 'Species_num (nb sp.)'] = rng.integers(100, 1000, len(fisheries))
+    fisheries.loc[:, 'B (tonnes)'] = rng.uniform(1e3, 1e6, len(fisheries))
+    tables['CF - regionalized - Fisheries'] = fisheries
+
+    return tables
+
+
+def synthetic_regions(scale):
+    """
+    The real countries and continents of ecoinvent, plus synthetic sub-regions of each country (e.g., FR-1) whose
+    number is proportional to scale.
+    :param scale: scale factor of the number of regions
+    :return: dataframe of the regions with their ecoinvent short name, their name in the PM table, their AWARE region
+             and their continent
+    """
+
+    rows = []
+    for continent, (code, countries) in CONTINENTS.items():
+        rows.append((code, continent, code, code))
+        for country in countries:
+            rows.append((COUNTRIES[country], country, COUNTRIES[country], code))
+            for n in range(1, scale):
+                # the sub-regions share the PM CFs and the AWARE basin of their country
+                rows.append((COUNTRIES[country] + '-' + str(n), country, COUNTRIES[country], code))
+
+    return pd.DataFrame(rows, columns=['ecoinvent', 'pm', 'aware', 'continent'])
+
+
+def synthetic_substances(scale):
+    """
+    Real substances needed by the parser (e.g., Carbon dioxide for climate change) plus synthetic substances whose
+    number is proportional to scale.
+    :param scale: scale factor of the number of substances
+    :return: dataframe of the substances with their name, CAS number, name in the IPCC table and the impact categories
+             they are used in
+    """
+
+    # (name, CAS number, greenhouse gas, toxic, marine acidification, volatile organic compound), the emissions linked
+    # to the EXIOBASE extensions are among them
+    real = [('Carbon dioxide, fossil', '124-38-9', True, False, True, False),
+            ('Carbon dioxide, from soil or biomass stock', '124-38-9', True, False, False, False),
+            ('Carbon monoxide, fossil', '630-08-0', True, False, True, False),
+            ('Methane, fossil', '74-82-8', True, False, True, False),
+            ('Methane, biogenic', '74-82-8', True, False, False, False),
+            ('Methane, from soil or biomass stock', '74-82-8', True, False, False, False),
+            ('Dinitrogen monoxide', '10024-97-2', True, False, False, False),
+            ('Sulfur hexafluoride', '2551-62-4', True, False, False, False),
+            ('Ammonia', '7664-41-7', False, True, False, False),
+            ('Nitrogen oxides', '11104-93-1', False, True, False, False),
+            ('Sulfur dioxide', '7446-09-5', False, True, False, False),
+            ('Arsenic(III)', '22541-54-4', False, True, False, False),
+            ('Benzene, hexachloro-', '118-74-1', False, True, False, False),
+            ('Benzo(a)pyrene', '50-32-8', False, True, False, False),
+            ('Benzo(b)fluoranthene', '205-99-2', False, True, False, False),
+            ('Benzo(k)fluoranthene', '207-08-9', False, True, False, False),
+            ('Cadmium(II)', '22537-48-0', False, True, False, False),
+            ('Chromium(III)', '16065-83-1', False, True, False, False),
+            ('Copper(II)', '15158-11-9', False, True, False, False),
+            ('Dioxin, 2,3,7,8 Tetrachlorodibenzo-p-', '1746-01-6', False, True, False, False),
+            ('Indeno(1,2,3-cd)pyrene', '193-39-5', False, True, False, False),
+            ('Lead(II)', '14280-50-3', False, True, False, False),
+            ('Mercury(II)', '14302-87-5', False, True, False, False),
+            ('Nickel(II)', '14701-22-5', False, True, False, False),
+            ('Polychlorinated biphenyls', '1336-36-3', False, True, False, False),
+            ('Selenium(IV)', '22541-55-5', False, True, False, False),
+            ('Zinc(II)', '23713-49-7', False, True, False, False),
+            ('Hydrocarbons, aromatic', None, False, False, False, True),
+            ('NMVOC, non-methane volatile organic compounds, unspecified origin', None, False, False, False, True)]
+    substances = pd.DataFrame(real, columns=['name', 'cas', 'ghg', 'toxic', 'acid', 'voc'])
+    # name of the greenhouse gases in the IPCC table, the parser creates the biogenic flows of carbon dioxide
+    substances.loc[:, 'ipcc'] = substances.loc[:, 'name'].replace({
+        'Carbon dioxide, fossil': 'Carbon dioxide', 'Carbon dioxide, from soil or biomass stock': 'Carbon dioxide',
+        'Carbon monoxide, fossil': 'Carbon monoxide'})
+    substances.loc[:, 'ods'] = False
+    n = 100 * scale
+    synthetic = pd.DataFrame({'name': ['Substance %d' % i for i in range(n)],
+                              'cas': ['%d-%02d-%d' % (1000 + i, i % 100, i % 10) for i in range(n)],
+                              'ghg': np.arange(n) % 10 == 0, 'toxic': np.arange(n) % 2 == 1, 'acid': False,
+                              'voc': np.arange(n) % 5 == 2, 'ods': np.arange(n) % 10 == 1})
+    synthetic.loc[:, 'ipcc'] = synthetic.loc[:, 'name']
+    substances = pd.concat([substances, synthetic], ignore_index=True)
+
+    return substances
+
+
+def synthetic_pm_table(rng, scale):
+    """
+    :param rng: numpy random generator
+    :param scale: scale factor of the number of cities and sub-regions per country
+    :return: the native particulate matter table, with cities, sub-regions, countries, sub-continents, continents and
+             the world
+    """
+
+    def values():
+        return list(rng.uniform(1e3, 1e6, 2)) + list(rng.lognormal(-8, 1, 3)) + list(rng.lognormal(-12, 1, 3))
+
+    rows = []
+    for continent, (code, countries) in CONTINENTS.items():
+        sub_continent = 'Sub-continent of ' + continent
+        for country in countries:
+            for n in range(2 * scale):
+                rows.append([country + ' city ' + str(n), country, sub_continent, continent, 'city'] + values())
+            if country in PM_AGGREGATED_COUNTRIES:
+                for n in range(scale):
+                    rows.append([country + ' region ' + str(n), country, sub_continent, continent, 'sub-regions'] +
+                                values())
+            else:
+                rows.append([country, country, sub_continent, continent, 'sub-regions'] + values())
+        rows.append([sub_continent, None, sub_continent, continent, 'sub-continent'] + values())
+        rows.append([continent, None, None, continent, 'continent'] + values())
+    rows.append(['World', None, None, 'Global', 'global'] + values())
+
+    return pd.DataFrame(rows, columns=['Country-Region', 'Country', 'Sub-Continent', 'Continent',
+                                       'Native geographical resolution scale', 'Population urban', 'Population rural',
+                                       'CF urban', 'CF rural', 'CF unspecified', 'iF urban', 'iF rural',
+                                       'iF unspecified'])
+
+
+def iw_table(rng, substances, categories, compartments, sub_compartment='(unspecified)', unit='kg'):
+    """
+    :param rng: numpy random generator
+    :param substances: dataframe of the substances with their name and CAS number
+    :param categories: list of tuples (impact category, CF unit, MP or Damage)
+    :param compartments: compartments in which the substances are emitted
+    :param sub_compartment: sub-compartment of the CFs
+    :param unit: unit of the elementary flows
+    :return: table of CFs in the IW+ format, for all the substances, categories and compartments
+    """
+
+    df = pd.DataFrame([(category, cf_unit, compartment, name, cas, level)
+                       for category, cf_unit, level in categories
+                       for compartment in compartments
+                       for name, cas in zip(substances.loc[:, 'name'], substances.loc[:, 'cas'])],
+                      columns=['Impact category', 'CF unit', 'Compartment', 'Elem flow name', 'CAS number',
+                               'MP or Damage'])
+    df.loc[:, 'Sub-compartment'] = sub_compartment
+    df.loc[:, 'CF value'] = rng.lognormal(mean=-2, sigma=2, size=len(df))
+    df.loc[:, 'Elem flow unit'] = unit
+    df.loc[:, 'Native geographical resolution scale'] = 'Global'
+
+    return df.loc[:, IW_COLUMNS]
+
+
+def other_metals():
+    """
+    :return: the extraction volumes of the metals aggregated in the "Other non-ferrous metal ores" extension of
+             EXIOBASE, indexed by metal
+    """
+
+    return read_data_file('Data/metadata/exiobase/USGS_extraction_volumes.xlsx', sheet_name='metals').set_index(
+        'Unnamed: 0')
+
+
+def synthetic_data_files(scale):
+    """
+    Synthetic versions of the data files of SYNTHETIC_DATA_FILES missing from the package, with the same columns as the
+    real ones:
+        - the elementary flows of openLCA v2.5, i.e., the ones of v2.1.1 plus the synthetic substances
+        - the composition of the "Other non-ferrous metal ores" and "Other minerals" extensions of EXIOBASE, in the
+          order of USGS_extraction_volumes.xlsx
+        - the matching of the metals of "Other non-ferrous metal ores" with the mineral resources of IW+
+    :param scale: scale factor of the synthetic database
+    :return: dictionary of the dataframes of the missing files, indexed by their path in the package, to be given to
+             Parse as data_files
+    """
+
+    substances = synthetic_substances(scale)
+    synthetic = substances.loc[substances.loc[:, 'name'].str.startswith('Substance ')]
+    compartments = ['Emission to air/unspecified', 'Emission to air/low population density',
+                    'Emission to air/high population density', 'Emission to water/unspecified',
+                    'Emission to water/lake', 'Emission to water/ocean', 'Emission to soil/unspecified',
+                    'Emission to soil/agricultural']
+    stressors = pd.DataFrame([(name, str(uuid.uuid5(uuid.NAMESPACE_OID, name + compartment)),
+                               'Elementary flows/' + compartment, cas, 'kg')
+                              for name, cas in zip(synthetic.loc[:, 'name'], synthetic.loc[:, 'cas'])
+                              for compartment in compartments],
+                             columns=['flow_name', 'flow_id', 'comp', 'cas', 'unit'])
+    stressors = pd.concat([read_data_file('/Data/mappings/oLCA/v2.1.1/all_stressors.xlsx'), stressors],
+                          ignore_index=True)
+
+    metals = other_metals()
+    minerals = read_data_file('Data/metadata/exiobase/USGS_extraction_volumes.xlsx', sheet_name='minerals')
+    composition = pd.DataFrame([(physical_type, commodity, 'PT' + str(i), country, country, 2016)
+                                for physical_type, commodities in [
+                                    ('Other non-ferrous metal ores', metals.index),
+                                    ('Other minerals', minerals.loc[:, 'CommodityName'])]
+                                for i, commodity in enumerate(commodities)
+                                for country in COUNTRIES.values()],
+                               columns=['PhysicalTypeName', 'CommodityName', 'ProductTypeCode', 'CountryCode',
+                                        'ISOAlpha2', 'AccountingYear'])
+
+    matching = pd.DataFrame({'Unnamed: 0': metals.index, 'IW+': metals.index, 'comments': None})
+
+    return {file: data for file, data in zip(SYNTHETIC_DATA_FILES, [stressors, composition, matching])
+            if not os.path.exists(pkg_resources.resource_filename('parse_iw', file))}
+
+
+# ------------------------------------------------- Benchmarks -------------------------------------------------------
+def benchmark_parse(path_access_db, output_folder, version, bw2_projects, bw_version, bw_only=False, data_files=None):
+    """
+    Runs all the steps of Parse.load_cfs() in order, and then the export steps, on a database and times each of them.
+    The synthetic database contains everything the steps need, so a step that fails stops the benchmark.
+    :param path_access_db: path to the source database
+    :param output_folder: folder where the export steps write their files
+    :param version: the version of IW+ to parse
+    :param bw2_projects: the brightway2 projects used by export_to_bw(), export_to_bw() is skipped if empty
+    :param bw_version: the version of brightway used, can be '2' or '2.5'
+    :param bw_only: if True, the SimaPro and openLCA specific steps are skipped
+    :param data_files: replacements of the data files missing from the package, see synthetic_data_files()
+    :return: dictionary {step: runtime in seconds} in the order of execution, and the number of CFs in master_db at the
+             end of load_cfs()
+    :raises RuntimeError: if a step fails, with the error of the step as cause
+    """
+
+    parser = Parse(path_access_db, version, bw2_projects, bw_version, data_files=data_files)
+    parser.logger.setLevel(logging.WARNING)
+
+    steps = []
+    for stage, message, stage_steps in parser.get_load_cfs_stages(bw_only):
+        steps += [(step.__name__, step) for step in stage_steps]
+    n_load_cfs_steps = len(steps)
+    for name, bw, output in EXPORT_STEPS:
+        if (bw and bw2_projects) or not (bw or bw_only):
+            step = getattr(parser, name)
+            if output is not None:
+                step = functools.partial(step, os.path.join(output_folder, output))
+            steps.append((name, step))
+
+    timings = {}
+    n_cfs = None
+    for i, (name, step) in enumerate(steps):
+        if i == n_load_cfs_steps:
+            n_cfs = len(parser.master_db)
+        start = time.perf_counter()
+        try:
+            step()
+            # master_db is concatenated lazily, force it so that the concatenation is timed with the step
+            parser.master_db
+        except Exception as e:
+            parser.conn.close()
+            raise RuntimeError('step {} failed on {}'.format(name, path_access_db)) from e
+        timings[name] = time.perf_counter() - start
+    if n_cfs is None:
+        n_cfs = len(parser.master_db)
+    parser.conn.close()
+
+    return timings, n_cfs
+
+
+def check_parallel_loaders(path_access_db, version, n_jobs=4, data_files=None):
+    """
+    Checks that running the loaders of load_cfs() in a process pool gives the same master_db as running them serially,
+    i.e., the same rows in the same order, with the same values and dtypes.
+    :param path_access_db: path to the source database
+    :param version: the version of IW+ to parse
+    :param n_jobs: number of processes of the pool
+    :param data_files: replacements of the data files missing from the package, see synthetic_data_files()
+    :return:
+    :raises AssertionError: if master_db differs
+    """
+
+    outputs = []
+    for jobs in [1, n_jobs]:
+        parser = Parse(path_access_db, version, [], '2', n_jobs=jobs, data_files=data_files)
+        parser.logger.setLevel(logging.WARNING)
+        parser.load_cfs(last_stage=LAST_LOADER_STAGE)
+        parser.conn.close()
+        outputs.append(parser.master_db)
+    serial, pool = outputs
+
+    assert serial.shape == pool.shape, 'master_db has {} rows serially and {} with {} jobs'.format(
+        len(serial), len(pool), n_jobs)
+    assert serial.dtypes.equals(pool.dtypes), 'the dtypes of master_db differ with {} jobs'.format(n_jobs)
+    # values are compared as text, where 0 and 0.0 differ
+    differences = (serial.astype(str).values != pool.astype(str).values).any(axis=1)
+    assert not differences.any(), '{} rows of master_db differ with {} jobs, e.g.:\n{}\n{}'.format(
+        differences.sum(), n_jobs, serial.loc[differences, ['Elem flow name', 'CF value']].head(3),
+        pool.loc[differences, ['Elem flow name', 'CF value']].head(3))
+
+
+def run_benchmarks(scales=(1, 2, 4), output='benchmarks.json', version='2.1', bw2_projects=(), bw_version='2',
+                   bw_only=False, seed=0, repeat=1, check_jobs=4):
+    """
+    Times the parsing of synthetic databases of several scales and stores the results in a JSON report. For each
+    step, the report contains its runtime at each scale (the minimum over the repetitions) and its scaling exponent,
+    i.e., the slope of log(runtime) against log(scale). An exponent close to 1 means that the runtime of the step is
+    linear with the size of the data, an exponent close to 2 reveals a quadratic pattern.
+    :param scales: scale factors of the synthetic databases
+    :param output: path of the JSON report
+    :param version: the version of IW+ to parse
+    :param bw2_projects: the brightway2 projects used by export_to_bw(), export_to_bw() is skipped if empty
+    :param bw_version: the version of brightway used, can be '2' or '2.5'
+    :param bw_only: if True, the SimaPro and openLCA specific steps are skipped
+    :param seed: seed of the random generator of the synthetic databases
+    :param repeat: number of times each scale is run
+    :param check_jobs: number of processes used to check that the loaders give the same master_db in a process pool
+                       as serially at each scale (see check_parallel_loaders()), 0 to skip the check
+    :return: the report
+    """
+
+    report = {'created': datetime.now().isoformat(timespec='seconds'),
+              'python': platform.python_version(),
+              'pandas': pd.__version__,
+              'numpy': np.__version__,
+              'scales': list(scales),
+              'repeat': repeat,
+              'tables': {},
+              'cfs': {},
+              'steps': {}}
+
+    with tempfile.TemporaryDirectory() as folder:
+        for scale in scales:
+            path = os.path.join(folder, 'synthetic_iw_' + str(scale) + '.db')
+            report['tables'][str(scale)] = sum(write_synthetic_database(path, scale, seed).values())
+            data_files = synthetic_data_files(scale)
+            if check_jobs:
+                check_parallel_loaders(path, version, check_jobs, data_files)
+            for _ in range(repeat):
+                timings, n_cfs = benchmark_parse(path, folder, version, list(bw2_projects), bw_version, bw_only,
+                                                 data_files)
+                report['cfs'][str(scale)] = n_cfs
+                for step, seconds in timings.items():
+                    result = report['steps'].setdefault(step, {'seconds': {}})
+                    result['seconds'][str(scale)] = min(result['seconds'].get(str(scale), math.inf), seconds)
+
+    for result in report['steps'].values():
+        result['exponent'] = scaling_exponent(result['seconds'])
+
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    return report
+
+
+def scaling_exponent(seconds):
+    """
+    :param seconds: dictionary {scale: runtime}
+    :return: slope of the least squares fit of log(runtime) against log(scale), None with less than two scales
+    """
+
+    points = [(math.log(float(scale)), math.log(max(runtime, 1e-9))) for scale, runtime in seconds.items()]
+    if len({x for x, y in points}) < 2:
+        return None
+    x, y = np.array(points).T
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Times the parsing of IW+ on synthetic source databases.')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 2, 4],
+                        help='scale factors of the synthetic databases')
+    parser.add_argument('--output', default='benchmarks.json', help='path of the JSON report')
+    parser.add_argument('--version', default='2.1', help='version of IW+ to parse')
+    parser.add_argument('--bw2-projects', nargs='*', default=[],
+                        help='brightway2 projects used to time export_to_bw(), skipped if none')
+    parser.add_argument('--bw-version', default='2', choices=['2', '2.5'], help='version of brightway used')
+    parser.add_argument('--bw-only', action='store_true', help='skip the SimaPro and openLCA specific steps')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic databases')
+    parser.add_argument('--repeat', type=int, default=1, help='number of runs per scale, the fastest is kept')
+    parser.add_argument('--check-jobs', type=int, default=4,
+                        help='number of processes used to check that the loaders give the same CFs in a process pool '
+                             'as serially, 0 to skip the check')
+    parser.add_argument('--write-database', metavar='PATH',
+                        help='only write the synthetic database of the first scale to PATH')
+    args = parser.parse_args(argv)
+
+    if args.write_database:
+        write_synthetic_database(args.write_database, args.scales[0], args.seed)
+        return
+
+    report = run_benchmarks(args.scales, args.output, args.version, args.bw2_projects, args.bw_version,
+                            args.bw_only, args.seed, args.repeat, args.check_jobs)
+    for step, result in report['steps'].items():
+        seconds = ', '.join(scale + ': ' + '{:.3f}s'.format(t) for scale, t in result['seconds'].items())
+        exponent = '' if result['exponent'] is None else ' (exponent {:.2f})'.format(result['exponent'])
+        print(step + ': ' + seconds + exponent)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -24,33 +24,454 @@ python version= 3.9
 import pandas as pd
 import numpy as np
 import os
+import sys
 import pkg_resources
 import json
-import country_converter as coco
-import scipy.sparse
-import bw2data as bd
-import bw2io as bi
 from datetime import datetime
 import csv
 import warnings
 import uuid
+import bz2
+import zipfile
 import logging
+import logging.handlers
+import queue
+import multiprocessing
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import math
-import molmass
-import olca_ipc as ipc
-import olca_schema as schema
-from scipy.stats import gmean
+import importlib
+import re
+import hashlib
+import shutil
+import tempfile
+import pickle
+import time
+import tracemalloc
+import contextlib
+import functools
+import platform
+try:
+    import resource
+except ImportError:
+    # not available on Windows, the peak resident memory is then not reported
+    resource = None
 from tqdm import tqdm
 
 
+class LazyModule:
+    """
+    Module imported the first time one of its attributes is used. brightway, openLCA, country_converter and scipy are
+    slow to import and only needed by a few steps, a run that does not reach these steps never imports them.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if attr in ('_name', '_module'):
+            raise AttributeError(attr)
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+coco = LazyModule('country_converter')
+bd = LazyModule('bw2data')
+bd_serialization = LazyModule('bw2data.serialization')
+bd_ia_data_store = LazyModule('bw2data.ia_data_store')
+ipc = LazyModule('olca_ipc')
+schema = LazyModule('olca_schema')
+stats = LazyModule('scipy.stats')
+xlsxwriter = LazyModule('xlsxwriter')
+
+# ecoinvent versions the CFs are linked to, from the oldest to the latest. The CFs of all the versions are stored in a
+# single table per biogenic carbon approach (ei_iw), the version of ecoinvent introducing each elementary flow telling
+# in which versions the CF is available (see EcoinventVersionTable)
+ECOINVENT_VERSIONS = ['3.10', '3.11', '3.12']
+# folder of the mappings of the latest ecoinvent version, with which link_to_ecoinvent() links the CFs of all versions
+EI_MAPPING_FOLDER = 'Data/mappings/ei' + ECOINVENT_VERSIONS[-1].replace('.', '') + '/'
+
+# SQLite tables and data files read by each step of load_cfs(). They are hashed to key the stage checkpoints, so any
+# step reading a new table or file must declare it here. The loaders (load_*) only read their own tables and append to
+# master_db, they do not depend on each other and can thus run in separate processes (see n_jobs).
+LOAD_CFS_INPUTS = {
+    'load_basic_cfs': {
+        'tables': ['CF - not regionalized - IonizingRadiations', 'CF - not regionalized - MarineAcidification',
+                   'CF - not regionalized - FossilResources', 'CF - not regionalized - MineralResources',
+                   'SI - Mapping with elementary flows', 'CF - not regionalized - HumanTox',
+                   'CF - not regionalized - FreshwaterEcotox', 'CF - not regionalized - MarineEcotox',
+                   'CF - not regionalized - TerrestrialEcotox']},
+    'load_climate_change_cfs': {
+        'tables': ['CF - not regionalized - ClimateChange', 'SI - Mapping with elementary flows',
+                   'SI - Climate change - fate factors (K/kg)', 'SI - Climate change - effect factors']},
+    'load_ozone_layer_depletion_cfs': {
+        'tables': ['CF - not regionalized - OzoneLayerDepletion', 'SI - Mapping with elementary flows']},
+    'load_photochemical_ozone_formation': {
+        'tables': ['CF - not regionalized - PhotochemOxid', 'SI - Mapping with elementary flows',
+                   'SI - Photochemical ozone formation - effect factors']},
+    'load_freshwater_acidification_cfs': {
+        'tables': ['CF - regionalized - AcidFW - aggregated']},
+    'load_terrestrial_acidification_cfs': {
+        'tables': ['CF - regionalized - AcidTerr - aggregated']},
+    'load_marine_eutrophication_cfs': {
+        'tables': ['CF - regionalized - MarEutro - aggregated', 'CF - not regionalized - MarEutro']},
+    'apply_stoichiometric_ratios': {
+        'tables': ['SI - Stoechiometry']},
+    'load_freshwater_eutrophication_cfs': {
+        'tables': ['CF - regionalized - EutroFW - aggregated']},
+    'load_land_use_cfs': {
+        'tables': ['CF - regionalized - Land use - aggregated']},
+    'load_resources_services_loss_cfs': {
+        'tables': ['CF - not regionalized - ResourcesServicesDeficit',
+                   'CF - not regionalized - ResourcesServicesLossAdaptation']},
+    'load_particulates_cfs': {
+        'tables': ['CF - regionalized - ParticulateMatter - native', 'SI - Mapping with regions of ecoinvent',
+                   'SI - ParticulateMatter - secondary PM intake fractions']},
+    'load_water_scarcity_cfs': {
+        'tables': ['CF - regionalized - WaterScarcity - aggregated', 'SI - Mapping with regions of ecoinvent']},
+    'load_water_availability_fw_cfs': {
+        'tables': ['CF - regionalized - WaterAvailability_EQ_fw - native', 'SI - Mapping with regions of ecoinvent',
+                   'CF - regionalized - WaterScarcity - aggregated']},
+    'load_water_availability_hh_cfs': {
+        'tables': ['CF - regionalized - WaterAvailability_HH - aggregated', 'SI - Mapping with regions of ecoinvent']},
+    'load_water_availability_terr_cfs': {
+        'tables': ['CF - regionalized - WaterAvailability_EQ_terr - aggregated',
+                   'SI - Mapping with regions of ecoinvent']},
+    'load_thermally_polluted_water_cfs': {
+        'tables': ['CF - not regionalized - ThermallyPollutedWater', 'SI - Mapping with regions of ecoinvent',
+                   'CF - regionalized - WaterScarcity - aggregated']},
+    'load_physical_effects_cfs': {
+        'tables': ['CF - not regionalized - PhysicalImpactonBiota']},
+    'load_fisheries_cfs': {
+        'tables': ['CF - regionalized - Fisheries']},
+    'harmonize_regionalized_substances': {
+        'tables': ['SI - Mapping countries to continents']},
+    'link_to_ecoinvent': {
+        'files': [EI_MAPPING_FOLDER + file for file in ['ei_elem_flow_uuids.xlsx', 'ei_iw_mapping.xlsx', 'comps.json',
+                                                        'subcomps.json']]},
+    'link_to_sp': {
+        'files': ['Data/mappings/SP/sp_mapping.xlsx']},
+    'link_to_olca': {
+        'files': ['Data/mappings/oLCA/v2.5/oLCA_mapping.xlsx', 'Data/mappings/oLCA/v2.5/comps.json',
+                  'Data/mappings/oLCA/v2.5/all_stressors.xlsx', 'Data/mappings/oLCA/v2.5/flows_to_spatialize.json']},
+    'link_to_exiobase': {
+        'files': ['Data/mappings/exiobase/EXIO_3_8_IW_concordance.xlsx',
+                  'Data/mappings/exiobase/EXIO_3_9_IW_concordance.xlsx',
+                  'Data/metadata/exiobase/All_factors_applied_to_Exiobase_metals_minerals.csv',
+                  'Data/mappings/exiobase/Mineral_extension_exio_detailed_2016.xlsx',
+                  'Data/metadata/exiobase/USGS_extraction_volumes.xlsx',
+                  'Data/mappings/exiobase/other_metals_matching.xlsx']},
+}
+
+# columns of the CF tables with a handful of distinct values, stored as categoricals once load_cfs() has built the
+# tables (see Parse.compact_cf_tables())
+CATEGORICAL_COLUMNS = ['Impact category', 'CF unit', 'Compartment', 'Sub-compartment', 'MP or Damage',
+                       'Elem flow unit', 'Native geographical resolution scale']
+
+# column specification of the aggregated regionalized tables of acidification and eutrophication, which have one row
+# per region (column 'Short name ecoinvent') and one column per substance and CF unit, named 'CF <molecule> (<unit>)'.
+# For each impact category: the compartment of the emissions, the midpoint CF unit (the damage one being PDF.m2.yr),
+# the substances as (elementary flow, CAS number, molecule) and the regions at the "Other region" scale
+AGGREGATED_CF_TABLES = {
+    'Freshwater acidification': {
+        'compartment': 'Air',
+        'midpoint unit': 'kg SO2 eq',
+        'substances': [('Ammonia', '7664-41-7', 'NH3'), ('Nitrogen oxides', '11104-93-1', 'NOx'),
+                       ('Sulfur dioxide', '7446-09-05', 'SO2'), ('Nitric acid', '7697-37-2', 'HNO3')],
+        'other regions': ['RoW']},
+    'Terrestrial acidification': {
+        'compartment': 'Air',
+        'midpoint unit': 'kg SO2 eq',
+        'substances': [('Ammonia', '7664-41-7', 'NH3'), ('Nitrogen oxides', '11104-93-1', 'NOx'),
+                       ('Sulfur dioxide', '7446-09-05', 'SO2')],
+        'other regions': ['RoW']},
+    'Marine eutrophication': {
+        'compartment': 'Air',
+        'midpoint unit': 'kg N N-lim eq',
+        'substances': [('Ammonia', '7664-41-7', 'NH3'), ('Nitrogen oxides', '11104-93-1', 'NOx'),
+                       ('Nitric acid', '7697-37-2', 'HNO3')],
+        'other regions': ['RoW']},
+    'Freshwater eutrophication': {
+        'compartment': 'Water',
+        'midpoint unit': 'kg PO4 P-lim eq',
+        'substances': [('Phosphate', '14265-44-2', 'PO4')],
+        'other regions': []},
+}
+
+# substrings of the names of the ecoinvent regions used to determine the native geographical resolution scale of
+# the water CFs (the other regions are applied last and thus prevail)
+WATER_CONTINENTS = ['RER', 'RAS', 'RAF', 'RLA', 'OCE', 'RNA']
+WATER_OTHER_REGIONS = ['RoW', 'Akrotiri', 'Asia without China', 'Australia, including overseas territories', 'BALTSO',
+                       'CENTREL', 'CUSMA/T-MEC/USMCA', 'Canada without Alberta', 'Canada without Alberta and Quebec',
+                       'Canada without Quebec', 'Canary Islands', 'Central Asia', 'China w/o Inner Mongol', 'Crimea',
+                       'Cyprus No Mans Area', 'Dhekelia Base', 'ENTSO-E', 'Europe without Austria',
+                       'Europe without NORDEL (NCPA)', 'Europe without Switzerland',
+                       'Europe without Switzerland and Austria', 'Europe without Switzerland and France',
+                       'Europe, without Russia and Türkiye', 'FSU', 'France, including overseas territories',
+                       'Guantanamo Bay', 'IAI Area, Africa', 'IAI Area, Asia, without China and GCC',
+                       'IAI Area, EU27 & EFTA', 'IAI Area, Gulf Cooperation Council', 'IAI Area, North America',
+                       'IAI Area, North America, without Quebec', 'IAI Area, Russia & RER w/o EU27 & EFTA',
+                       'IAI Area, South America', 'IN-Islands', 'MRO', 'NAFTA', 'NORDEL', 'NPCC',
+                       'North America without Quebec', 'Northern Cyprus', 'Québec, HQ distribution network',
+                       'RER w/o AT+BE+CH+DE+FR+IT', 'RER w/o CH+DE', 'RER w/o DE+NL+NO', 'RER w/o DE+NL+NO+RU',
+                       'RER w/o DE+NL+RU', 'RER w/o RU', 'Russia (Asia)', 'Russia (Europe)', 'SAS', 'Siachen Glacier',
+                       'Somaliland', 'UCTE', 'UCTE without France', 'UCTE without Germany',
+                       'UCTE without Germany and France', 'UN-AMERICAS', 'UN-ASIA', 'UN-AUSTRALIANZ', 'UN-CAMERICA',
+                       'UN-CARIBBEAN', 'UN-EAFRICA', 'UN-EASIA', 'UN-EEUROPE', 'UN-EUROPE', 'UN-MAFRICA',
+                       'UN-MELANESIA', 'UN-MICRONESIA', 'UN-NAFRICA', 'UN-NEUROPE', 'UN-OCEANIA', 'UN-POLYNESIA',
+                       'UN-SAMERICA', 'UN-SASIA', 'UN-SEASIA', 'UN-SEUROPE', 'UN-WAFRICA', 'UN-WASIA',
+                       'United States of America, including overseas territories', 'WECC', 'WEU']
+# precompiled lookup of the native geographical resolution scale of a water CF from its region, regions matching none
+# of the patterns are countries
+WATER_SCALES = [('Continent', re.compile('|'.join(re.escape(region) for region in WATER_CONTINENTS))),
+                ('Global', re.compile('GLO')),
+                ('Other region', re.compile('|'.join(re.escape(region) for region in WATER_OTHER_REGIONS)))]
+# the other water flows (lake, river, well, etc.), their names replace "Water" in the names of the water flows
+WATER_FLOW_VARIANTS = ['Water, lake', 'Water, river', 'Water, unspecified natural origin', 'Water, well, in ground',
+                       'Water, cooling, unspecified natural origin']
+
+# CF tables exported to the brightway projects of each ecoinvent version
+BW_PROJECT_TABLES = {'3.10': ['ei310_iw', 'ei310_iw_carbon_neutrality', 'simplified_version_ei310'],
+                     '3.11': ['ei311_iw', 'ei311_iw_carbon_neutrality', 'simplified_version_ei311'],
+                     '3.12': ['ei312_iw', 'ei312_iw_carbon_neutrality', 'simplified_version_ei312']}
+# columns of the cached indexes of the biosphere databases, and version of their format
+BIOSPHERE_INDEX_COLUMNS = ['Elem flow name', 'Compartment', 'Sub-compartment', 'code']
+BIOSPHERE_INDEX_VERSION = 1
+# impact categories with the same name at midpoint and damage levels, suffixed with " (midpoint)" or " (damage)" in the
+# methods combining both levels
+SAME_NAME_CATEGORIES = ['Freshwater acidification', 'Freshwater eutrophication', 'Land occupation, biodiversity',
+                        'Land transformation, biodiversity', 'Marine eutrophication', 'Ozone layer depletion',
+                        'Particulate matter formation', 'Terrestrial acidification', 'Physical effects on biota']
+# SimaPro csv files: (end of the file name, CF table, type of method, keys of the method metadata and of the weighting
+# information in sp_data)
+SP_FILES = [(' (incl. CO2 uptake)_midpoint_version_simapro.csv', 'iw_sp', 'midpoint', 'midpoint_method_metadata', None),
+            (' (incl. CO2 uptake)_expert_version_simapro.csv', 'iw_sp', 'damage', 'damage_method_metadata',
+             'weighting_info_damage'),
+            (' (incl. CO2 uptake)_simapro.csv', 'iw_sp', 'combined', 'combined_method_metadata',
+             'weighting_info_combined'),
+            ('_footprint_version_simapro.csv', 'simplified_version_sp', 'simplified', 'simplified_method_metadata',
+             None),
+            ('_midpoint_version_simapro.csv', 'iw_sp_carbon_neutrality', 'midpoint',
+             'midpoint_method_metadata_carboneutrality', None),
+            ('_expert_version_simapro.csv', 'iw_sp_carbon_neutrality', 'damage',
+             'damage_method_metadata_carboneutrality', 'weighting_info_damage_carboneutrality'),
+            ('_simapro.csv', 'iw_sp_carbon_neutrality', 'combined', 'combined_method_metadata_carboneutrality',
+             'weighting_info_combined_carboneutrality')]
+SP_SUBSTANCE_COLUMNS = ['Compartment', 'Sub-compartment', 'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit']
+# formats of the CF tables written by produce_files(), with their file extensions
+OUTPUT_FORMATS = {'xlsx': '.xlsx', 'parquet': '.parquet', 'feather': '.feather', 'csv': '.csv.gz'}
+# category and description of the IW+ methods in openLCA
+OLCA_METHOD_CATEGORY = 'IMPACT World+ LCIA Methods'
+OLCA_METHOD_DESCRIPTION = 'For more information on IMPACT World+, check our website: https://www.impactworldplus.org/'
+
+
+class StageProfiler:
+    """
+    Records the cost of the stages of a Parse run: wall time, CPU time, peak resident memory of the process, memory
+    allocated according to tracemalloc and number of rows of the dataframes of the Parse object (master_db, ei3xx_iw,
+    iw_sp, etc.) before and after the stage. Stages can be nested, e.g., the steps of a stage of load_cfs().
+    """
+
+    def __init__(self, trace_memory=True):
+        """
+        :param trace_memory: if True, the memory allocations are traced with tracemalloc, which slows down the run
+        """
+        self.trace_memory = trace_memory
+        self.started = datetime.now()
+        self.origin = time.perf_counter()
+        self.records = []
+        # open stages, with the traced memory at their start and the highest traced memory observed during them
+        self.stack = []
+
+    @contextlib.contextmanager
+    def stage(self, name, parser=None):
+        """
+        Context manager recording a stage.
+        :param name: name of the stage
+        :param parser: the Parse object, whose dataframes are counted before and after the stage
+        :return:
+        """
+
+        frame = {'name': name}
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            # the peak is global to tracemalloc, it is handed over to the enclosing stage before being reset
+            if self.stack:
+                self.stack[-1]['peak'] = max(self.stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['start'] = frame['peak'] = current
+        self.stack.append(frame)
+        record = {'stage': ';'.join(f['name'] for f in self.stack), 'rows_in': dataframe_rows(parser)}
+        wall, cpu = time.perf_counter(), time.process_time()
+        record['start_s'] = wall - self.origin
+        record['failed'] = True
+        try:
+            yield
+            record['failed'] = False
+        finally:
+            record['wall_time_s'] = time.perf_counter() - wall
+            record['cpu_time_s'] = time.process_time() - cpu
+            record['peak_rss_mb'] = peak_rss_mb()
+            self.stack.pop()
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(frame['peak'], peak)
+                if self.stack:
+                    self.stack[-1]['peak'] = max(self.stack[-1]['peak'], peak)
+                record['tracemalloc_delta_mb'] = (current - frame['start']) / 1e6
+                record['tracemalloc_peak_mb'] = (peak - frame['start']) / 1e6
+            record['rows_out'] = dataframe_rows(parser)
+            self.records.append(record)
+
+    def report(self):
+        """
+        :return: the run report, with the stages in the order in which they started
+        """
+        return {'started': self.started.isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'trace_memory': self.trace_memory,
+                'stages': sorted(self.records, key=lambda record: record['start_s'])}
+
+    def flame_summary(self):
+        """
+        Summary of the run in the folded stacks format of flame graphs (e.g., flamegraph.pl or speedscope), i.e., one
+        line "parent;child;grandchild milliseconds" per stage, with the time spent in the stage itself, outside of its
+        sub-stages.
+        :return: the lines of the summary
+        """
+        self_time = {record['stage']: record['wall_time_s'] for record in self.records}
+        for record in self.records:
+            parent = record['stage'].rpartition(';')[0]
+            if parent in self_time:
+                self_time[parent] -= record['wall_time_s']
+        return [stage + ' ' + str(max(int(round(seconds * 1000)), 0)) for stage, seconds in self_time.items()]
+
+    def write_report(self, path, flame_path=None):
+        """
+        Writes the run report as JSON.
+        :param path: path of the JSON report
+        :param flame_path: optional path of the flame-style summary, see flame_summary()
+        :return:
+        """
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        if flame_path:
+            with open(flame_path, 'w') as f:
+                f.write('\n'.join(self.flame_summary()) + '\n')
+
+
+def profiled(method):
+    """
+    Decorator recording the calls of a method of Parse as a stage of its profiler, when profiling is enabled.
+    :param method: the method of Parse
+    :return: the decorated method
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if getattr(self, 'profiler', None) is None:
+            return method(self, *args, **kwargs)
+        with self.profiler.stage(method.__name__, self):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class EcoinventVersionTable:
+    """
+    Attribute of Parse giving the CFs of one ecoinvent version (e.g., ei310_iw), selected from the version-aware table
+    of all the versions (ei_iw or ei_iw_carbon_neutrality) instead of being stored as a copy. A dataframe assigned to
+    the attribute of an instance (e.g., in the processes exporting the brightway projects) takes precedence.
+    """
+
+    def __init__(self, ei_version, table):
+        self.ei_version = ei_version
+        self.table = table
+
+    def __get__(self, parser, owner=None):
+        if parser is None:
+            return self
+        return select_ei_version(parser.__dict__[self.table], self.ei_version)
+
+
+class SourceTables:
+    """
+    Access to the tables of the SQLite database used by the loaders. The result of each query is kept, so that the
+    tables read by several loaders (e.g., 'SI - Mapping with elementary flows') are only fetched once per process, and
+    the selection of columns and rows is done by SQLite rather than on the whole table.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.results = {}
+        self.hits = 0
+        self.misses = 0
+
+    def read(self, table, columns=None, where=None, params=()):
+        """
+        :param table: name of the table
+        :param columns: optional list of the columns to fetch, all of them by default
+        :param where: optional SQL condition on the rows to fetch, e.g., "[class] = 'I'"
+        :param params: values of the placeholders (?) of the condition
+        :return: dataframe of the table, that the caller is free to modify
+        """
+        key = (table, tuple(columns) if columns else None, where, tuple(params))
+        if key in self.results:
+            self.hits += 1
+        else:
+            self.misses += 1
+            sql = 'SELECT ' + (', '.join('[' + column + ']' for column in columns) if columns else '*')
+            sql += ' FROM [' + table + ']' + (' WHERE ' + where if where else '')
+            self.results[key] = pd.read_sql(sql, self.conn, params=tuple(params))
+        return self.results[key].copy()
+
+    def statistics(self):
+        """
+        :return: number of queries, of queries answered from the memoized results and of rows kept in memory
+        """
+        return {'queries': self.hits + self.misses, 'hits': self.hits,
+                'rows': sum(len(df) for df in self.results.values())}
+
+    def clear(self):
+        self.results = {}
+        self.hits = 0
+        self.misses = 0
+
+
 class Parse:
-    def __init__(self, path_access_db, version, bw2_projects, bw_version):
+    # the CFs linked to each ecoinvent version are selected from ei_iw and ei_iw_carbon_neutrality
+    ei310_iw = EcoinventVersionTable('3.10', 'ei_iw')
+    ei310_iw_carbon_neutrality = EcoinventVersionTable('3.10', 'ei_iw_carbon_neutrality')
+    ei311_iw = EcoinventVersionTable('3.11', 'ei_iw')
+    ei311_iw_carbon_neutrality = EcoinventVersionTable('3.11', 'ei_iw_carbon_neutrality')
+    ei312_iw = EcoinventVersionTable('3.12', 'ei_iw')
+    ei312_iw_carbon_neutrality = EcoinventVersionTable('3.12', 'ei_iw_carbon_neutrality')
+
+    def __init__(self, path_access_db, version, bw2_projects, bw_version, checkpoint_dir=None, n_jobs=1,
+                 profile=False, cache_dir=None, data_files=None):
         """
         :param path_access_db: path to the Microsoft access database (source version)
         :param version: the version of IW+ to parse
         :param bw2_projects: the name of a brightway2 project in which the database "biosphere3" is available
         :param bw_version: the version of brightway used, can be '2' or '2.5'
+        :param checkpoint_dir: optional folder where load_cfs() stores a checkpoint after each of its stages and the
+                               output of each loader. When provided, load_cfs() resumes from the last stage whose
+                               inputs did not change and only runs the loaders whose inputs changed.
+        :param n_jobs: number of processes used to run the load_*_cfs() loaders of load_cfs() concurrently and to
+                       export the brightway projects concurrently, and number of threads writing the files of
+                       produce_files()
+        :param profile: if True, the wall time, CPU time, memory and row counts of each stage of load_cfs(),
+                        export_to_*() and produce_files() are recorded in self.profiler. The run report is written
+                        with self.profiler.write_report().
+        :param cache_dir: optional folder where the index of the flows of the biosphere databases of the brightway
+                          projects is cached, so that export_to_bw() only scans a biosphere database once, and where
+                          the parsed mapping and metadata files are cached (see read_data_file())
+        :param data_files: optional dictionary of dataframes replacing data files of the package, with the paths of the
+                           files in the package as keys, e.g., {'Data/mappings/oLCA/v2.5/all_stressors.xlsx': df}. The
+                           dataframes are the content of the files as read by the parser (see read_data_file()).
 
         Object instance variables:
         -------------------------
@@ -58,8 +479,13 @@ class Parse:
                           following a +/-1 approach for biogenic carbon
             - master_db_carbon_neutrality : the master dataframe where basic IW CFs are stored (what is used to produce the dev.xlsx file)
                                             following a 0/0 approach for biogenic carbon
+            - ei_iw  : the dataframe where IW CFs linked to the elementary flows of all ecoinvent versions are stored,
+                       following a +/-1 approach for biogenic carbon. The column 'introduced in ei v.' gives the
+                       version of ecoinvent introducing the elementary flow, as an ei_version_key().
+            - ei_iw_carbon_neutrality  : the dataframe where IW CFs linked to the elementary flows of all the ecoinvent
+                                         versions are stored following a 0/0 approach for biogenic carbon
             - ei310_iw  : the dataframe where IW CFs linked to ecoinvent v3.10 elementary flows are stored,
-                          following a +/-1 approach for biogenic carbon
+                          following a +/-1 approach for biogenic carbon (selected from ei_iw)
             - ei310_iw_carbon_neutrality  : the dataframe where IW CFs linked to ecoinvent v3.10 elementary flows are stored
                                             following a 0/0 approach for biogenic carbon
             - simplified_version_ei310  : the dataframe where IW CFs linked to ecoinvent v3.10 elementary flows are stored
@@ -106,6 +532,7 @@ class Parse:
             - load_thermally_polluted_water_cfs()
             - load_physical_effects_cfs()
             - load_fisheries_cfs()
+            - apply_stoichiometric_ratios()
             - harmonize_regionalized_substances()
             - apply_rules()
             - create_not_regio_flows()
@@ -124,6 +551,7 @@ class Parse:
             - export_to_bw()
             - export_to_sp()
             - export_to_olca()
+            - export_to_olca_zip()
             - produce_files()
             - produce_files_hybrid_ecoinvent()
 
@@ -149,18 +577,19 @@ class Parse:
         self.version = str(version)
         self.bw2_projects = bw2_projects
         self.bw_version = bw_version
+        self.checkpoint_dir = checkpoint_dir
+        self.n_jobs = n_jobs
+        self.profiler = StageProfiler() if profile else None
+        self.cache_dir = cache_dir
+        self.data_files = {file.lstrip('/'): data for file, data in (data_files or {}).items()}
 
         # OUTPUTs
         self.master_db = pd.DataFrame()
         self.master_db_carbon_neutrality = pd.DataFrame()
         self.master_db_not_regio = pd.DataFrame()
         self.master_db_not_regio_carbon_neutrality = pd.DataFrame()
-        self.ei310_iw = pd.DataFrame()
-        self.ei310_iw_carbon_neutrality = pd.DataFrame()
-        self.ei311_iw = pd.DataFrame()
-        self.ei311_iw_carbon_neutrality = pd.DataFrame()
-        self.ei312_iw = pd.DataFrame()
-        self.ei312_iw_carbon_neutrality = pd.DataFrame()
+        self.ei_iw = pd.DataFrame()
+        self.ei_iw_carbon_neutrality = pd.DataFrame()
         self.simplified_version_ei310 = pd.DataFrame()
         self.simplified_version_ei311 = pd.DataFrame()
         self.simplified_version_ei312 = pd.DataFrame()
@@ -175,95 +604,427 @@ class Parse:
         self.exio_iw_39 = pd.DataFrame()
 
         self.conn = sqlite3.connect(self.path_access_db)
+        self.tables = SourceTables(self.conn)
+
+        # the openLCA client is only created when needed, see the olca_client property
+        self._olca_client = None
+
+    @property
+    def olca_client(self):
+        if self.__dict__.get('_olca_client') is None:
+            # Open openLCA. Open a database. Go to Tools/Dev tools/IPC server. Create a server with the local port 8080
+            # (comes by default). Activate the port (the green olay arrow)
+            # then we simply connect to that port. Now Python and openLCA can communicate via the "client" we created
+            client = ipc.Client(8080)
+            # check that the IPC server is activated, the client is only kept if it is
+            try:
+                client.get_descriptor(schema.Unit, name='kg')
+            except Exception as e:
+                self.logger.error("Could not connect to openLCA. Activate its IPC server on port 8080, or use "
+                                  "export_to_olca_zip() which does not need openLCA to be running.")
+                raise ConnectionError("no openLCA IPC server on port 8080") from e
+            self._olca_client = client
+        return self._olca_client
+
+    @property
+    def master_db(self):
+        # the CFs added with add_to_master_db() are only concatenated and cleaned up once master_db is needed
+        if self.master_db_fragments:
+            self._master_db = clean_up_dataframe(pd.concat([self._master_db] + self.master_db_fragments))
+            self.master_db_fragments = []
+        return self._master_db
+
+    @master_db.setter
+    def master_db(self, df):
+        self._master_db = df
+        self.master_db_fragments = []
+
+    def profile_stage(self, name):
+        """
+        :param name: name of the stage
+        :return: context manager recording the stage in the profiler, or doing nothing if profiling is disabled
+        """
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.stage(name, self)
 
-        # Open openLCA. Open a database. Go to Tools/Dev tools/IPC server. Create a server with the local port 8080
-        # (comes by default). Activate the port (the green olay arrow)
-        # then we simply connect to that port. Now Python and openLCA can communicate via the "client" we created
-        self.olca_client = ipc.Client(8080)
-        # check if the opening of the openLCA client is activated or not
-        try:
-            self.olca_client.get_descriptor(schema.Unit, name='kg')
-        except:
-            print("The openLCA client. If you need it, don't forget to activate it in openLCA!")
+    def add_to_master_db(self, *dfs):
+        """
+        Appends CFs to master_db. The dataframes are only collected here, master_db is concatenated and cleaned up
+        from duplicates a single time, the next time it is accessed, instead of being copied after each addition.
+        :param dfs: dataframes of CFs, with the columns of master_db
+        :return:
+        """
+        self.master_db_fragments.extend(dfs)
 
     # -------------------------------------------- Main methods -------------------------------------------------------
 
-    def load_cfs(self, bw_only:bool=False):
+    @profiled
+    def load_cfs(self, bw_only:bool=False, last_stage=None):
         """
         Load the characterization factors and stored them in master_db.
+        If a checkpoint_dir was provided, the state of the object is stored after each stage and stages whose inputs
+        (SQLite tables, mapping files and code) did not change since the last run are restored instead of recomputed.
+        The outputs of the loaders are stored as well, a loader whose own inputs did not change is not run again and
+        its stored output is spliced in master_db. The checksums of the inputs are recorded in build_manifest.json.
+        :param bw_only: if True, the SimaPro and openLCA specific stages are skipped
+        :param last_stage: optional name of the stage (see get_load_cfs_stages()) after which the loading stops
         :return: updated master_db
         """
 
-        self.load_basic_cfs()
-        self.logger.info("Loading climate change characterization factors...")
-        self.load_climate_change_cfs()
-        self.logger.info("Loading ozone layer depletion characterization factors...")
-        self.load_ozone_layer_depletion_cfs()
-        self.logger.info("Loading photochemical ozone formation characterization factors...")
-        self.load_photochemical_ozone_formation()
-        self.logger.info("Loading acidification characterization factors...")
-        self.load_freshwater_acidification_cfs()
-        self.load_terrestrial_acidification_cfs()
-        self.logger.info("Loading eutrophication characterization factors...")
-        self.load_marine_eutrophication_cfs()
-        self.load_freshwater_eutrophication_cfs()
-        self.logger.info("Loading land use characterization factors...")
-        self.load_land_use_cfs()
-        self.logger.info("Loading resources services loss/deficit characterization factors...")
-        self.load_resources_services_loss_cfs()
-        self.logger.info("Loading particulate matter characterization factors...")
-        self.load_particulates_cfs()
-        self.logger.info("Loading water scarcity characterization factors...")
-        self.load_water_scarcity_cfs()
-        self.logger.info("Loading water availability characterization factors...")
-        self.load_water_availability_fw_cfs()
-        self.load_water_availability_hh_cfs()
-        self.load_water_availability_terr_cfs()
-        self.logger.info("Loading thermally polluted water characterization factors...")
-        self.load_thermally_polluted_water_cfs()
-        self.logger.info("Loading physical effects on biota characterization factors...")
-        self.load_physical_effects_cfs()
-        self.logger.info("Loading fisheries impact characterization factors...")
-        self.load_fisheries_cfs()
-
-        self.logger.info("Harmonizing regionalized substances across indicators...")
-        self.harmonize_regionalized_substances()
-
-        self.logger.info("Applying rules...")
-        self.apply_rules()
-
-        self.logger.info("Treating regionalized factors...")
-        self.create_not_regio_flows()
-        self.create_regio_flows_for_not_regio_ic()
-        self.order_things_around()
-
-        self.logger.info("Managing biogenic carbon shenanigans...")
-        self.deal_with_biogenic_carbon()
-        self.deal_with_temporary_storage_of_carbon()
-        self.separate_ghg_indicators()
-
-        self.logger.info("Create non-regionalized version for ecoinvent...")
-        self.separate_regio_cfs()
-
-        self.logger.info("Linking to ecoinvent elementary flows...")
-        self.link_to_ecoinvent()
+        stages = self.get_load_cfs_stages(bw_only)
+        if last_stage:
+            stages = stages[:[stage[0] for stage in stages].index(last_stage) + 1]
+
+        first_stage = 0
+        checksums = {}
+        if self.checkpoint_dir:
+            keys = self.get_checkpoint_keys(stages, bw_only, checksums)
+            self.log_changed_inputs(checksums)
+            for n in reversed(range(len(stages))):
+                if os.path.exists(self.checkpoint_path(stages[n][0], keys[n])):
+                    self.logger.info("Restoring checkpoint of stage " + stages[n][0] + "...")
+                    with self.profile_stage('restore_checkpoint'):
+                        self.restore_checkpoint(self.checkpoint_path(stages[n][0], keys[n]))
+                    first_stage = n + 1
+                    break
+
+        # the outputs of the loaders whose inputs did not change since a previous run are reused, so that changing one
+        # table only runs the loaders reading it before the downstream stages
+        restored = [step.__name__ for stage in stages[:first_stage] for step in stage[2]
+                    if step.__name__.startswith('load_')]
+        loaders = [step.__name__ for stage in stages[first_stage:] for step in stage[2]
+                   if step.__name__.startswith('load_')]
+        loader_keys = {}
+        reused = {}
+        if self.checkpoint_dir:
+            loader_keys = self.get_loader_keys(restored + loaders, bw_only, checksums)
+            reused = {loader: self.loader_output_path(loader, loader_keys[loader]) for loader in loaders
+                      if os.path.exists(self.loader_output_path(loader, loader_keys[loader]))}
+            if reused:
+                self.logger.info("Reusing the CFs of " + str(len(reused)) + " loaders whose inputs did not change...")
+
+        # the loaders are independent from each other, they are run in a process pool and their outputs are merged
+        # in the serial order once their stage is reached, so that master_db is identical to the one of a serial run
+        to_run = [loader for loader in loaders if loader not in reused]
+        futures = {}
+        executor = None
+        if self.n_jobs > 1 and len(to_run) > 1:
+            executor = ProcessPoolExecutor(max_workers=min(self.n_jobs, len(to_run)),
+                                           initializer=connect_loader_worker, initargs=(self.path_access_db,))
+            futures = {loader: executor.submit(run_loader, loader) for loader in to_run}
 
-        if not bw_only:
-            self.logger.info("Linking to SimaPro elementary flows...")
-            self.link_to_sp()
+        try:
+            for n in range(first_stage, len(stages)):
+                stage, message, steps = stages[n]
+                if message:
+                    self.logger.info(message)
+                with self.profile_stage(stage):
+                    for step in steps:
+                        name = step.__name__
+                        # with the process pool, the time of a loader is the time spent waiting for its output
+                        with self.profile_stage(name):
+                            if name in reused:
+                                with open(reused[name], 'rb') as f:
+                                    self.add_loader_output(name, pickle.load(f))
+                            elif name in futures or (self.checkpoint_dir and name in loaders):
+                                if name in futures:
+                                    fragments = futures.pop(name).result()
+                                else:
+                                    fragments = self.compute_loader_output(name)
+                                if self.checkpoint_dir:
+                                    self.store_loader_output(name, loader_keys[name], fragments)
+                                self.add_loader_output(name, fragments)
+                            else:
+                                step()
+                    if self.checkpoint_dir:
+                        self.store_checkpoint(stage, keys[n])
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+        if self.checkpoint_dir:
+            self.write_build_manifest(checksums, stages, keys, {
+                loader: {'key': loader_keys[loader],
+                         'status': 'restored' if loader in restored else 'reused' if loader in reused else 'computed'}
+                for loader in restored + loaders})
+
+        # the tables read from the database are not needed anymore once the CFs are loaded
+        statistics = self.tables.statistics()
+        if statistics['queries']:
+            self.logger.info("Read " + str(statistics['queries']) + " tables from the database, " +
+                             str(statistics['hits']) + " of them without querying it again.")
+        self.tables.clear()
+
+        with self.profile_stage('compact_cf_tables'):
+            self.compact_cf_tables()
+
+    def compact_cf_tables(self):
+        """
+        Stores the CATEGORICAL_COLUMNS of all the CF tables (master_db, ei31x_iw, iw_sp, olca_iw, simplified versions,
+        etc.) as categoricals sharing the same categories, once load_cfs() has built them. The tables are converted in
+        place, one column at a time. This shrinks the tables kept in memory by the export steps, the tables sent to the
+        processes exporting the brightway projects and the parquet and feather files of produce_files(), and makes
+        filtering and grouping on these columns by the export steps operate on integer codes.
+        It does not lower the peak memory of load_cfs() itself: the loaders, rules and linking steps build and keep
+        object columns, as they assign new values to these columns and loop over them, which is much slower on
+        categoricals (about ten times slower for apply_rules() and create_regio_flows_for_not_regio_ic()).
+        :return: updated CF tables
+        """
 
-            self.logger.info("Linking to openLCA elementary flows...")
-            self.link_to_olca()
+        # access master_db so that its pending fragments are concatenated
+        self.master_db
+        compact_dataframes([v for v in self.__dict__.values()
+                            if isinstance(v, pd.DataFrame) and 'Impact category' in v.columns])
 
-        # leave exiobase with brightway only option for hybrid version
-        self.logger.info("Linking to exiobase environmental extensions...")
-        self.link_to_exiobase()
+    def add_loader_output(self, loader, fragments):
+        """
+        Adds the CFs produced by a loader run on its own (see loader_fragments()) to master_db.
+        :param loader: name of the loader
+        :param fragments: dataframes of the CFs created by the loader
+        :return: updated master_db
+        """
 
-        self.logger.info("Prepare the footprint version...")
-        self.get_simplified_versions(bw_only=bw_only)
+        # load_basic_cfs() creates master_db, the other loaders append to it
+        if loader == 'load_basic_cfs':
+            self.master_db = fragments[0]
+        else:
+            self.add_to_master_db(*fragments)
 
+    def get_load_cfs_stages(self, bw_only):
+        """
+        Ordered stages of load_cfs(). Each stage is a tuple (name, log message, steps) where steps are the methods
+        to run in order. Checkpoints are taken between stages.
+        :param bw_only: if True, the SimaPro and openLCA specific stages are skipped
+        :return: list of stages
+        """
+
+        stages = [
+            ('basic', None, [self.load_basic_cfs]),
+            ('climate_change', "Loading climate change characterization factors...",
+             [self.load_climate_change_cfs]),
+            ('ozone_layer_depletion', "Loading ozone layer depletion characterization factors...",
+             [self.load_ozone_layer_depletion_cfs]),
+            ('photochemical_ozone_formation', "Loading photochemical ozone formation characterization factors...",
+             [self.load_photochemical_ozone_formation]),
+            ('acidification', "Loading acidification characterization factors...",
+             [self.load_freshwater_acidification_cfs, self.load_terrestrial_acidification_cfs]),
+            ('eutrophication', "Loading eutrophication characterization factors...",
+             [self.load_marine_eutrophication_cfs, self.load_freshwater_eutrophication_cfs]),
+            ('stoichiometry', "Extrapolating CFs from stoechiometric ratios...", [self.apply_stoichiometric_ratios]),
+            ('land_use', "Loading land use characterization factors...", [self.load_land_use_cfs]),
+            ('resources_services_loss', "Loading resources services loss/deficit characterization factors...",
+             [self.load_resources_services_loss_cfs]),
+            ('particulates', "Loading particulate matter characterization factors...", [self.load_particulates_cfs]),
+            ('water_scarcity', "Loading water scarcity characterization factors...", [self.load_water_scarcity_cfs]),
+            ('water_availability', "Loading water availability characterization factors...",
+             [self.load_water_availability_fw_cfs, self.load_water_availability_hh_cfs,
+              self.load_water_availability_terr_cfs]),
+            ('thermally_polluted_water', "Loading thermally polluted water characterization factors...",
+             [self.load_thermally_polluted_water_cfs]),
+            ('physical_effects', "Loading physical effects on biota characterization factors...",
+             [self.load_physical_effects_cfs]),
+            ('fisheries', "Loading fisheries impact characterization factors...", [self.load_fisheries_cfs]),
+            ('harmonize', "Harmonizing regionalized substances across indicators...",
+             [self.harmonize_regionalized_substances]),
+            ('rules', "Applying rules...", [self.apply_rules]),
+            ('regionalized_factors', "Treating regionalized factors...",
+             [self.create_not_regio_flows, self.create_regio_flows_for_not_regio_ic, self.order_things_around]),
+            ('biogenic_carbon', "Managing biogenic carbon shenanigans...",
+             [self.deal_with_biogenic_carbon, self.deal_with_temporary_storage_of_carbon,
+              self.separate_ghg_indicators]),
+            ('not_regio_version', "Create non-regionalized version for ecoinvent...", [self.separate_regio_cfs]),
+            ('ecoinvent', "Linking to ecoinvent elementary flows...", [self.link_to_ecoinvent]),
+        ]
+        if not bw_only:
+            stages += [
+                ('simapro', "Linking to SimaPro elementary flows...", [self.link_to_sp]),
+                ('openlca', "Linking to openLCA elementary flows...", [self.link_to_olca]),
+            ]
+        # leave exiobase with brightway only option for hybrid version
+        stages += [
+            ('exiobase', "Linking to exiobase environmental extensions...", [self.link_to_exiobase]),
+            ('footprint', "Prepare the footprint version...",
+             ([] if bw_only else [self.get_simplified_sp_and_olca_versions]) + [self.get_simplified_ei_versions]),
+        ]
         if not bw_only:
-            self.get_total_hh_and_eq_for_olca()
+            stages += [('olca_total_hh_and_eq', None, [self.get_total_hh_and_eq_for_olca])]
+
+        return stages
+
+    def get_checkpoint_keys(self, stages, bw_only, checksums=None):
+        """
+        Computes the key of each stage of load_cfs(). The key of a stage is a hash of the key of the previous stage
+        and of the content of the SQLite tables and data files declared in LOAD_CFS_INPUTS for its steps, so that a
+        change only invalidates the checkpoints from the first stage reading the changed input.
+        :param stages: stages as returned by get_load_cfs_stages()
+        :param bw_only: bw_only option of load_cfs()
+        :param checksums: optional dictionary filled with the checksums of the inputs, see get_input_checksums()
+        :return: list of keys, one per stage
+        """
+
+        key = self.get_code_key(bw_only)
+        checksums = {} if checksums is None else checksums
+        keys = []
+        for stage, message, steps in stages:
+            h = hashlib.sha256((key + stage).encode())
+            for step in steps:
+                for checksum in self.get_input_checksums(step.__name__, checksums).values():
+                    h.update(checksum.encode())
+            key = h.hexdigest()
+            keys.append(key)
+
+        return keys
+
+    def get_loader_keys(self, loaders, bw_only, checksums):
+        """
+        Computes the key of the output of each loader, i.e., a hash of the code and of the content of the SQLite tables
+        and data files declared in LOAD_CFS_INPUTS for the loader only. Unlike the keys of the stages, the key of a
+        loader does not depend on the other loaders.
+        :param loaders: names of the loaders
+        :param bw_only: bw_only option of load_cfs()
+        :param checksums: dictionary of the checksums of the inputs, see get_input_checksums()
+        :return: dictionary {loader: key}
+        """
+
+        code = self.get_code_key(bw_only)
+        keys = {}
+        for loader in loaders:
+            h = hashlib.sha256((code + loader).encode())
+            for checksum in self.get_input_checksums(loader, checksums).values():
+                h.update(checksum.encode())
+            keys[loader] = h.hexdigest()
+        return keys
+
+    def get_code_key(self, bw_only):
+        # the code version is part of every key, any change to the parser invalidates all checkpoints
+        with open(__file__, 'rb') as f:
+            return hashlib.sha256(f.read() + (self.version + str(bw_only)).encode()).hexdigest()
+
+    def get_input_checksums(self, step, checksums):
+        """
+        :param step: name of a step of load_cfs()
+        :param checksums: dictionary of the checksums already computed, updated with the ones of the step
+        :return: dictionary {table or file: checksum} of the inputs declared in LOAD_CFS_INPUTS for the step
+        """
+
+        inputs = LOAD_CFS_INPUTS.get(step, {})
+        for table in inputs.get('tables', []):
+            if table not in checksums:
+                checksums[table] = hash_sql_table(self.conn, table)
+        for file in inputs.get('files', []):
+            if file not in checksums:
+                if file in self.data_files:
+                    checksums[file] = hash_dataframe(self.data_files[file])
+                else:
+                    checksums[file] = hash_file(pkg_resources.resource_filename(__name__, file))
+        return {name: checksums[name] for name in inputs.get('tables', []) + inputs.get('files', [])}
+
+    def loader_output_path(self, loader, key):
+        return os.path.join(self.checkpoint_dir, 'loaders', loader + '_' + key[:16] + '.pickle')
+
+    def store_loader_output(self, loader, key, fragments):
+        """
+        Stores the CFs produced by a loader, to be reused by the next runs as long as the inputs of the loader do not
+        change. Outputs of the same loader with an outdated key are removed.
+        :param loader: name of the loader
+        :param key: key of the loader as given by get_loader_keys()
+        :param fragments: dataframes of the CFs created by the loader, see loader_fragments()
+        :return:
+        """
+
+        folder = os.path.join(self.checkpoint_dir, 'loaders')
+        os.makedirs(folder, exist_ok=True)
+        for file in os.listdir(folder):
+            if file.endswith('.pickle') and file[:-len('.pickle')].rsplit('_', 1)[0] == loader:
+                os.remove(os.path.join(folder, file))
+
+        with atomic_write(self.loader_output_path(loader, key)) as f:
+            pickle.dump(fragments, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def compute_loader_output(self, loader):
+        """
+        Runs a loader on its own, so that its output can be stored and later spliced in master_db with
+        add_loader_output(), as done for the loaders run in separate processes (see run_loader()).
+        :param loader: name of the load_*_cfs method to run
+        :return: the CFs produced by the loader, see loader_fragments()
+        """
+
+        return loader_fragments(loader, self.logger, self.conn, self.tables)
+
+    def log_changed_inputs(self, checksums):
+        """
+        Logs the inputs of load_cfs() whose checksum changed since the build recorded in build_manifest.json.
+        :param checksums: dictionary of the checksums of the inputs, see get_input_checksums()
+        :return:
+        """
+
+        path = os.path.join(self.checkpoint_dir, 'build_manifest.json')
+        if os.path.exists(path):
+            with open(path) as f:
+                previous = json.load(f)['inputs']
+            changed = [name for name, checksum in checksums.items() if previous.get(name, checksum) != checksum]
+            if changed:
+                self.logger.info("Inputs changed since the previous build: " + ', '.join(changed))
+
+    def write_build_manifest(self, checksums, stages, keys, loaders):
+        """
+        Writes the manifest of the build in checkpoint_dir: the checksums of the inputs of load_cfs(), the key of each
+        stage and, for each loader, its key and whether its output was restored from a checkpoint, reused or computed.
+        :param checksums: dictionary of the checksums of the inputs, see get_input_checksums()
+        :param stages: stages as returned by get_load_cfs_stages()
+        :param keys: keys of the stages as given by get_checkpoint_keys()
+        :param loaders: dictionary {loader: {'key': key, 'status': 'restored', 'reused' or 'computed'}}
+        :return:
+        """
+
+        path = os.path.join(self.checkpoint_dir, 'build_manifest.json')
+        manifest = {'version': self.version, 'inputs': checksums,
+                    'stages': {stage[0]: key for stage, key in zip(stages, keys)}, 'loaders': loaders}
+        with atomic_write(path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    def checkpoint_path(self, stage, key):
+        return os.path.join(self.checkpoint_dir, stage + '_' + key[:16] + '.pickle')
+
+    def store_checkpoint(self, stage, key):
+        """
+        Stores the dataframes of the object after the stage. Checkpoints of the same stage with an outdated key are
+        removed.
+        :param stage: name of the stage
+        :param key: key of the stage as given by get_checkpoint_keys()
+        :return:
+        """
+
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        for file in os.listdir(self.checkpoint_dir):
+            if file.endswith('.pickle') and file[:-len('.pickle')].rsplit('_', 1)[0] == stage:
+                os.remove(os.path.join(self.checkpoint_dir, file))
+
+        # the CFs pending in master_db_fragments are stored as they are, master_db is only concatenated when needed
+        state = {k: v for k, v in self.__dict__.items()
+                 if isinstance(v, pd.DataFrame) or k in ['sp_data', 'master_db_fragments']}
+        with atomic_write(self.checkpoint_path(stage, key)) as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def restore_checkpoint(self, path):
+        with open(path, 'rb') as f:
+            self.__dict__.update(pickle.load(f))
+
+    def read_data_file(self, file, **kwargs):
+        """
+        Reads a data file of the package with read_data_file(), unless a replacement was given in data_files. The parsed
+        files are cached in cache_dir, if given.
+        :param file: path of the file in the package, e.g., '/Data/mappings/SP/sp_mapping.xlsx'
+        :param kwargs: arguments of pd.read_excel() or pd.read_csv(), not used for the replacements
+        :return: dataframe (or dictionary of dataframes for several sheets) that the caller is free to modify
+        """
+        data = self.data_files.get(file.lstrip('/'))
+        if data is None:
+            return read_data_file(file, self.cache_dir, **kwargs)
+        if isinstance(data, dict):
+            return {sheet: df.copy() for sheet, df in data.items()}
+        return data.copy()
 
     def generate_bw_files(self)->None:
         """
@@ -297,6 +1058,7 @@ class Parse:
         self.export_to_bw()
         self.produce_files(bw_only=True)
 
+    @profiled
     def export_to_bw(self):
         """
         This method creates a brightway2 or brightway2.5 method with the IW+ characterization 
@@ -307,163 +1069,204 @@ class Parse:
 
         self.logger.info("Exporting to brightway2...")
 
-        for project in self.bw2_projects:
-            bd.projects.set_current(project)
-            # for bw2
-            if 'biosphere3' in bd.databases:
-                biosphere_db_name = 'biosphere3'
-            # for bw2.5
-            else:
-                biosphere_db_name = [i for i in bd.databases if 'biosphere' in i][0]
-            bio = bd.Database(biosphere_db_name)
-            ei_version = project.split('ecoinvent')[1]
-
-            bw_flows_with_codes = (
-                pd.DataFrame(
-                    [(i.as_dict()['name'], i.as_dict()['categories'][0], i.as_dict()['categories'][1],
-                      i.as_dict()['code'])
-                     if len(i.as_dict()['categories']) == 2
-                     else (i.as_dict()['name'], i.as_dict()['categories'][0], 'unspecified', i.as_dict()['code'])
-                     for i in bio],
-                    columns=['Elem flow name', 'Compartment', 'Sub-compartment', 'code'])
-            )
-
-            if '3.10' in project:
-                ei_in_bw_normal = self.ei310_iw.merge(bw_flows_with_codes)
-                ei_in_bw_carbon_neutrality = self.ei310_iw_carbon_neutrality.merge(bw_flows_with_codes)
-                ei_in_bw_simple = self.simplified_version_ei310.merge(bw_flows_with_codes)
-            elif '3.11' in project:
-                ei_in_bw_normal = self.ei311_iw.merge(bw_flows_with_codes)
-                ei_in_bw_carbon_neutrality = self.ei311_iw_carbon_neutrality.merge(bw_flows_with_codes)
-                ei_in_bw_simple = self.simplified_version_ei311.merge(bw_flows_with_codes)
-            elif '3.12' in project:
-                ei_in_bw_normal = self.ei312_iw.merge(bw_flows_with_codes)
-                ei_in_bw_carbon_neutrality = self.ei312_iw_carbon_neutrality.merge(bw_flows_with_codes)
-                ei_in_bw_simple = self.simplified_version_ei312.merge(bw_flows_with_codes)
-            for ei_in_bw_format in ['normal', 'carbon neutrality']:
-                if ei_in_bw_format == 'normal':
-                    ei_in_bw = ei_in_bw_normal
-                elif ei_in_bw_format == 'carbon neutrality':
-                    ei_in_bw = ei_in_bw_carbon_neutrality
-
-                # create total HH and EQ categories
-                ei_in_bw.set_index(['Impact category', 'CF unit', 'code'], inplace=True)
-                total_hh = ei_in_bw.loc(axis=0)[:, 'DALY'].copy('deep')
-                total_hh = total_hh.groupby('code').agg({'Compartment': 'first',
-                                                         'Sub-compartment': 'first',
-                                                         'Elem flow name': 'first',
-                                                         'CAS number': 'first',
-                                                         'CF value': sum,
-                                                         'Elem flow unit': 'first',
-                                                         'MP or Damage': 'first',
-                                                         'Native geographical resolution scale': 'first'})
-                total_hh.index = pd.MultiIndex.from_product([['Total human health'], ['DALY'], total_hh.index])
-                total_eq = ei_in_bw.loc(axis=0)[:, 'PDF.m2.yr'].copy('deep')
-                total_eq = total_eq.groupby('code').agg({'Compartment': 'first',
-                                                         'Sub-compartment': 'first',
-                                                         'Elem flow name': 'first',
-                                                         'CAS number': 'first',
-                                                         'CF value': sum,
-                                                         'Elem flow unit': 'first',
-                                                         'MP or Damage': 'first',
-                                                         'Native geographical resolution scale': 'first'})
-                total_eq.index = pd.MultiIndex.from_product(
-                    [['Total ecosystem quality'], ['PDF.m2.yr'], total_eq.index])
-                ei_in_bw = pd.concat([ei_in_bw, total_hh, total_eq])
-                ei_in_bw.index.names = ['Impact category', 'CF unit', 'code']
-                ei_in_bw = ei_in_bw.reset_index()
-                ei_in_bw.set_index(['Impact category', 'CF unit'], inplace=True)
-                impact_categories = ei_in_bw.index.drop_duplicates()
-
-                # -------------- For complete version of IW+ ----------------
-                for ic in impact_categories:
-                    if ei_in_bw.loc[[ic], 'MP or Damage'].iloc[0] == 'Midpoint':
-                        mid_end = 'Midpoint'
-                        if ei_in_bw_format == 'normal':
-                            name = ('IMPACT World+ ' + mid_end + ' ' + self.version + ' for ecoinvent v' +
-                                    ei_version + ' (incl. CO2 uptake)', 'Midpoint', ic[0])
-                        elif ei_in_bw_format == 'carbon neutrality':
-                            name = ('IMPACT World+ ' + mid_end + ' ' + self.version + ' for ecoinvent v' +
-                                    ei_version, 'Midpoint', ic[0])
-                    else:
-                        mid_end = 'Damage'
-                        if ic[1] == 'DALY':
-                            if ei_in_bw_format == 'normal':
-                                name = ('IMPACT World+ ' + mid_end + ' ' + self.version + ' for ecoinvent v' +
-                                        ei_version + ' (incl. CO2 uptake)', 'Human health', ic[0])
-                            elif ei_in_bw_format == 'carbon neutrality':
-                                name = ('IMPACT World+ ' + mid_end + ' ' + self.version + ' for ecoinvent v' +
-                                        ei_version, 'Human health', ic[0])
-                        else:
-                            if ei_in_bw_format == 'normal':
-                                name = ('IMPACT World+ ' + mid_end + ' ' + self.version + ' for ecoinvent v' +
-                                        ei_version + ' (incl. CO2 uptake)', 'Ecosystem quality', ic[0])
-                            elif ei_in_bw_format == 'carbon neutrality':
-                                name = ('IMPACT World+ ' + mid_end + ' ' + self.version + ' for ecoinvent v' +
-                                        ei_version, 'Ecosystem quality', ic[0])
+        self.run_bw_projects('export_project_to_bw')
 
-                    # initialize the "Method" method
-                    new_method = bd.Method(name)
-                    # register the new method
-                    new_method.register()
-                    # set its unit
-                    new_method.metadata["unit"] = ic[1]
+    def run_bw_projects(self, step, *args):
+        """
+        Runs a step of the brightway export for each of the brightway projects. The current project of brightway is a
+        state of the whole process, so with n_jobs > 1 each project is run in its own process (see run_bw_project())
+        and the total time is that of the slowest project. The logs of the processes are forwarded to the logger.
+        :param step: name of the method to run, called with the name of the project and args
+        :param args: other arguments of the step
+        :return: dictionary of the results of the step, with the projects as keys
+        """
 
-                    df = ei_in_bw.loc[[ic], ['code', 'CF value']].copy()
-                    df.set_index('code', inplace=True)
+        results = {}
+        if self.n_jobs > 1 and len(self.bw2_projects) > 1:
+            # processes are spawned rather than forked, so that they do not inherit the brightway databases opened here
+            with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(self.bw2_projects)),
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                futures = {project: executor.submit(run_bw_project, self.bw_project_state(project), step, project,
+                                                    *args) for project in self.bw2_projects}
+                for project, future in futures.items():
+                    # with the process pool, the time of a project is the time spent waiting for its results
+                    with self.profile_stage(project):
+                        results[project], records = future.result()
+                    for record in records:
+                        self.logger.handle(record)
+        else:
+            for project in self.bw2_projects:
+                with self.profile_stage(project):
+                    results[project] = getattr(self, step)(project, *args)
+        return results
+
+    def bw_project_state(self, project):
+        """
+        Selects the attributes needed to export a brightway project in a separate process, i.e., the settings of the
+        object and the CF tables of the ecoinvent version of the project.
+        :param project: name of the brightway project
+        :return: dictionary of the attributes
+        """
 
-                    data = []
-                    for stressor in df.index:
-                        data.append(((biosphere_db_name, stressor), df.loc[stressor, 'CF value']))
-                    new_method.write(data)
+        state = {'version': self.version, 'bw_version': self.bw_version, 'cache_dir': self.cache_dir, 'profiler': None}
+        for ei_version, tables in BW_PROJECT_TABLES.items():
+            if ei_version in project:
+                state.update({table: getattr(self, table) for table in tables})
+        return state
 
-            # -------------- For simplified version of IW+ ----------------
+    def export_project_to_bw(self, project):
+        """
+        Creates the brightway methods of export_to_bw() in one brightway project.
+        :param project: name of the brightway project
+        :return: the number of methods written
+        """
 
-            ei_in_bw_simple.set_index(['Impact category', 'CF unit'], inplace=True)
-            impact_categories_simple = ei_in_bw_simple.index.drop_duplicates()
+        self.logger.info("Exporting to the brightway project " + project + "...")
 
-            for ic in impact_categories_simple:
+        bd.projects.set_current(project)
+        biosphere_db_name = current_biosphere_name()
+        ei_version = project.split('ecoinvent')[1]
 
-                name = ('IMPACT World+ Footprint ' + self.version + ' for ecoinvent v' + ei_version, ic[0])
+        bw_flows_with_codes = biosphere_flows_index(biosphere_db_name, self.cache_dir)
+        # (name, unit, CFs) of the methods of the project, written all at once
+        methods = [method for variant in self.bw_methods(ei_version, bw_flows_with_codes, biosphere_db_name).values()
+                   for method in variant]
+        write_bw_methods(methods)
+        return len(methods)
 
-                # initialize the "Method" method
-                new_method = bd.Method(name)
-                # register the new method
-                new_method.register()
-                # set its unit
-                new_method.metadata["unit"] = ic[1]
+    def bw_methods(self, ei_version, flows, biosphere_db_name):
+        """
+        Creates the brightway methods of IW+ for an ecoinvent version.
+        :param ei_version: the ecoinvent version, e.g., '3.10'
+        :param flows: dataframe of the "Elem flow name", "Compartment", "Sub-compartment" and "code" of the biosphere
+                      flows
+        :param biosphere_db_name: name of the biosphere database
+        :return: dictionary of the lists of (name, unit, CFs) of the methods, with the variants ("normal",
+                 "carbon neutrality" and "footprint") as keys
+        """
 
-                df = ei_in_bw_simple.loc[[ic], ['code', 'CF value']].copy()
-                df.set_index('code', inplace=True)
+        tables = next(tables for version, tables in BW_PROJECT_TABLES.items() if version in ei_version)
+        methods = {'normal': [], 'carbon neutrality': [], 'footprint': []}
+        for ei_in_bw_format in ['normal', 'carbon neutrality']:
+            if ei_in_bw_format == 'normal':
+                ei_in_bw = getattr(self, tables[0]).merge(flows)
+            elif ei_in_bw_format == 'carbon neutrality':
+                ei_in_bw = getattr(self, tables[1]).merge(flows)
+
+            # create total HH and EQ categories
+            ei_in_bw.set_index(['Impact category', 'CF unit', 'code'], inplace=True)
+            total_hh = ei_in_bw.loc(axis=0)[:, 'DALY'].copy('deep')
+            total_hh = total_hh.groupby('code').agg({'Compartment': 'first',
+                                                     'Sub-compartment': 'first',
+                                                     'Elem flow name': 'first',
+                                                     'CAS number': 'first',
+                                                     'CF value': sum,
+                                                     'Elem flow unit': 'first',
+                                                     'MP or Damage': 'first',
+                                                     'Native geographical resolution scale': 'first'})
+            total_hh.index = pd.MultiIndex.from_product([['Total human health'], ['DALY'], total_hh.index])
+            total_eq = ei_in_bw.loc(axis=0)[:, 'PDF.m2.yr'].copy('deep')
+            total_eq = total_eq.groupby('code').agg({'Compartment': 'first',
+                                                     'Sub-compartment': 'first',
+                                                     'Elem flow name': 'first',
+                                                     'CAS number': 'first',
+                                                     'CF value': sum,
+                                                     'Elem flow unit': 'first',
+                                                     'MP or Damage': 'first',
+                                                     'Native geographical resolution scale': 'first'})
+            total_eq.index = pd.MultiIndex.from_product(
+                [['Total ecosystem quality'], ['PDF.m2.yr'], total_eq.index])
+            ei_in_bw = pd.concat([ei_in_bw, total_hh, total_eq])
+            ei_in_bw.index.names = ['Impact category', 'CF unit', 'code']
+            ei_in_bw = ei_in_bw.reset_index()
+
+            # -------------- For complete version of IW+ ----------------
+            suffix = ' (incl. CO2 uptake)' if ei_in_bw_format == 'normal' else ''
+            mp_or_damage = ei_in_bw.groupby(['Impact category', 'CF unit'], observed=True)['MP or Damage'].first()
+            for ic, data in bw_characterization_factors(ei_in_bw, biosphere_db_name).items():
+                if mp_or_damage.loc[ic] == 'Midpoint':
+                    name = ('IMPACT World+ Midpoint ' + self.version + ' for ecoinvent v' + ei_version + suffix,
+                            'Midpoint', ic[0])
+                elif ic[1] == 'DALY':
+                    name = ('IMPACT World+ Damage ' + self.version + ' for ecoinvent v' + ei_version + suffix,
+                            'Human health', ic[0])
+                else:
+                    name = ('IMPACT World+ Damage ' + self.version + ' for ecoinvent v' + ei_version + suffix,
+                            'Ecosystem quality', ic[0])
+                methods[ei_in_bw_format].append((name, ic[1], data))
+
+        # -------------- For simplified version of IW+ ----------------
+        for ic, data in bw_characterization_factors(getattr(self, tables[2]).merge(flows), biosphere_db_name).items():
+            name = ('IMPACT World+ Footprint ' + self.version + ' for ecoinvent v' + ei_version, ic[0])
+            methods['footprint'].append((name, ic[1], data))
+
+        return methods
+
+    def write_bw2packages(self, folder, ei_versions=None):
+        """
+        Writes the bw2package files of IW+ directly from the CF tables, without going through a brightway project. The
+        codes of the biosphere flows are the ecoinvent UUIDs of the elementary flows (see link_to_ecoinvent()), which
+        are the codes of the biosphere database of brightway. They are checked against the biosphere database of the
+        brightway project of the ecoinvent version, if there is one in bw2_projects (see known_biosphere_flows()).
+        :param folder: folder of the bw2package files
+        :param ei_versions: ecoinvent versions for which the files are written, all the versions of BW_PROJECT_TABLES
+                            if None
+        :return: dictionary of the number of CFs written, with the paths of the files as keys
+        """
 
-                data = []
-                for stressor in df.index:
-                    data.append(((biosphere_db_name, stressor), df.loc[stressor, 'CF value']))
-                new_method.write(data)
+        rows = {}
+        for ei_version, tables in BW_PROJECT_TABLES.items():
+            if ei_versions is None or ei_version in ei_versions:
+                flows = pd.concat([getattr(self, table).loc[:, BIOSPHERE_INDEX_COLUMNS[:3] + ['ID']]
+                                   for table in tables[:2]]).drop_duplicates().rename(columns={'ID': 'code'})
+                flows = self.known_biosphere_flows(ei_version, flows)
+                methods = self.bw_methods(ei_version, flows, bw_biosphere_name(self.bw_version, ei_version))
+                suffix = ei_version.replace('.', '')
+                for variant, filename in [
+                        ('normal', ' (incl. CO2 uptake)_brightway' + self.bw_version + '_expert_version_ei' + suffix),
+                        ('carbon neutrality', '_brightway' + self.bw_version + '_expert_version_ei' + suffix),
+                        ('footprint', '_brightway' + self.bw_version + '_footprint_version_ei' + suffix)]:
+                    path = os.path.join(folder, 'impact_world_plus_' + self.version + filename + '.bw2package')
+                    rows[path] = write_bw2package(methods[variant], path)
+        return rows
+
+    def known_biosphere_flows(self, ei_version, flows):
+        """
+        Keeps the flows whose codes are in the biosphere database of the brightway project of an ecoinvent version, as
+        indexed by biosphere_flows_index(). A CF of a flow missing from the biosphere database would link to nothing
+        once the bw2package file is imported, the missing flows are thus reported and removed.
+        :param ei_version: the ecoinvent version, e.g., '3.10'
+        :param flows: dataframe of the "Elem flow name", "Compartment", "Sub-compartment" and "code" of the flows
+        :return: the flows of the biosphere database, all the flows if no brightway project of the ecoinvent version is
+                 in bw2_projects
+        """
 
+        projects = [project for project in self.bw2_projects if project.split('ecoinvent')[-1] == ei_version]
+        if not projects:
+            self.logger.warning("No brightway project of ecoinvent " + ei_version + " in bw2_projects, the codes of "
+                                "the bw2package files of this version are not checked against a biosphere database.")
+            return flows
+
+        bd.projects.set_current(projects[0])
+        biosphere_db_name = current_biosphere_name()
+        missing = ~mask_isin(flows, 'code', biosphere_flows_index(biosphere_db_name, self.cache_dir).loc[:, 'code'])
+        if missing.any():
+            self.logger.warning(str(missing.sum()) + " elementary flows of ecoinvent " + ei_version + " are not in "
+                                "the database " + biosphere_db_name + " of the project " + projects[0] + ", their "
+                                "CFs are not written, e.g., " + ', '.join(flows.loc[missing, 'Elem flow name'][:5]))
+        return flows.loc[~missing]
+
+    @profiled
     def export_to_sp(self):
         """
-        This method careates the necessary information for the csv creation in SimaPro.
+        This method careates the necessary information for the csv creation in SimaPro, i.e., the metadata and
+        weighting blocks of the methods. The CFs themselves are only read from the iw_sp dataframes when the csv files
+        are written (see write_sp_files()).
         :return:
         """
 
         self.logger.info("Exporting to SimaPro...")
 
-        # some elementary flows with the following region exceed the 100 characters limit of SimaPro -> drop region
-        self.iw_sp_carbon_neutrality = self.iw_sp_carbon_neutrality.loc[
-            ~self.iw_sp_carbon_neutrality.loc[:, 'Elem flow name'].str.contains(
-                'United States of America, including overseas territories')]
-        self.iw_sp = self.iw_sp.loc[~self.iw_sp.loc[:, 'Elem flow name'].str.contains(
-            'United States of America, including overseas territories')]
-        self.simplified_version_sp = self.simplified_version_sp.loc[~
-            self.simplified_version_sp.loc[:, 'Elem flow name'].str.contains(
-                'United States of America, including overseas territories')]
-
-        # csv accepts strings only
-        self.iw_sp.loc[:, 'CF value'] = self.iw_sp.loc[:, 'CF value'].astype(str)
-        self.iw_sp_carbon_neutrality.loc[:, 'CF value'] = self.iw_sp_carbon_neutrality.loc[:, 'CF value'].astype(str)
-        self.simplified_version_sp.loc[:, 'CF value'] = self.simplified_version_sp.loc[:, 'CF value'].astype(str)
-
         # Metadata
         l = ['SimaPro 9.6', 'methods', 'Date: ' + datetime.now().strftime("%D"),
              'Time: ' + datetime.now().strftime("%H:%M:%S"),
@@ -837,162 +1640,6 @@ class Parse:
         weighting_info_combined[56] = ['Physical effects on biota (damage)', '1.00E+00', '', '', '', '']
         weighting_info_combined[57] = ['Terrestrial acidification (damage)', '1.00E+00', '', '', '', '']
 
-        # extracting midpoint CFs
-        d_ic_unit = self.iw_sp.loc[self.iw_sp['MP or Damage'] == 'Midpoint',
-                                   ['Impact category', 'CF unit']].drop_duplicates().set_index('Impact category').iloc[
-                    :,
-                    0].to_dict()
-        midpoint_values = []
-        for j in d_ic_unit.keys():
-            midpoint_values.append(['', '', '', '', '', ''])
-            midpoint_values.append(['Impact category', '', '', '', '', ''])
-            midpoint_values.append([j, d_ic_unit[j], '', '', '', ''])
-            midpoint_values.append(['', '', '', '', '', ''])
-            midpoint_values.append(['Substances', '', '', '', '', ''])
-            df = self.iw_sp[self.iw_sp['Impact category'] == j]
-            df = df[df['CF unit'] == d_ic_unit[j]]
-            df = df[['Compartment', 'Sub-compartment', 'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit']]
-            for i in df.index:
-                if type(df.loc[i, 'CAS number']) == float:
-                    df.loc[i, 'CAS number'] = ''
-                midpoint_values.append(df.loc[i].tolist())
-
-        d_ic_unit = self.iw_sp_carbon_neutrality.loc[self.iw_sp_carbon_neutrality['MP or Damage'] == 'Midpoint',
-                                                     ['Impact category', 'CF unit']].drop_duplicates().set_index(
-            'Impact category').iloc[:,
-                    0].to_dict()
-        midpoint_values_carboneutrality = []
-        for j in d_ic_unit.keys():
-            midpoint_values_carboneutrality.append(['', '', '', '', '', ''])
-            midpoint_values_carboneutrality.append(['Impact category', '', '', '', '', ''])
-            midpoint_values_carboneutrality.append([j, d_ic_unit[j], '', '', '', ''])
-            midpoint_values_carboneutrality.append(['', '', '', '', '', ''])
-            midpoint_values_carboneutrality.append(['Substances', '', '', '', '', ''])
-            df = self.iw_sp_carbon_neutrality[self.iw_sp_carbon_neutrality['Impact category'] == j]
-            df = df[df['CF unit'] == d_ic_unit[j]]
-            df = df[['Compartment', 'Sub-compartment', 'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit']]
-            for i in df.index:
-                if type(df.loc[i, 'CAS number']) == float:
-                    df.loc[i, 'CAS number'] = ''
-                midpoint_values_carboneutrality.append(df.loc[i].tolist())
-
-        # extracting damage CFs
-        d_ic_unit = self.iw_sp.loc[self.iw_sp['MP or Damage'] == 'Damage',
-                                   ['Impact category', 'CF unit']].drop_duplicates().set_index('Impact category').iloc[
-                    :,
-                    0].to_dict()
-        damage_values = []
-        for j in d_ic_unit.keys():
-            damage_values.append(['', '', '', '', '', ''])
-            damage_values.append(['Impact category', '', '', '', '', ''])
-            damage_values.append([j, d_ic_unit[j], '', '', '', ''])
-            damage_values.append(['', '', '', '', '', ''])
-            damage_values.append(['Substances', '', '', '', '', ''])
-            df = self.iw_sp[self.iw_sp['Impact category'] == j]
-            df = df[df['CF unit'] == d_ic_unit[j]]
-            df = df[['Compartment', 'Sub-compartment', 'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit']]
-            for i in df.index:
-                if type(df.loc[i, 'CAS number']) == float:
-                    df.loc[i, 'CAS number'] = ''
-                damage_values.append(df.loc[i].tolist())
-
-        d_ic_unit = self.iw_sp_carbon_neutrality.loc[self.iw_sp_carbon_neutrality['MP or Damage'] == 'Damage',
-                                                     ['Impact category', 'CF unit']].drop_duplicates().set_index(
-            'Impact category').iloc[:,
-                    0].to_dict()
-        damage_values_carboneutrality = []
-        for j in d_ic_unit.keys():
-            damage_values_carboneutrality.append(['', '', '', '', '', ''])
-            damage_values_carboneutrality.append(['Impact category', '', '', '', '', ''])
-            damage_values_carboneutrality.append([j, d_ic_unit[j], '', '', '', ''])
-            damage_values_carboneutrality.append(['', '', '', '', '', ''])
-            damage_values_carboneutrality.append(['Substances', '', '', '', '', ''])
-            df = self.iw_sp_carbon_neutrality[self.iw_sp_carbon_neutrality['Impact category'] == j]
-            df = df[df['CF unit'] == d_ic_unit[j]]
-            df = df[['Compartment', 'Sub-compartment', 'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit']]
-            for i in df.index:
-                if type(df.loc[i, 'CAS number']) == float:
-                    df.loc[i, 'CAS number'] = ''
-                damage_values_carboneutrality.append(df.loc[i].tolist())
-
-        # extracting combined CFs
-        ic_unit = self.iw_sp.loc[:, ['Impact category', 'CF unit']].drop_duplicates()
-        same_names = ['Freshwater acidification', 'Freshwater eutrophication', 'Land occupation, biodiversity',
-                      'Land transformation, biodiversity', 'Marine eutrophication', 'Ozone layer depletion',
-                      'Particulate matter formation', 'Terrestrial acidification',
-                      'Physical effects on biota']
-        combined_values = []
-        for j in ic_unit.index:
-            combined_values.append(['', '', '', '', '', ''])
-            combined_values.append(['Impact category', '', '', '', '', ''])
-            if ic_unit.loc[j, 'Impact category'] in same_names:
-                if ic_unit.loc[j, 'CF unit'] in ['DALY', 'PDF.m2.yr']:
-                    combined_values.append([ic_unit.loc[j, 'Impact category'] + ' (damage)',
-                                            ic_unit.loc[j, 'CF unit'], '', '', '', ''])
-                else:
-                    combined_values.append([ic_unit.loc[j, 'Impact category'] + ' (midpoint)',
-                                            ic_unit.loc[j, 'CF unit'], '', '', '', ''])
-            else:
-                combined_values.append([ic_unit.loc[j, 'Impact category'],
-                                        ic_unit.loc[j, 'CF unit'], '', '', '', ''])
-            combined_values.append(['', '', '', '', '', ''])
-            combined_values.append(['Substances', '', '', '', '', ''])
-            df = self.iw_sp.loc[[i for i in self.iw_sp.index if (
-                    self.iw_sp.loc[i, 'Impact category'] == ic_unit.loc[j, 'Impact category'] and
-                    self.iw_sp.loc[i, 'CF unit'] == ic_unit.loc[j, 'CF unit'])]]
-            df = df[['Compartment', 'Sub-compartment', 'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit']]
-            for i in df.index:
-                if type(df.loc[i, 'CAS number']) == float:
-                    df.loc[i, 'CAS number'] = ''
-                combined_values.append(df.loc[i].tolist())
-
-        ic_unit = self.iw_sp_carbon_neutrality.loc[:, ['Impact category', 'CF unit']].drop_duplicates()
-        same_names = ['Freshwater acidification', 'Freshwater eutrophication', 'Land occupation, biodiversity',
-                      'Land transformation, biodiversity', 'Marine eutrophication', 'Ozone layer depletion',
-                      'Particulate matter formation', 'Terrestrial acidification',
-                      'Physical effects on biota']
-        combined_values_carboneutrality = []
-        for j in ic_unit.index:
-            combined_values_carboneutrality.append(['', '', '', '', '', ''])
-            combined_values_carboneutrality.append(['Impact category', '', '', '', '', ''])
-            if ic_unit.loc[j, 'Impact category'] in same_names:
-                if ic_unit.loc[j, 'CF unit'] in ['DALY', 'PDF.m2.yr']:
-                    combined_values_carboneutrality.append([ic_unit.loc[j, 'Impact category'] + ' (damage)',
-                                                            ic_unit.loc[j, 'CF unit'], '', '', '', ''])
-                else:
-                    combined_values_carboneutrality.append([ic_unit.loc[j, 'Impact category'] + ' (midpoint)',
-                                                            ic_unit.loc[j, 'CF unit'], '', '', '', ''])
-            else:
-                combined_values_carboneutrality.append([ic_unit.loc[j, 'Impact category'],
-                                                        ic_unit.loc[j, 'CF unit'], '', '', '', ''])
-            combined_values_carboneutrality.append(['', '', '', '', '', ''])
-            combined_values_carboneutrality.append(['Substances', '', '', '', '', ''])
-            df = self.iw_sp_carbon_neutrality.loc[[i for i in self.iw_sp_carbon_neutrality.index if (
-                    self.iw_sp_carbon_neutrality.loc[i, 'Impact category'] == ic_unit.loc[j, 'Impact category'] and
-                    self.iw_sp_carbon_neutrality.loc[i, 'CF unit'] == ic_unit.loc[j, 'CF unit'])]]
-            df = df[['Compartment', 'Sub-compartment', 'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit']]
-            for i in df.index:
-                if type(df.loc[i, 'CAS number']) == float:
-                    df.loc[i, 'CAS number'] = ''
-                combined_values_carboneutrality.append(df.loc[i].tolist())
-
-        # extracting simplified values
-        ic_unit = self.simplified_version_sp.loc[:, ['Impact category', 'CF unit']].drop_duplicates()
-        simplified_values = []
-        for j in ic_unit.index:
-            simplified_values.append(['', '', '', '', '', ''])
-            simplified_values.append(['Impact category', '', '', '', '', ''])
-            simplified_values.append([ic_unit.loc[j, 'Impact category'],
-                                      ic_unit.loc[j, 'CF unit'], '', '', '', ''])
-            simplified_values.append(['', '', '', '', '', ''])
-            simplified_values.append(['Substances', '', '', '', '', ''])
-            df = self.simplified_version_sp.loc[[i for i in self.simplified_version_sp.index if (
-                    self.simplified_version_sp.loc[i, 'Impact category'] == ic_unit.loc[j, 'Impact category'] and
-                    self.simplified_version_sp.loc[i, 'CF unit'] == ic_unit.loc[j, 'CF unit'])]]
-            df = df[['Compartment', 'Sub-compartment', 'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit']]
-            for i in df.index:
-                simplified_values.append(df.loc[i].tolist())
-
         # dump everything in an attribute
         self.sp_data = {'metadata': metadata, 'midpoint_method_metadata': midpoint_method_metadata,
                         'damage_method_metadata': damage_method_metadata,
@@ -1002,18 +1649,86 @@ class Parse:
                         'weighting_info_combined': weighting_info_combined,
                         'weighting_info_damage_carboneutrality': weighting_info_damage_carboneutrality,
                         'weighting_info_combined_carboneutrality': weighting_info_combined_carboneutrality,
-                        'midpoint_values': midpoint_values, 'damage_values': damage_values,
-                        'combined_values': combined_values, 'simplified_values': simplified_values,
                         'midpoint_method_metadata_carboneutrality': midpoint_method_metadata_carboneutrality,
                         'damage_method_metadata_carboneutrality': damage_method_metadata_carboneutrality,
-                        'combined_method_metadata_carboneutrality': combined_method_metadata_carboneutrality,
-                        'midpoint_values_carboneutrality': midpoint_values_carboneutrality,
-                        'damage_values_carboneutrality': damage_values_carboneutrality,
-                        'combined_values_carboneutrality': combined_values_carboneutrality}
+                        'combined_method_metadata_carboneutrality': combined_method_metadata_carboneutrality}
+
+    def sp_rows(self, table, method, method_metadata, weighting_info=None):
+        """
+        Generator of the rows of a SimaPro csv file: the metadata of the method, then its impact categories and their
+        substances, read one impact category at a time from the CF table, and finally the weighting information.
+        :param table: name of the CF table linked to SimaPro, e.g., "iw_sp"
+        :param method: type of the method, "midpoint", "damage", "combined" or "simplified"
+        :param method_metadata: key of the metadata of the method in self.sp_data
+        :param weighting_info: key of the weighting information of the method in self.sp_data, if any
+        :return: rows of the csv file
+        """
+
+        yield from self.sp_data['metadata']
+        yield ['', '', '', '', '', '']
+        yield from self.sp_data[method_metadata]
+        df = self.__dict__[table]
+        # some elementary flows with the following region exceed the 100 characters limit of SimaPro -> drop region
+        df = df.loc[~mask_contains(df, 'Elem flow name', 'United States of America, including overseas territories')]
+        yield from sp_impact_category_rows(df, sp_impact_categories(df, method), blank_cas=method != 'simplified')
+        yield ['', '', '', '', '', '']
+        if weighting_info:
+            yield from self.sp_data[weighting_info]
+            yield ['', '', '', '', '', '']
+        yield ['End', '', '', '', '', '']
+
+    def write_sp_files(self, folder, files=SP_FILES):
+        """
+        Writes SimaPro csv files, each in a single pass over the rows generated by sp_rows().
+        :param folder: folder of the SimaPro files
+        :param files: the files to write, as described in SP_FILES
+        :return: dictionary of the number of rows written, with the paths of the files as keys
+        """
 
+        rows = {}
+        for file_name, table, method, method_metadata, weighting_info in files:
+            path = folder + 'impact_world_plus_' + self.version + file_name
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f, delimiter=";")
+                rows[path] = 0
+                for row in self.sp_rows(table, method, method_metadata, weighting_info):
+                    writer.writerow(row)
+                    rows[path] += 1
+        return rows
+
+    def olca_methods(self):
+        """
+        Generator of the IW+ methods to create in openLCA. Methods are yielded one at a time, so that only one of the
+        selections of the olca dataframes is held in memory.
+        :return: tuples (method name, dataframe of the CFs of the method)
+        """
+
+        df = self.olca_iw_carbon_neutrality.copy()
+        # impact categories are renamed, so they cannot stay categorical
+        df['Impact category'] = df['Impact category'].astype(object)
+        df.loc[(df.loc[:, 'Impact category'].isin(SAME_NAME_CATEGORIES) & (
+                    df.loc[:, 'MP or Damage'] == 'Midpoint')), 'Impact category'] += ' (midpoint)'
+        df.loc[(df.loc[:, 'Impact category'].isin(SAME_NAME_CATEGORIES) & (
+                    df.loc[:, 'MP or Damage'] == 'Damage')), 'Impact category'] += ' (damage)'
+        yield 'IMPACT World+ v' + self.version, df
+        del df
+
+        yield ('IMPACT World+ v' + self.version + ' - Expert - incl. CO2 uptake',
+               self.olca_iw.loc[self.olca_iw.loc[:, 'MP or Damage'] == 'Damage'])
+        yield ('IMPACT World+ v' + self.version + ' - Midpoint - incl. CO2 uptake',
+               self.olca_iw.loc[self.olca_iw.loc[:, 'MP or Damage'] == 'Midpoint'])
+        yield ('IMPACT World+ v' + self.version + ' - Expert',
+               self.olca_iw_carbon_neutrality.loc[
+                   self.olca_iw_carbon_neutrality.loc[:, 'MP or Damage'] == 'Damage'])
+        yield ('IMPACT World+ v' + self.version + ' - Midpoint',
+               self.olca_iw_carbon_neutrality.loc[
+                   self.olca_iw_carbon_neutrality.loc[:, 'MP or Damage'] == 'Midpoint'])
+        yield 'IMPACT World+ v' + self.version + ' - Footprint', self.simplified_version_olca
+
+    @profiled
     def export_to_olca(self):
         """
-        This method creates the necessary information for the creation of json files in openLCA.
+        This method creates the IW+ methods in the openLCA database connected through IPC.
         :return:
         """
 
@@ -1061,71 +1776,110 @@ class Parse:
 
             self.olca_client.put(new_impact_method)
 
-        df = self.olca_iw_carbon_neutrality.copy()
-        same_names = ['Freshwater acidification', 'Freshwater eutrophication', 'Land occupation, biodiversity',
-                      'Land transformation, biodiversity', 'Marine eutrophication', 'Ozone layer depletion',
-                      'Particulate matter formation', 'Terrestrial acidification',
-                      'Physical effects on biota']
-        df.loc[(df.loc[:, 'Impact category'].isin(same_names) & (
-                    df.loc[:, 'MP or Damage'] == 'Midpoint')), 'Impact category'] += ' (midpoint)'
-        df.loc[(df.loc[:, 'Impact category'].isin(same_names) & (
-                    df.loc[:, 'MP or Damage'] == 'Damage')), 'Impact category'] += ' (damage)'
-        new_method = schema.ImpactMethod()
-        new_method.category = 'IMPACT World+ LCIA Methods'
-        new_method.version = self.version
-        new_method.name = 'IMPACT World+ v'+self.version
-        new_method.description = 'For more information on IMPACT World+, check our website: https://www.impactworldplus.org/'
-        new_method.impact_categories = []
-        write_to_olca(df, new_method)
-
-        df = self.olca_iw.loc[self.olca_iw.loc[:, 'MP or Damage'] == 'Damage'].copy()
-        new_method = schema.ImpactMethod()
-        new_method.category = 'IMPACT World+ LCIA Methods'
-        new_method.version = self.version
-        new_method.name = 'IMPACT World+ v'+self.version+' - Expert - incl. CO2 uptake'
-        new_method.description = 'For more information on IMPACT World+, check our website: https://www.impactworldplus.org/'
-        new_method.impact_categories = []
-        write_to_olca(df, new_method)
-
-        df = self.olca_iw.loc[self.olca_iw.loc[:, 'MP or Damage'] == 'Midpoint'].copy()
-        new_method = schema.ImpactMethod()
-        new_method.category = 'IMPACT World+ LCIA Methods'
-        new_method.version = self.version
-        new_method.name = 'IMPACT World+ v'+self.version+' - Midpoint - incl. CO2 uptake'
-        new_method.description = 'For more information on IMPACT World+, check our website: https://www.impactworldplus.org/'
-        new_method.impact_categories = []
-        write_to_olca(df, new_method)
-
-        df = self.olca_iw_carbon_neutrality.loc[
-            self.olca_iw_carbon_neutrality.loc[:, 'MP or Damage'] == 'Damage'].copy()
-        new_method = schema.ImpactMethod()
-        new_method.category = 'IMPACT World+ LCIA Methods'
-        new_method.version = self.version
-        new_method.name = 'IMPACT World+ v'+self.version+' - Expert'
-        new_method.description = 'For more information on IMPACT World+, check our website: https://www.impactworldplus.org/'
-        new_method.impact_categories = []
-        write_to_olca(df, new_method)
-
-        df = self.olca_iw_carbon_neutrality.loc[
-            self.olca_iw_carbon_neutrality.loc[:, 'MP or Damage'] == 'Midpoint'].copy()
-        new_method = schema.ImpactMethod()
-        new_method.category = 'IMPACT World+ LCIA Methods'
-        new_method.version = self.version
-        new_method.name = 'IMPACT World+ v'+self.version+' - Midpoint'
-        new_method.description = 'For more information on IMPACT World+, check our website: https://www.impactworldplus.org/'
-        new_method.impact_categories = []
-        write_to_olca(df, new_method)
-
-        df = self.simplified_version_olca.copy()
-        new_method = schema.ImpactMethod()
-        new_method.category = 'IMPACT World+ LCIA Methods'
-        new_method.version = self.version
-        new_method.name = 'IMPACT World+ v'+self.version+' - Footprint'
-        new_method.description = 'For more information on IMPACT World+, check our website: https://www.impactworldplus.org/'
-        new_method.impact_categories = []
-        write_to_olca(df, new_method)
-
-    def produce_files(self, bw_only:bool=False):
+        for method_name, df in self.olca_methods():
+            new_method = schema.ImpactMethod()
+            new_method.category = OLCA_METHOD_CATEGORY
+            new_method.version = self.version
+            new_method.name = method_name
+            new_method.description = OLCA_METHOD_DESCRIPTION
+            new_method.impact_categories = []
+            write_to_olca(df, new_method)
+
+    @profiled
+    def export_to_olca_zip(self, path, reference_zip=None):
+        """
+        This method writes the IW+ methods as an openLCA JSON-LD package, which can be imported in openLCA without
+        having the software running. Impact categories are written one at a time, so that only the factors of one
+        category are held in memory.
+
+        Flows are referenced with the UUIDs of the openLCA mapping. Locations are referenced with the UUIDs of
+        reference_zip when given (CFs of locations missing from it are skipped, like in export_to_olca()), otherwise
+        with UUIDs derived from their code, the same way openLCA derives the UUIDs of its reference data.
+
+        :param path: path of the .zip file to write
+        :param reference_zip: optional JSON-LD package exported from the target openLCA database, used to read the UUIDs
+                              of the locations
+        :return: the number of impact factors written
+        """
+
+        self.logger.info("Exporting to an openLCA JSON-LD package...")
+
+        locations = olca_location_ids(reference_zip) if reference_zip else None
+        locations_undefined_in_olca = set()
+        n_impact_factors = 0
+
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as package:
+            package.writestr('olca-schema.json', json.dumps({'version': 2}))
+            for method_name, df in self.olca_methods():
+                method_id = olca_key('ImpactMethod', method_name)
+                impact_categories = []
+                for impact_category, dff in tqdm(df.groupby('Impact category', observed=True, sort=False)):
+                    impact_factors, undefined = olca_impact_factors(dff, locations)
+                    locations_undefined_in_olca.update(undefined)
+                    n_impact_factors += len(impact_factors)
+                    ref = olca_ref('ImpactCategory', olca_key('ImpactCategory', method_name, impact_category),
+                                   name=impact_category, refUnit=dff.loc[:, 'CF unit'].iloc[0])
+                    package.writestr('lcia_categories/' + ref['@id'] + '.json', json.dumps(dict(
+                        ref, category=OLCA_METHOD_CATEGORY + '/' + method_name, version=self.version,
+                        impactFactors=impact_factors)))
+                    impact_categories.append(ref)
+
+                package.writestr('lcia_methods/' + method_id + '.json', json.dumps(dict(
+                    olca_ref('ImpactMethod', method_id, name=method_name), category=OLCA_METHOD_CATEGORY,
+                    version=self.version, description=OLCA_METHOD_DESCRIPTION, impactCategories=impact_categories)))
+
+        if locations_undefined_in_olca:
+            self.logger.warning("CFs of locations undefined in the reference package were skipped: " +
+                                ', '.join(sorted(locations_undefined_in_olca)))
+        return n_impact_factors
+
+    def write_olca_zip(self, path, reference_zip):
+        """
+        Job of produce_files() writing the openLCA version, see export_to_olca_zip().
+        :param path: path of the .zip file to write
+        :param reference_zip: JSON-LD package exported from the target openLCA database
+        :return: dictionary of the number of impact factors written, with the path of the file as key
+        """
+
+        return {path: self.export_to_olca_zip(path, reference_zip)}
+
+    def output_tables(self):
+        """
+        Lists the CF tables written by produce_files(), with their paths relative to the folder of the IW+ files.
+        :return: list of (path without extension, dataframe)
+        """
+
+        return [
+            # Dev version
+            ('Dev/impact_world_plus_' + self.version + ' (incl. CO2 uptake)_dev', self.master_db),
+            ('Dev/impact_world_plus_' + self.version + '_dev', self.master_db_carbon_neutrality),
+            # ecoinvent versions
+            ('ecoinvent/impact_world_plus_' + self.version + ' (incl. CO2 uptake)_expert_version_ecoinvent_v310',
+             self.ei310_iw),
+            ('ecoinvent/impact_world_plus_' + self.version + ' (incl. CO2 uptake)_expert_version_ecoinvent_v311',
+             self.ei311_iw),
+            ('ecoinvent/impact_world_plus_' + self.version + ' (incl. CO2 uptake)_expert_version_ecoinvent_v312',
+             self.ei312_iw),
+            ('ecoinvent/impact_world_plus_' + self.version + '_expert_version_ecoinvent_v310',
+             self.ei310_iw_carbon_neutrality),
+            ('ecoinvent/impact_world_plus_' + self.version + '_expert_version_ecoinvent_v311',
+             self.ei311_iw_carbon_neutrality),
+            ('ecoinvent/impact_world_plus_' + self.version + '_expert_version_ecoinvent_v312',
+             self.ei312_iw_carbon_neutrality),
+            ('ecoinvent/impact_world_plus_' + self.version + '_footprint_version_ecoinvent_v310',
+             self.simplified_version_ei310),
+            ('ecoinvent/impact_world_plus_' + self.version + '_footprint_version_ecoinvent_v311',
+             self.simplified_version_ei311),
+            ('ecoinvent/impact_world_plus_' + self.version + '_footprint_version_ecoinvent_v312',
+             self.simplified_version_ei312),
+            # exiobase versions
+            ('exiobase/impact_world_plus_' + self.version + '_expert_version_exiobase_3.8.2_and_before',
+             self.exio_iw_38),
+            ('exiobase/impact_world_plus_' + self.version + '_expert_version_exiobase_3.9_and_after',
+             self.exio_iw_39)]
+
+    @profiled
+    def produce_files(self, bw_only:bool=False, output_format:str='xlsx', reference_zip:str=None):
         """
         Function producing the different IW+ files for the different versions.
         
@@ -1133,155 +1887,112 @@ class Parse:
         ----------
         bw_only:bool, optional, default False
             If set to True, only brightway files will be generated.
+        output_format:str, optional, default 'xlsx'
+            Format of the CF tables (dev, ecoinvent and exiobase versions), one of OUTPUT_FORMATS. 'xlsx' files are
+            written row by row with a constant memory footprint, 'parquet' and 'feather' files (which require pyarrow)
+            have a schema independent of the categories of the tables and 'csv' files are gzip-compressed.
+        reference_zip:str, optional, default None
+            JSON-LD package exported from the target openLCA database, from which the UUIDs of the locations of the
+            openLCA version are read (see export_to_olca_zip()). Without it, the openLCA version is not written, as
+            the locations of its regionalized CFs could not be checked against the reference data of openLCA.
         
         Return
         ----------
-           Returns None. IW+ files are generated in `./Databases/Impact_world_2.2`
+           Returns None. IW+ files are generated in `./Databases/Impact_world_2.2`, along with a `manifest.json`
+           listing every file generated with its number of rows and its hash.
         """
 
-        # Note, for openLCA we just export the files directly from the software
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError("output_format should be one of: " + ', '.join(OUTPUT_FORMATS))
+        if output_format in ['parquet', 'feather']:
+            # checked before any file is written, pandas would only fail in the job writing the first table. pyarrow
+            # is an optional dependency, commented in requirements.txt
+            try:
+                importlib.import_module('pyarrow')
+            except ImportError as e:
+                raise ImportError("output_format '" + output_format + "' requires pyarrow, which is not installed. "
+                                  "Install it with: pip install pyarrow") from e
+
         if not bw_only:
             self.logger.info("Creating all the files...")
         else :
             self.logger.info("Creating brightway files")
 
         path = pkg_resources.resource_filename(__name__, '/Databases/Impact_world_' + self.version)
+        os.makedirs(path, exist_ok=True)
 
-        # if the folders are not there yet, create them
-        if not os.path.exists(path + '/bw' + self.bw_version.replace('.', '')):
-            os.makedirs(path + '/bw' + self.bw_version.replace('.', ''))
-        if not bw_only:
-            if not os.path.exists(path + '/Dev/'):
-                os.makedirs(path + '/Dev/')
-            if not os.path.exists(path + '/ecoinvent/'):
-                os.makedirs(path + '/ecoinvent/')
-            if not os.path.exists(path + '/exiobase/'):
-                os.makedirs(path + '/exiobase/')
-            if not os.path.exists(path + '/SimaPro/'):
-                os.makedirs(path + '/SimaPro/')
-            if not os.path.exists(path + '/openLCA/'):
-                os.makedirs(path + '/openLCA/')
+        # files are written in a staging folder next to the IW+ files and only moved in place once all of them were
+        # written, so that a failure never leaves a partially updated folder behind
+        staging = tempfile.mkdtemp(prefix='.Impact_world_' + self.version + '.', dir=os.path.dirname(path))
+        try:
+            artifacts = self.run_output_jobs(self.output_jobs(staging, bw_only, output_format, reference_zip))
+            write_manifest(staging, artifacts, version=self.version, output_format=output_format)
+            publish_staged_files(staging, path)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def output_jobs(self, folder, bw_only=False, output_format='xlsx', reference_zip=None):
+        """
+        Lists the independent jobs writing the IW+ files of produce_files().
+        :param folder: folder where the files are written
+        :param bw_only: if True, only the jobs writing brightway files are listed
+        :param output_format: format of the CF tables, one of OUTPUT_FORMATS
+        :param reference_zip: JSON-LD package of the target openLCA database, the openLCA version is skipped if None
+        :return: list of (name of the job, function writing the files and returning their number of rows by path)
+        """
 
+        bw_folder = os.path.join(folder, 'bw' + self.bw_version.replace('.', ''))
+        os.makedirs(bw_folder, exist_ok=True)
         # brightway2 versions in bw2package format
-        for project in self.bw2_projects:
-            bd.projects.set_current(project)
-            for ei_version in ['3.10', '3.11', '3.12']:
-                if ei_version in project:
-                    IW_ic = [bd.Method(ic) for ic in list(bd.methods) if
-                         ('IMPACT World+' in ic[0] and 'Footprint' not in ic[0] and
-                          self.version in ic[0] and "for ecoinvent" in ic[0] and
-                          ' (incl. CO2 uptake)' in ic[0] and 'regionalized' not in ic[0])]
-                    bi.package.BW2Package.export_objs(IW_ic, filename='impact_world_plus_' + self.version +
-                                                                    ' (incl. CO2 uptake)_brightway' + self.bw_version +
-                                                                    f"_expert_version_ei{ei_version.replace('.','')}",
-                                                    folder=path + '/bw' + self.bw_version.replace('.', '') + '/')
-                    IW_ic = [bd.Method(ic) for ic in list(bd.methods) if
-                            ('IMPACT World+' in ic[0] and 'Footprint' not in ic[0] and
-                            self.version in ic[0] and "for ecoinvent" in ic[0] and
-                            ' (incl. CO2 uptake)' not in ic[0] and 'regionalized' not in ic[0])]
-                    bi.package.BW2Package.export_objs(IW_ic, filename='impact_world_plus_' + self.version +
-                                                                    '_brightway' + self.bw_version +
-                                                                    f"_expert_version_ei{ei_version.replace('.','')}",
-                                                    folder=path + '/bw' + self.bw_version.replace('.', '') + '/')
-                    IW_ic = [bd.Method(ic) for ic in list(bd.methods) if
-                            ('IMPACT World+' in ic[0] and 'Footprint' in ic[0] and
-                            self.version in ic[0] and "for ecoinvent" in ic[0] and 'regionalized' not in ic[0])]
-                    bi.package.BW2Package.export_objs(IW_ic, filename='impact_world_plus_' + self.version +
-                                                                    '_brightway' + self.bw_version +
-                                                                    f"_footprint_version_ei{ei_version.replace('.','')}",
-                                                    folder=path + '/bw' + self.bw_version.replace('.', '') + '/')
-        if not bw_only:
-            # Dev version
-            self.master_db.to_excel(path + '/Dev/impact_world_plus_' + self.version + ' (incl. CO2 uptake)_dev.xlsx')
-            self.master_db_carbon_neutrality.to_excel(path + '/Dev/impact_world_plus_' + self.version + '_dev.xlsx')
-
-            # ecoinvent versions in Excel format
-            self.ei310_iw.to_excel(
-                path + '/ecoinvent/impact_world_plus_' + self.version + ' (incl. CO2 uptake)_expert_version_ecoinvent_v310.xlsx')
-            self.ei311_iw.to_excel(
-                path + '/ecoinvent/impact_world_plus_' + self.version + ' (incl. CO2 uptake)_expert_version_ecoinvent_v311.xlsx')
-            self.ei312_iw.to_excel(
-                path + '/ecoinvent/impact_world_plus_' + self.version + ' (incl. CO2 uptake)_expert_version_ecoinvent_v312.xlsx')
-            self.ei310_iw_carbon_neutrality.to_excel(
-                path + '/ecoinvent/impact_world_plus_' + self.version + '_expert_version_ecoinvent_v310.xlsx')
-            self.ei311_iw_carbon_neutrality.to_excel(
-                path + '/ecoinvent/impact_world_plus_' + self.version + '_expert_version_ecoinvent_v311.xlsx')
-            self.ei312_iw_carbon_neutrality.to_excel(
-                path + '/ecoinvent/impact_world_plus_' + self.version + '_expert_version_ecoinvent_v312.xlsx')
-
-            # ecoinvent version in DataFrame format
-            self.simplified_version_ei310.to_excel(
-                path + '/ecoinvent/impact_world_plus_' + self.version + '_footprint_version_ecoinvent_v310.xlsx')
-            self.simplified_version_ei311.to_excel(
-                path + '/ecoinvent/impact_world_plus_' + self.version + '_footprint_version_ecoinvent_v311.xlsx')
-            self.simplified_version_ei312.to_excel(
-                path + '/ecoinvent/impact_world_plus_' + self.version + '_footprint_version_ecoinvent_v312.xlsx')
-
-            # exiobase version in DataFrame format
-            self.exio_iw_38.to_excel(path + '/exiobase/impact_world_plus_' + self.version +
-                                    '_expert_version_exiobase_3.8.2_and_before.xlsx')
-            self.exio_iw_39.to_excel(path + '/exiobase/impact_world_plus_' + self.version +
-                                    '_expert_version_exiobase_3.9_and_after.xlsx')
-
-            # SimaPro version in csv format
-            with open(
-                    path + '/SimaPro/impact_world_plus_' + self.version + ' (incl. CO2 uptake)_midpoint_version_simapro.csv',
-                    'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f, delimiter=";")
-                writer.writerows(
-                    self.sp_data['metadata'] + [['', '', '', '', '', '']] + self.sp_data['midpoint_method_metadata'] +
-                    self.sp_data['midpoint_values'] + [['', '', '', '', '', '']])
-                writer.writerows([['End', '', '', '', '', '']])
-            with open(
-                    path + '/SimaPro/impact_world_plus_' + self.version + ' (incl. CO2 uptake)_expert_version_simapro.csv',
-                    'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f, delimiter=";")
-                writer.writerows(
-                    self.sp_data['metadata'] + [['', '', '', '', '', '']] + self.sp_data['damage_method_metadata'] +
-                    self.sp_data['damage_values'] + [['', '', '', '', '', '']])
-                writer.writerows(self.sp_data['weighting_info_damage'] + [['', '', '', '', '', '']])
-                writer.writerows([['End', '', '', '', '', '']])
-            with open(path + '/SimaPro/impact_world_plus_' + self.version + ' (incl. CO2 uptake)_simapro.csv', 'w',
-                    newline='', encoding='utf-8') as f:
-                writer = csv.writer(f, delimiter=";")
-                writer.writerows(
-                    self.sp_data['metadata'] + [['', '', '', '', '', '']] + self.sp_data['combined_method_metadata'] +
-                    self.sp_data['combined_values'] + [['', '', '', '', '', '']])
-                writer.writerows(self.sp_data['weighting_info_combined'] + [['', '', '', '', '', '']])
-                writer.writerows([['End', '', '', '', '', '']])
-            with open(path + '/SimaPro/impact_world_plus_' + self.version + '_footprint_version_simapro.csv', 'w',
-                    newline='', encoding='utf-8') as f:
-                writer = csv.writer(f, delimiter=";")
-                writer.writerows(
-                    self.sp_data['metadata'] + [['', '', '', '', '', '']] + self.sp_data['simplified_method_metadata'] +
-                    self.sp_data['simplified_values'] + [['', '', '', '', '', '']])
-                writer.writerows([['End', '', '', '', '', '']])
-            with open(path + '/SimaPro/impact_world_plus_' + self.version + '_midpoint_version_simapro.csv', 'w',
-                    newline='', encoding='utf-8') as f:
-                writer = csv.writer(f, delimiter=";")
-                writer.writerows(
-                    self.sp_data['metadata'] + [['', '', '', '', '', '']] + self.sp_data[
-                        'midpoint_method_metadata_carboneutrality'] +
-                    self.sp_data['midpoint_values_carboneutrality'] + [['', '', '', '', '', '']])
-                writer.writerows([['End', '', '', '', '', '']])
-            with open(path + '/SimaPro/impact_world_plus_' + self.version + '_expert_version_simapro.csv', 'w',
-                    newline='', encoding='utf-8') as f:
-                writer = csv.writer(f, delimiter=";")
-                writer.writerows(
-                    self.sp_data['metadata'] + [['', '', '', '', '', '']] + self.sp_data[
-                        'damage_method_metadata_carboneutrality'] +
-                    self.sp_data['damage_values_carboneutrality'] + [['', '', '', '', '', '']])
-                writer.writerows(self.sp_data['weighting_info_damage_carboneutrality'] + [['', '', '', '', '', '']])
-                writer.writerows([['End', '', '', '', '', '']])
-            with open(path + '/SimaPro/impact_world_plus_' + self.version + '_simapro.csv', 'w',
-                    newline='', encoding='utf-8') as f:
-                writer = csv.writer(f, delimiter=";")
-                writer.writerows(
-                    self.sp_data['metadata'] + [['', '', '', '', '', '']] + self.sp_data[
-                        'combined_method_metadata_carboneutrality'] +
-                    self.sp_data['combined_values_carboneutrality'] + [['', '', '', '', '', '']])
-                writer.writerows(self.sp_data['weighting_info_combined_carboneutrality'] + [['', '', '', '', '', '']])
-                writer.writerows([['End', '', '', '', '', '']])
+        jobs = [('bw2package ei' + ei_version, functools.partial(self.write_bw2packages, bw_folder, [ei_version]))
+                for ei_version in BW_PROJECT_TABLES]
+        if bw_only:
+            return jobs
+
+        for subfolder in ['Dev', 'ecoinvent', 'exiobase', 'SimaPro', 'openLCA']:
+            os.makedirs(os.path.join(folder, subfolder), exist_ok=True)
+        # Dev, ecoinvent and exiobase versions
+        for file_name, df in self.output_tables():
+            jobs.append((file_name, functools.partial(write_table_artifact, df, folder + '/' + file_name,
+                                                      output_format)))
+        # SimaPro version in csv format
+        for sp_file in SP_FILES:
+            jobs.append(('SimaPro' + sp_file[0], functools.partial(self.write_sp_files, folder + '/SimaPro/',
+                                                                   [sp_file])))
+        # openLCA version in JSON-LD format
+        if reference_zip:
+            jobs.append(('openLCA', functools.partial(
+                self.write_olca_zip, folder + '/openLCA/impact_world_plus_' + self.version + '_openLCA.zip',
+                reference_zip)))
+        else:
+            self.logger.warning("No reference_zip given, the openLCA version is not written. Export a JSON-LD package "
+                                "of the target openLCA database and give it as reference_zip to produce_files().")
+        return jobs
+
+    def run_output_jobs(self, jobs):
+        """
+        Runs the jobs writing the IW+ files. With n_jobs > 1, the jobs run in a pool of threads: the CF tables are
+        shared rather than copied to other processes, and compressing and writing the files release the GIL. As the
+        stages of the profiler cannot be recorded from several threads, the jobs run one after the other when
+        profiling is enabled.
+        :param jobs: list of jobs, as given by output_jobs()
+        :return: dictionary of the number of rows of the files written, with their paths as keys
+        """
+
+        artifacts = {}
+        if self.n_jobs > 1 and len(jobs) > 1 and self.profiler is None:
+            executor = ThreadPoolExecutor(max_workers=min(self.n_jobs, len(jobs)))
+            try:
+                futures = [executor.submit(job) for name, job in jobs]
+                for future in futures:
+                    artifacts.update(future.result())
+            finally:
+                executor.shutdown(cancel_futures=True)
+        else:
+            for name, job in jobs:
+                with self.profile_stage(name):
+                    artifacts.update(job())
+        return artifacts
 
     # ----------------------------------------- Secondary methods -----------------------------------------------------
 
@@ -1313,28 +2024,28 @@ class Parse:
         """
 
         self.logger.info("Loading ionizing radiations characterization factors...")
-        ionizing = pd.read_sql(sql='SELECT * FROM [CF - not regionalized - IonizingRadiations]', con=self.conn)
+        ionizing = self.tables.read('CF - not regionalized - IonizingRadiations')
 
         self.logger.info("Loading marine acidification characterization factors...")
-        mar_acid = pd.read_sql(sql='SELECT * FROM [CF - not regionalized - MarineAcidification]', con=self.conn)
+        mar_acid = self.tables.read('CF - not regionalized - MarineAcidification')
 
         self.logger.info("Loading fossil resources characterization factors...")
-        fossils = pd.read_sql(sql='SELECT * FROM [CF - not regionalized - FossilResources]', con=self.conn)
+        fossils = self.tables.read('CF - not regionalized - FossilResources')
 
         self.logger.info("Loading mineral resources characterization factors...")
-        minerals = pd.read_sql(sql='SELECT * FROM [CF - not regionalized - MineralResources]', con=self.conn)
+        minerals = self.tables.read('CF - not regionalized - MineralResources')
 
-        elem_flow_list = pd.read_sql(sql='SELECT * FROM [SI - Mapping with elementary flows]', con=self.conn)
+        elem_flow_list = self.tables.read('SI - Mapping with elementary flows')
 
         self.logger.info("Loading toxicity characterization factors...")
-        toxicity = pd.read_sql(sql='SELECT * FROM [CF - not regionalized - HumanTox]', con=self.conn)
+        toxicity = self.tables.read('CF - not regionalized - HumanTox')
         toxicity = toxicity.merge(elem_flow_list.loc[:, ['Name IW+', 'CAS-Usetox2_FW']], left_on=['CAS number'],
                                   right_on=['CAS-Usetox2_FW'], how='left').drop_duplicates()
         toxicity = toxicity.drop(['Elem flow name', 'CAS number'], axis=1)
         toxicity = toxicity.rename(columns={'Name IW+': 'Elem flow name', 'CAS-Usetox2_FW': 'CAS number'})
 
         self.logger.info("Loading freshwater ecotoxicity characterization factors...")
-        fw_ecotoxicity = pd.read_sql(sql='SELECT * FROM [CF - not regionalized - FreshwaterEcotox]', con=self.conn)
+        fw_ecotoxicity = self.tables.read('CF - not regionalized - FreshwaterEcotox')
         fw_ecotoxicity = fw_ecotoxicity.merge(elem_flow_list.loc[:, ['Name IW+', 'CAS-Usetox2_FW']],
                                               left_on=['CAS number'],
                                               right_on=['CAS-Usetox2_FW'], how='left').drop_duplicates()
@@ -1342,7 +2053,7 @@ class Parse:
         fw_ecotoxicity = fw_ecotoxicity.rename(columns={'Name IW+': 'Elem flow name', 'CAS-Usetox2_FW': 'CAS number'})
 
         self.logger.info("Loading marine ecotoxicity characterization factors...")
-        mar_ecotoxicity = pd.read_sql('SELECT * FROM [CF - not regionalized - MarineEcotox]', self.conn)
+        mar_ecotoxicity = self.tables.read('CF - not regionalized - MarineEcotox')
         mar_ecotoxicity = mar_ecotoxicity.merge(elem_flow_list.loc[:, ['Name IW+', 'CAS-Usetox2_Mar_Terr']],
                                                 left_on=['CAS number'],
                                                 right_on=['CAS-Usetox2_Mar_Terr'], how='left').drop_duplicates()
@@ -1351,7 +2062,7 @@ class Parse:
             columns={'Name IW+': 'Elem flow name', 'CAS-Usetox2_Mar_Terr': 'CAS number'})
 
         self.logger.info("Loading terrestrial ecotoxicity characterization factors...")
-        terr_ecotoxicity = pd.read_sql('SELECT * FROM [CF - not regionalized - TerrestrialEcotox]', self.conn)
+        terr_ecotoxicity = self.tables.read('CF - not regionalized - TerrestrialEcotox')
         terr_ecotoxicity = terr_ecotoxicity.merge(elem_flow_list.loc[:, ['Name IW+', 'CAS-Usetox2_Mar_Terr']],
                                                   left_on=['CAS number'],
                                                   right_on=['CAS-Usetox2_Mar_Terr'], how='left').drop_duplicates()
@@ -1380,7 +2091,7 @@ class Parse:
         :return: updated master_db
         """
 
-        data = pd.read_sql('SELECT * FROM "CF - not regionalized - ClimateChange"', con=self.conn)
+        data = self.tables.read('CF - not regionalized - ClimateChange')
 
         # add carbon monoxide, which is based on the (C) stoechiometric ratio between CO2 and CO (1.57)
         monoxide = data.loc[data.Name == 'Carbon dioxide'].copy()
@@ -1394,7 +2105,7 @@ class Parse:
             monoxide.loc[monoxide.index[0], indicator] = float(monoxide.loc[monoxide.index[0], indicator]) * 1.57
         data = clean_up_dataframe(pd.concat([data, monoxide]))
 
-        mapping = pd.read_sql('SELECT * FROM "SI - Mapping with elementary flows"', con=self.conn)
+        mapping = self.tables.read('SI - Mapping with elementary flows')
         data = data.merge(mapping.loc[:, ['Name IW+', 'Name-ipcc', 'CAS IW+']].dropna(subset='Name-ipcc'),
                           left_on='Name', right_on='Name-ipcc', how='inner').drop(['Name', 'Name-ipcc'], axis=1)
 
@@ -1424,11 +2135,10 @@ class Parse:
         # ---------------------------- Climate change damage indicators -----------------------------------------------
 
         # get fate factors
-        fate_factors = pd.read_sql('SELECT * FROM "SI - Climate change - fate factors (K/kg)"',
-                                   con=self.conn).set_index(['Name IW+', 'CAS IW+'])
+        fate_factors = self.tables.read('SI - Climate change - fate factors (K/kg)').set_index(['Name IW+', 'CAS IW+'])
 
         # get effect factors
-        effect_factors = pd.read_sql('SELECT * FROM "SI - Climate change - effect factors"', con=self.conn).set_index(
+        effect_factors = self.tables.read('SI - Climate change - effect factors').set_index(
             'index')
         HH_effect_factor = effect_factors.loc['Total', 'Human health (DALY/K/yr)']
         EQ_terr_effect_factor = effect_factors.loc['Total', 'Ecosystem quality - terrestrial species (PDF.m2/K/yr)']
@@ -1517,11 +2227,10 @@ class Parse:
         GWP_damage_EQ_mar_short = add_biogenic_methane(GWP_damage_EQ_mar_short)
         GWP_damage_EQ_mar_long = add_biogenic_methane(GWP_damage_EQ_mar_long)
 
-        self.master_db = pd.concat([self.master_db, GWP_midpoint, GTP_midpoint,
-                                    GWP_damage_EQ_terr_short, GWP_damage_EQ_terr_long,
-                                    GWP_damage_EQ_mar_short, GWP_damage_EQ_mar_long,
-                                    GWP_damage_HH_short, GWP_damage_HH_long])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(GWP_midpoint, GTP_midpoint,
+                              GWP_damage_EQ_terr_short, GWP_damage_EQ_terr_long,
+                              GWP_damage_EQ_mar_short, GWP_damage_EQ_mar_long,
+                              GWP_damage_HH_short, GWP_damage_HH_long)
 
     def load_ozone_layer_depletion_cfs(self):
         """
@@ -1533,7 +2242,7 @@ class Parse:
         :return: updated master_db
         """
 
-        data = pd.read_sql('SELECT * FROM "CF - not regionalized - OzoneLayerDepletion"', self.conn).set_index('index')
+        data = self.tables.read('CF - not regionalized - OzoneLayerDepletion').set_index('index')
 
         # reformat
         data = data.loc[:, ['CAS', 'ODP (infinite)']].reset_index()
@@ -1546,7 +2255,7 @@ class Parse:
         data.loc[:, 'MP or Damage'] = 'Midpoint'
         data.loc[:, 'Native geographical resolution scale'] = 'Not regionalized'
         # map names to IW+ standard
-        mapping = pd.read_sql('SELECT * FROM "SI - Mapping with elementary flows"', con=self.conn)
+        mapping = self.tables.read('SI - Mapping with elementary flows')
         data.loc[:, 'Elem flow name'] = [dict(zip(mapping.loc[:, 'Name-ODP'], mapping.loc[:, "Name IW+"]))[i] for i in
                                          data.loc[:, 'Elem flow name']]
 
@@ -1561,8 +2270,7 @@ class Parse:
         data.index = [i for i in range(0, len(data.index))]
 
         # concat with master_db
-        self.master_db = pd.concat([self.master_db, data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(data)
 
     def load_photochemical_ozone_formation(self):
         """
@@ -1574,10 +2282,9 @@ class Parse:
         :return: updated master_db
         """
 
-        data = pd.read_sql(sql='SELECT * FROM [CF - not regionalized - PhotochemOxid]', con=self.conn)
-        mapping = pd.read_sql('SELECT * FROM "SI - Mapping with elementary flows"', con=self.conn)
-        effect_factor = pd.read_sql(sql='SELECT * FROM [SI - Photochemical ozone formation - effect factors]',
-                                    con=self.conn)
+        data = self.tables.read('CF - not regionalized - PhotochemOxid')
+        mapping = self.tables.read('SI - Mapping with elementary flows')
+        effect_factor = self.tables.read('SI - Photochemical ozone formation - effect factors')
         data = data.merge(mapping, left_on=['Substance name'], right_on=['Name-photochem'])
 
         photochem_damage_hh = data.copy('deep')
@@ -1624,13 +2331,13 @@ class Parse:
         photochem_midpoint.loc[:, 'Native geographical resolution scale'] = 'Not regionalized'
 
         # concat with master_db
-        self.master_db = pd.concat([self.master_db, photochem_midpoint, photochem_damage_hh, photochem_damage_eq])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(photochem_midpoint, photochem_damage_hh, photochem_damage_eq)
 
     def load_freshwater_acidification_cfs(self):
         """
         Loading the CFs for the freshwater acidification impact category. This includes CFs coming from the
-        original article of IW+, as well as other CFs extrapolated from stoechiometric ratios.
+        original article of IW+. CFs of other substances are extrapolated from stoechiometric ratios afterwards, see
+        apply_stoichiometric_ratios().
 
         Concerned impact categories:
             - Freshwater acidification
@@ -1639,138 +2346,19 @@ class Parse:
         """
 
         # ------------------------------ LOADING DATA -----------------------------------
-        data = pd.read_sql('SELECT * FROM [CF - regionalized - AcidFW - aggregated]', self.conn)
-
-        # concatenating/formatting all the data in one dataframe
-        concat_data = pd.DataFrame()
-
-        for ix, row in data.iterrows():
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Freshwater acidification', 'kg SO2 eq', 'Air', '(unspecified)',
-                                                   'Ammonia, ' + row['Short name ecoinvent'], '7664-41-7',
-                                                   row['CF NH3 (kg SO2 eq)'], 'kg', 'Midpoint', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Freshwater acidification', 'PDF.m2.yr', 'Air', '(unspecified)',
-                                                   'Ammonia, ' + row['Short name ecoinvent'], '7664-41-7',
-                                                   row['CF NH3 (PDF.m2.yr)'], 'kg', 'Damage', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Freshwater acidification', 'kg SO2 eq', 'Air', '(unspecified)',
-                                                   'Nitrogen oxides, ' + row['Short name ecoinvent'], '11104-93-1',
-                                                   row['CF NOx (kg SO2 eq)'], 'kg', 'Midpoint', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Freshwater acidification', 'PDF.m2.yr', 'Air', '(unspecified)',
-                                                   'Nitrogen oxides, ' + row['Short name ecoinvent'], '11104-93-1',
-                                                   row['CF NOx (PDF.m2.yr)'], 'kg', 'Damage', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Freshwater acidification', 'kg SO2 eq', 'Air', '(unspecified)',
-                                                   'Sulfur dioxide, ' + row['Short name ecoinvent'], '7446-09-05',
-                                                   row['CF SO2 (kg SO2 eq)'], 'kg', 'Midpoint', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Freshwater acidification', 'PDF.m2.yr', 'Air', '(unspecified)',
-                                                   'Sulfur dioxide, ' + row['Short name ecoinvent'], '7446-09-05',
-                                                   row['CF SO2 (PDF.m2.yr)'], 'kg', 'Damage', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Freshwater acidification', 'kg SO2 eq', 'Air', '(unspecified)',
-                                                   'Nitric acid, ' + row['Short name ecoinvent'], '7697-37-2',
-                                                   row['CF HNO3 (kg SO2 eq)'], 'kg', 'Midpoint', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Freshwater acidification', 'PDF.m2.yr', 'Air', '(unspecified)',
-                                                   'Nitric acid, ' + row['Short name ecoinvent'], '7697-37-2',
-                                                   row['CF HNO3 (PDF.m2.yr)'], 'kg', 'Damage', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-        concat_data = concat_data.reset_index().drop('index', axis=1)
-
-        concat_data.loc[[i for i in concat_data.index if
-                         concat_data.loc[i, 'Elem flow name'].split(', ')[-1] in ['RNA', 'RLA', 'RER', 'RAS', 'RAF',
-                                                                                  'RME', 'UN-OCEANIA']],
-                        'Native geographical resolution scale'] = 'Continent'
-        concat_data.loc[[i for i in concat_data.index if concat_data.loc[i, 'Elem flow name'].split(', ')[
-            -1] == 'GLO'], 'Native geographical resolution scale'] = 'Global'
-        concat_data.loc[[i for i in concat_data.index if concat_data.loc[i, 'Elem flow name'].split(', ')[
-            -1] == 'RoW'], 'Native geographical resolution scale'] = 'Other region'
-
-        # ------------------------------ APPLYING STOECHIOMETRIC RATIOS --------------------------
-        stoc = pd.read_sql('SELECT * FROM [SI - Stoechiometry]', self.conn)
-        stoc = stoc.loc[stoc.loc[:, 'Impact category'] == 'Freshwater acidification']
-
-        for ix in stoc.index:
-            proxy = stoc.loc[ix, 'Proxy molecule']
-            comp = stoc.loc[ix, 'Compartment']
-            df = pd.DataFrame()
-            if proxy == 'NH3':
-                # don't create a duplicate
-                if stoc.loc[ix, 'Elem flow name'] != 'Ammonia':
-                    df = concat_data[concat_data.loc[:, 'Elem flow name'].str.contains('Ammonia') &
-                                     ~(concat_data.loc[:, 'Elem flow name'].str.contains('Ammonia, as N'))].loc[
-                        concat_data.loc[:, 'Compartment'] == comp].copy('deep')
-                    df.loc[:, 'Elem flow name'] = [i.replace('Ammonia', stoc.loc[ix, 'Elem flow name']) for i in
-                                                   df.loc[:, 'Elem flow name']]
-            if proxy == 'HNO3':
-                # don't create a duplicate
-                if stoc.loc[ix, 'Elem flow name'] != 'Nitric acid':
-                    df = concat_data[concat_data.loc[:, 'Elem flow name'].str.contains('Nitric acid')].loc[
-                        concat_data.loc[:, 'Compartment'] == comp].copy('deep')
-                    df.loc[:, 'Elem flow name'] = [i.replace('Nitric acid', stoc.loc[ix, 'Elem flow name']) for i in
-                                                   df.loc[:, 'Elem flow name']]
-            if proxy == 'SO2':
-                # don't create a duplicate
-                if stoc.loc[ix, 'Elem flow name'] != 'Sulfur dioxide':
-                    df = concat_data[concat_data.loc[:, 'Elem flow name'].str.contains('Sulfur dioxide')].loc[
-                        concat_data.loc[:, 'Compartment'] == comp].copy('deep')
-                    df.loc[:, 'Elem flow name'] = [i.replace('Sulfur dioxide', stoc.loc[ix, 'Elem flow name']) for i in
-                                                   df.loc[:, 'Elem flow name']]
-            if proxy == 'NOx':
-                # don't create a duplicate
-                if stoc.loc[ix, 'Elem flow name'] != 'Nitrogen oxides':
-                    df = concat_data[concat_data.loc[:, 'Elem flow name'].str.contains('Nitrogen oxides')].loc[
-                        concat_data.loc[:, 'Compartment'] == comp].copy('deep')
-                    df.loc[:, 'Elem flow name'] = [i.replace('Nitrogen oxides', stoc.loc[ix, 'Elem flow name']) for i in
-                                                   df.loc[:, 'Elem flow name']]
-            if not df.empty:
-                df.loc[:, 'CAS number'] = stoc.loc[ix, 'CAS number']
-                df.loc[:, 'CF value'] *= stoc.loc[ix, 'Proxy ratio']
-
-                concat_data = clean_up_dataframe(pd.concat([concat_data, df]))
+        data = self.tables.read('CF - regionalized - AcidFW - aggregated')
+
+        # formatting all the data in one dataframe
+        concat_data = aggregated_cfs_to_long(data, 'Freshwater acidification')
 
         # concat with master_db
-        self.master_db = pd.concat([self.master_db, concat_data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(concat_data)
 
     def load_terrestrial_acidification_cfs(self):
         """
         Loading the CFs for the terrestrial acidification impact category. This includes CFs coming from the
-        original article of IW+, as well as other CFs extrapolated from stoechiometric ratios.
+        original article of IW+. CFs of other substances are extrapolated from stoechiometric ratios afterwards, see
+        apply_stoichiometric_ratios().
 
         Concerned impact categories:
             - Terrestrial acidification
@@ -1779,114 +2367,19 @@ class Parse:
         """
 
         # ------------------------------ LOADING DATA -----------------------------------
-        data = pd.read_sql('SELECT * FROM [CF - regionalized - AcidTerr - aggregated]', self.conn)
-
-        # concatenating/formatting all the data in one dataframe
-        concat_data = pd.DataFrame()
-
-        for ix, row in data.iterrows():
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Terrestrial acidification', 'kg SO2 eq', 'Air', '(unspecified)',
-                                                   'Ammonia, ' + row['Short name ecoinvent'], '7664-41-7',
-                                                   row['CF NH3 (kg SO2 eq)'], 'kg', 'Midpoint', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Terrestrial acidification', 'PDF.m2.yr', 'Air', '(unspecified)',
-                                                   'Ammonia, ' + row['Short name ecoinvent'], '7664-41-7',
-                                                   row['CF NH3 (PDF.m2.yr)'], 'kg', 'Damage', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Terrestrial acidification', 'kg SO2 eq', 'Air', '(unspecified)',
-                                                   'Nitrogen oxides, ' + row['Short name ecoinvent'], '11104-93-1',
-                                                   row['CF NOx (kg SO2 eq)'], 'kg', 'Midpoint', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Terrestrial acidification', 'PDF.m2.yr', 'Air', '(unspecified)',
-                                                   'Nitrogen oxides, ' + row['Short name ecoinvent'], '11104-93-1',
-                                                   row['CF NOx (PDF.m2.yr)'], 'kg', 'Damage', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Terrestrial acidification', 'kg SO2 eq', 'Air', '(unspecified)',
-                                                   'Sulfur dioxide, ' + row['Short name ecoinvent'], '7446-09-05',
-                                                   row['CF SO2 (kg SO2 eq)'], 'kg', 'Midpoint', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Terrestrial acidification', 'PDF.m2.yr', 'Air', '(unspecified)',
-                                                   'Sulfur dioxide, ' + row['Short name ecoinvent'], '7446-09-05',
-                                                   row['CF SO2 (PDF.m2.yr)'], 'kg', 'Damage', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-        concat_data = concat_data.reset_index().drop('index', axis=1)
-        concat_data.loc[[i for i in concat_data.index if
-                         concat_data.loc[i, 'Elem flow name'].split(', ')[-1] in ['RNA', 'RLA', 'RER', 'RAS', 'RAF',
-                                                                                  'RME', 'UN-OCEANIA']],
-                        'Native geographical resolution scale'] = 'Continent'
-        concat_data.loc[[i for i in concat_data.index if concat_data.loc[i, 'Elem flow name'].split(', ')[
-            -1] == 'GLO'], 'Native geographical resolution scale'] = 'Global'
-        concat_data.loc[[i for i in concat_data.index if concat_data.loc[i, 'Elem flow name'].split(', ')[
-            -1] == 'RoW'], 'Native geographical resolution scale'] = 'Other region'
-
-        # ------------------------------ APPLYING STOECHIOMETRIC RATIOS --------------------------
-        stoc = pd.read_sql('SELECT * FROM [SI - Stoechiometry]', self.conn)
-        stoc = stoc.loc[stoc.loc[:, 'Impact category'] == 'Terrestrial acidification']
-
-        for ix in stoc.index:
-            proxy = stoc.loc[ix, 'Proxy molecule']
-            comp = stoc.loc[ix, 'Compartment']
-            df = pd.DataFrame()
-            if proxy == 'NH3':
-                # don't create a duplicate
-                if stoc.loc[ix, 'Elem flow name'] != 'Ammonia':
-                    df = concat_data[concat_data.loc[:, 'Elem flow name'].str.contains('Ammonia') &
-                                     ~(concat_data.loc[:, 'Elem flow name'].str.contains('Ammonia, as N'))].loc[
-                        concat_data.loc[:, 'Compartment'] == comp].copy('deep')
-                    df.loc[:, 'Elem flow name'] = [i.replace('Ammonia', stoc.loc[ix, 'Elem flow name']) for i in
-                                                   df.loc[:, 'Elem flow name']]
-            if proxy == 'SO2':
-                # don't create a duplicate
-                if stoc.loc[ix, 'Elem flow name'] != 'Sulfur dioxide':
-                    df = concat_data[concat_data.loc[:, 'Elem flow name'].str.contains('Sulfur dioxide')].loc[
-                        concat_data.loc[:, 'Compartment'] == comp].copy('deep')
-                    df.loc[:, 'Elem flow name'] = [i.replace('Sulfur dioxide', stoc.loc[ix, 'Elem flow name']) for i in
-                                                   df.loc[:, 'Elem flow name']]
-            if proxy == 'NOx':
-                # don't create a duplicate
-                if stoc.loc[ix, 'Elem flow name'] != 'Nitrogen oxides':
-                    df = concat_data[concat_data.loc[:, 'Elem flow name'].str.contains('Nitrogen oxides')].loc[
-                        concat_data.loc[:, 'Compartment'] == comp].copy('deep')
-                    df.loc[:, 'Elem flow name'] = [i.replace('Nitrogen oxides', stoc.loc[ix, 'Elem flow name']) for i in
-                                                   df.loc[:, 'Elem flow name']]
-            if not df.empty:
-                df.loc[:, 'CAS number'] = stoc.loc[ix, 'CAS number']
-                df.loc[:, 'CF value'] *= stoc.loc[ix, 'Proxy ratio']
-
-                concat_data = clean_up_dataframe(pd.concat([concat_data, df]))
+        data = self.tables.read('CF - regionalized - AcidTerr - aggregated')
+
+        # formatting all the data in one dataframe
+        concat_data = aggregated_cfs_to_long(data, 'Terrestrial acidification')
 
         # concat with master_db
-        self.master_db = pd.concat([self.master_db, concat_data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(concat_data)
 
     def load_marine_eutrophication_cfs(self):
         """
         Loading the CFs for the marine eutrophication impact category. This includes CFs coming from the
-        original article of IW+, as well as other CFs extrapolated from stoechiometric ratios.
+        original article of IW+. CFs of other substances are extrapolated from stoechiometric ratios afterwards, see
+        apply_stoichiometric_ratios().
 
         Concerned impact categories:
             - Marine eutrophication
@@ -1895,114 +2388,18 @@ class Parse:
         """
 
         # ------------------------------ LOADING DATA -----------------------------------
-        data = pd.read_sql('SELECT * FROM [CF - regionalized - MarEutro - aggregated]', self.conn)
-
-        concat_data = pd.DataFrame()
-
-        for ix, row in data.iterrows():
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Marine eutrophication', 'kg N N-lim eq', 'Air', '(unspecified)',
-                                                   'Ammonia, ' + row['Short name ecoinvent'], '7664-41-7',
-                                                   row['CF NH3 (kg N N-lim eq)'], 'kg', 'Midpoint', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Marine eutrophication', 'PDF.m2.yr', 'Air', '(unspecified)',
-                                                   'Ammonia, ' + row['Short name ecoinvent'], '7664-41-7',
-                                                   row['CF NH3 (PDF.m2.yr)'], 'kg', 'Damage', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Marine eutrophication', 'kg N N-lim eq', 'Air', '(unspecified)',
-                                                   'Nitrogen oxides, ' + row['Short name ecoinvent'], '11104-93-1',
-                                                   row['CF NOx (kg N N-lim eq)'], 'kg', 'Midpoint', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Marine eutrophication', 'PDF.m2.yr', 'Air', '(unspecified)',
-                                                   'Nitrogen oxides, ' + row['Short name ecoinvent'], '11104-93-1',
-                                                   row['CF NOx (PDF.m2.yr)'], 'kg', 'Damage', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Marine eutrophication', 'kg N N-lim eq', 'Air', '(unspecified)',
-                                                   'Nitric acid, ' + row['Short name ecoinvent'], '7697-37-2',
-                                                   row['CF HNO3 (kg N N-lim eq)'], 'kg', 'Midpoint', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Marine eutrophication', 'PDF.m2.yr', 'Air', '(unspecified)',
-                                                   'Nitric acid, ' + row['Short name ecoinvent'], '7697-37-2',
-                                                   row['CF HNO3 (PDF.m2.yr)'], 'kg', 'Damage', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-        concat_data = concat_data.reset_index().drop('index', axis=1)
-
-        concat_data.loc[[i for i in concat_data.index if
-                         concat_data.loc[i, 'Elem flow name'].split(', ')[-1] in ['RNA', 'RLA', 'RER', 'RAS', 'RAF',
-                                                                                  'RME', 'UN-OCEANIA']],
-                        'Native geographical resolution scale'] = 'Continent'
-        concat_data.loc[[i for i in concat_data.index if concat_data.loc[i, 'Elem flow name'].split(', ')[
-            -1] == 'GLO'], 'Native geographical resolution scale'] = 'Global'
-        concat_data.loc[[i for i in concat_data.index if concat_data.loc[i, 'Elem flow name'].split(', ')[
-            -1] == 'RoW'], 'Native geographical resolution scale'] = 'Other region'
+        data = self.tables.read('CF - regionalized - MarEutro - aggregated')
+
+        # formatting all the data in one dataframe
+        concat_data = aggregated_cfs_to_long(data, 'Marine eutrophication')
 
         # add non-regionalized flows (water emissions)
         concat_data = clean_up_dataframe(pd.concat(
-            [concat_data, pd.read_sql('SELECT * FROM [CF - not regionalized - MarEutro]', self.conn)]))
+            [concat_data, self.tables.read('CF - not regionalized - MarEutro')]))
         concat_data.loc[concat_data.Compartment == 'Water', 'Native geographical resolution scale'] = 'Not regionalized'
 
-        # ------------------------------ APPLYING STOECHIOMETRIC RATIOS --------------------------
-        stoc = pd.read_sql('SELECT * FROM [SI - Stoechiometry]', self.conn)
-        stoc = stoc.loc[stoc.loc[:, 'Impact category'] == 'Marine eutrophication']
-
-        for ix in stoc.index:
-            proxy = stoc.loc[ix, 'Proxy molecule']
-            comp = stoc.loc[ix, 'Compartment']
-            df = pd.DataFrame()
-            if proxy == 'NH3':
-                # don't create a duplicate
-                if stoc.loc[ix, 'Elem flow name'] != 'Ammonia':
-                    df = concat_data[concat_data.loc[:, 'Elem flow name'].str.contains('Ammonia') &
-                                     ~(concat_data.loc[:, 'Elem flow name'].str.contains('Ammonia, as N'))].loc[
-                        concat_data.loc[:, 'Compartment'] == comp].copy('deep')
-                    df.loc[:, 'Elem flow name'] = [i.replace('Ammonia', stoc.loc[ix, 'Elem flow name']) for i in
-                                                   df.loc[:, 'Elem flow name']]
-            if proxy == 'HNO3':
-                # don't create a duplicate
-                if stoc.loc[ix, 'Elem flow name'] != 'Nitric acid':
-                    df = concat_data[concat_data.loc[:, 'Elem flow name'].str.contains('Nitric acid')].loc[
-                        concat_data.loc[:, 'Compartment'] == comp].copy('deep')
-                    df.loc[:, 'Elem flow name'] = [i.replace('Nitric acid', stoc.loc[ix, 'Elem flow name']) for i in
-                                                   df.loc[:, 'Elem flow name']]
-            if proxy == 'NOx':
-                # don't create a duplicate
-                if stoc.loc[ix, 'Elem flow name'] != 'Nitrogen oxides':
-                    df = concat_data[concat_data.loc[:, 'Elem flow name'].str.contains('Nitrogen oxides')].loc[
-                        concat_data.loc[:, 'Compartment'] == comp].copy('deep')
-                    df.loc[:, 'Elem flow name'] = [i.replace('Nitrogen oxides', stoc.loc[ix, 'Elem flow name']) for i in
-                                                   df.loc[:, 'Elem flow name']]
-            if not df.empty:
-                df.loc[:, 'CAS number'] = stoc.loc[ix, 'CAS number']
-                df.loc[:, 'CF value'] *= stoc.loc[ix, 'Proxy ratio']
-
-                concat_data = clean_up_dataframe(pd.concat([concat_data, df]))
-
         # concat with master_db
-        self.master_db = pd.concat([self.master_db, concat_data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(concat_data)
 
     def load_resources_services_loss_cfs(self):
         """
@@ -2017,7 +2414,7 @@ class Parse:
 
         # ----------------------------- RESEDA ----------------------------------------
 
-        data = pd.read_sql('SELECT * FROM [CF - not regionalized - ResourcesServicesDeficit]', self.conn)
+        data = self.tables.read('CF - not regionalized - ResourcesServicesDeficit')
         data.columns = ['Elem flow name', 'CAS number', 'CF value', 'Status', 'Elem flow unit']
 
         # uncomment if you want to remove isotopes
@@ -2060,12 +2457,11 @@ class Parse:
         data = data.reset_index().drop('index', axis=1)
 
         # concat with master_db
-        self.master_db = pd.concat([self.master_db, data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(data)
 
         # ------------------------------ ACP ----------------------------------------
 
-        data = pd.read_sql('SELECT * FROM [CF - not regionalized - ResourcesServicesLossAdaptation]', self.conn)
+        data = self.tables.read('CF - not regionalized - ResourcesServicesLossAdaptation')
         data.columns = ['Elem flow name', 'CAS number', 'CF value', 'Status', 'Elem flow unit']
 
         # uncomment if you want to remove isotopes
@@ -2108,13 +2504,13 @@ class Parse:
         data = data.reset_index().drop('index', axis=1)
 
         # concat with master_db
-        self.master_db = pd.concat([self.master_db, data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(data)
 
     def load_freshwater_eutrophication_cfs(self):
         """
         Loading the CFs for the freshwater eutrophication impact category. This includes CFs coming from the
-        original article of IW+, as well as other CFs extrapolated from stoechiometric ratios.
+        original article of IW+. CFs of other substances are extrapolated from stoechiometric ratios afterwards, see
+        apply_stoichiometric_ratios().
 
         Concerned impact categories:
             - Freshwater eutrophication
@@ -2123,56 +2519,13 @@ class Parse:
         """
 
         # ------------------------------ LOADING DATA -----------------------------------
-        data = pd.read_sql('SELECT * FROM [CF - regionalized - EutroFW - aggregated]', self.conn)
+        data = self.tables.read('CF - regionalized - EutroFW - aggregated')
 
         # ------------------------------ FORMAT DATA ------------------------------------
-        concat_data = pd.DataFrame()
-
-        for ix, row in data.iterrows():
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(
-                                         ['Freshwater eutrophication', 'kg PO4 P-lim eq', 'Water', '(unspecified)',
-                                          'Phosphate, ' + row['Short name ecoinvent'], '14265-44-2',
-                                          row['CF PO4 (kg PO4 P-lim eq)'], 'kg', 'Midpoint', 'Country'],
-                                         index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                'MP or Damage', 'Native geographical resolution scale']).T])
-
-            concat_data = pd.concat([concat_data,
-                                     pd.DataFrame(['Freshwater eutrophication', 'PDF.m2.yr', 'Water', '(unspecified)',
-                                                   'Phosphate, ' + row['Short name ecoinvent'], '14265-44-2',
-                                                   row['CF PO4 (PDF.m2.yr)'], 'kg', 'Damage', 'Country'],
-                                                  index=['Impact category', 'CF unit', 'Compartment', 'Sub-compartment',
-                                                         'Elem flow name', 'CAS number', 'CF value', 'Elem flow unit',
-                                                         'MP or Damage', 'Native geographical resolution scale']).T])
-
-        concat_data = concat_data.reset_index().drop('index', axis=1)
-
-        concat_data.loc[[i for i in concat_data.index if
-                         concat_data.loc[i, 'Elem flow name'].split(', ')[-1] in ['RNA', 'RLA', 'RER', 'RAS', 'RAF',
-                                                                                  'RME', 'UN-OCEANIA']],
-                        'Native geographical resolution scale'] = 'Continent'
-        concat_data.loc[[i for i in concat_data.index if concat_data.loc[i, 'Elem flow name'].split(', ')[
-            -1] == 'GLO'], 'Native geographical resolution scale'] = 'Global'
-
-        # ------------------------------ APPLYING STOECHIOMETRIC RATIOS --------------------------
-        stoc = pd.read_sql('SELECT * FROM [SI - Stoechiometry]', self.conn)
-        stoc = stoc.loc[stoc.loc[:, 'Impact category'] == 'Freshwater eutrophication']
-
-        for ix in stoc.index:
-            df = concat_data[concat_data.loc[:, 'Elem flow name'].str.contains('Phosphate')].loc[
-                concat_data.loc[:, 'Compartment'] == stoc.loc[ix, 'Compartment']].copy('deep')
-
-            df.loc[:, 'Elem flow name'] = [i.replace('Phosphate', stoc.loc[ix, 'Elem flow name']) for i in
-                                           df.loc[:, 'Elem flow name']]
-            df.loc[:, 'CAS number'] = stoc.loc[ix, 'CAS number']
-            df.loc[:, 'CF value'] *= stoc.loc[ix, 'Proxy ratio']
-
-            concat_data = clean_up_dataframe(pd.concat([concat_data, df]))
+        concat_data = aggregated_cfs_to_long(data, 'Freshwater eutrophication')
 
         # concat with master_db
-        self.master_db = pd.concat([self.master_db, concat_data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(concat_data)
 
     def load_land_use_cfs(self):
         """
@@ -2186,7 +2539,7 @@ class Parse:
         """
 
         # ------------------------------ LOADING DATA -----------------------------------
-        data = pd.read_sql('SELECT * FROM [CF - regionalized - Land use - aggregated]', self.conn)
+        data = self.tables.read('CF - regionalized - Land use - aggregated')
 
         data = data.loc[:, ['Elem flow name', 'CFs (PDF.m2.yr)']]
         data = data.rename(columns={'CFs (PDF.m2.yr)': 'CF value'})
@@ -2204,14 +2557,13 @@ class Parse:
 
         # calculate midpoint values
         midpoint_data = data.copy()
-        midpoint_data.loc[[i for i in midpoint_data.index if 'Occupation' in midpoint_data.loc[i, 'Elem flow name']],
+        midpoint_data.loc[mask_contains(midpoint_data, 'Elem flow name', 'Occupation'),
                           'CF value'] /= (
             midpoint_data.loc[midpoint_data.loc[:, 'Elem flow name'] ==
                               'Occupation, annual crops, GLO', 'CF value'].iloc[0]
         )
-        midpoint_data.loc[
-            [i for i in midpoint_data.index if 'Transformation' in midpoint_data.loc[i, 'Elem flow name']],
-            'CF value'] /= abs(
+        midpoint_data.loc[mask_contains(midpoint_data, 'Elem flow name', 'Transformation'),
+                          'CF value'] /= abs(
             midpoint_data.loc[midpoint_data.loc[:, 'Elem flow name'] ==
                               'Transformation, from annual crops, GLO', 'CF value'].iloc[0]
         )
@@ -2223,16 +2575,12 @@ class Parse:
 
         data = pd.concat([data, midpoint_data]).reset_index().drop('index', axis=1)
 
-        data.loc[[i for i in data.index if
-                  data.loc[i, 'Elem flow name'].split(', ')[-1] in ['RNA', 'RLA', 'RER', 'RAS', 'RAF',
-                                                                    'RME', 'UN-OCEANIA']],
+        data.loc[mask_region(data, 'Elem flow name', ['RNA', 'RLA', 'RER', 'RAS', 'RAF', 'RME', 'UN-OCEANIA']),
                  'Native geographical resolution scale'] = 'Continent'
-        data.loc[[i for i in data.index if
-                  data.loc[i, 'Elem flow name'].split(', ')[-1] == 'GLO'],
+        data.loc[mask_region(data, 'Elem flow name', 'GLO'),
                  'Native geographical resolution scale'] = 'Global'
 
-        data.loc[[i for i in data.index if
-                  data.loc[i, 'Elem flow name'].split(', ')[-1] == 'RoW'],
+        data.loc[mask_region(data, 'Elem flow name', 'RoW'),
                  'Native geographical resolution scale'] = 'Other region'
 
         forest_not_used = data.loc[data.loc[:, 'Elem flow name'].str.contains('artificial areas')].copy()
@@ -2243,8 +2591,7 @@ class Parse:
         data = pd.concat([data, forest_not_used]).reset_index().drop('index', axis=1)
 
         # concat with master_db
-        self.master_db = pd.concat([self.master_db, data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(data)
 
     def load_particulates_cfs(self):
         """
@@ -2256,8 +2603,8 @@ class Parse:
         :return: updated master_db
         """
 
-        data = pd.read_sql(sql='SELECT * FROM [CF - regionalized - ParticulateMatter - native]', con=self.conn)
-        conc = pd.read_sql(sql='SELECT * FROM [SI - Mapping with regions of ecoinvent]', con=self.conn).set_index(
+        data = self.tables.read('CF - regionalized - ParticulateMatter - native')
+        conc = self.tables.read('SI - Mapping with regions of ecoinvent', ['Ecoinvent_short_name', 'PM']).set_index(
             'Ecoinvent_short_name').PM
 
         # first we need to aggregate sub-regions to country level for a few countries which otherwise undefined
@@ -2265,92 +2612,35 @@ class Parse:
                                                 'Norway', 'Spain', 'United Kingdom', 'Mexico', 'Saudi Arabia', 'Canada',
                                                 'United States', 'Australia', 'Brazil', 'China', 'India', 'Indonesia']
 
-        for country in countries_of_subregions_to_aggregate:
-            CF_urban = ((data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                i, 'Native geographical resolution scale'] == 'city')], 'CF urban'] *
-                         data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                             i, 'Native geographical resolution scale'] == 'city')], 'Population urban'] /
-                         data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                             i, 'Native geographical resolution scale'] == 'city')], 'Population urban'].sum())).sum()
-            CF_rural = ((data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                i, 'Native geographical resolution scale'] == 'sub-regions')], 'CF rural'] *
-                         data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                             i, 'Native geographical resolution scale'] == 'sub-regions')], 'Population rural'] /
-                         data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                             i, 'Native geographical resolution scale'] == 'sub-regions')], 'Population rural'].sum())).sum()
-            CF_unspecified = ((data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                i, 'Native geographical resolution scale'] == 'sub-regions')], 'CF unspecified'] *
-                               (data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                                   i, 'Native geographical resolution scale'] == 'sub-regions')], 'Population urban'] +
-                                data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                                    i, 'Native geographical resolution scale'] == 'sub-regions')], 'Population rural']) /
-                               (data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                                   i, 'Native geographical resolution scale'] == 'sub-regions')], 'Population urban'] +
-                                data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                                    i, 'Native geographical resolution scale'] == 'sub-regions')], 'Population rural']).sum())).sum()
-            urban_pop = data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                i, 'Native geographical resolution scale'] == 'city')], 'Population urban'].sum()
-            rural_pop = data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                i, 'Native geographical resolution scale'] == 'sub-regions')], 'Population rural'].sum()
-
-            data = pd.concat([data, pd.DataFrame(
-                [country, country, urban_pop, rural_pop, CF_urban, CF_rural, CF_unspecified, 'sub-regions'],
-                index=['Country-Region', 'Country', 'Population urban', 'Population rural', 'CF urban', 'CF rural',
-                       'CF unspecified', 'Native geographical resolution scale']).T])
-            data = clean_up_dataframe(data)
-
-        # we then need to determine intake fractions for countries (these are required for secondary PM)
-        for country in set(data.Country):
-            data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                i, 'Native geographical resolution scale'] == 'sub-regions')], 'iF urban'] = (
-                ((data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                    i, 'Native geographical resolution scale'] == 'city')], 'iF urban'] *
-                  data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                      i, 'Native geographical resolution scale'] == 'city')], 'Population urban'] /
-                  data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                      i, 'Native geographical resolution scale'] == 'city')], 'Population urban'].sum())).sum()
-            )
-        for country in countries_of_subregions_to_aggregate:
-            data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                i, 'Native geographical resolution scale'] == 'sub-regions')], 'iF rural'] = (
-                ((data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                    i, 'Native geographical resolution scale'] == 'city')], 'iF rural'] *
-                  data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                      i, 'Native geographical resolution scale'] == 'city')], 'Population urban'] /
-                  data.loc[[i for i in data.index if (data.loc[i, 'Country'] == country and data.loc[
-                      i, 'Native geographical resolution scale'] == 'city')], 'Population urban'].sum())).sum()
-            )
-        for subcont in set(data.loc[:, 'Sub-Continent']):
-            data.loc[[i for i in data.index if (data.loc[i, 'Sub-Continent'] == subcont and data.loc[
-                i, 'Native geographical resolution scale'] == 'sub-continent')], 'iF urban'] = (
-                ((data.loc[[i for i in data.index if (data.loc[i, 'Sub-Continent'] == subcont and data.loc[
-                    i, 'Native geographical resolution scale'] == 'city')], 'iF urban'] *
-                  data.loc[[i for i in data.index if (data.loc[i, 'Sub-Continent'] == subcont and data.loc[
-                      i, 'Native geographical resolution scale'] == 'city')], 'Population urban'] /
-                  data.loc[[i for i in data.index if (data.loc[i, 'Sub-Continent'] == subcont and data.loc[
-                      i, 'Native geographical resolution scale'] == 'city')], 'Population urban'].sum())).sum()
-            )
-        for cont in set(data.loc[:, 'Continent']):
-            if cont != 'Global':
-                data.loc[[i for i in data.index if (data.loc[i, 'Continent'] == cont and data.loc[
-                    i, 'Native geographical resolution scale'] == 'continent')], 'iF urban'] = (
-                    ((data.loc[[i for i in data.index if (data.loc[i, 'Continent'] == cont and data.loc[
-                        i, 'Native geographical resolution scale'] == 'city')], 'iF urban'] *
-                      data.loc[[i for i in data.index if (data.loc[i, 'Continent'] == cont and data.loc[
-                          i, 'Native geographical resolution scale'] == 'city')], 'Population urban'] /
-                      data.loc[[i for i in data.index if (data.loc[i, 'Continent'] == cont and data.loc[
-                          i, 'Native geographical resolution scale'] == 'city')], 'Population urban'].sum())).sum()
-                )
-            else:
-                data.loc[[i for i in data.index if (data.loc[i, 'Continent'] == cont and data.loc[
-                    i, 'Native geographical resolution scale'] == 'global')], 'iF urban'] = (
-                    ((data.loc[[i for i in data.index if
-                                data.loc[i, 'Native geographical resolution scale'] == 'city'], 'iF urban'] *
-                      data.loc[[i for i in data.index if
-                                data.loc[i, 'Native geographical resolution scale'] == 'city'], 'Population urban'] /
-                      data.loc[[i for i in data.index if data.loc[
-                          i, 'Native geographical resolution scale'] == 'city'], 'Population urban'].sum())).sum()
-                )
+        scale = 'Native geographical resolution scale'
+        aggregated = mask_isin(data, 'Country', countries_of_subregions_to_aggregate)
+        cities = aggregated & mask_eq(data, scale, 'city')
+        sub_regions = aggregated & mask_eq(data, scale, 'sub-regions')
+        total_population = data.loc[:, 'Population urban'] + data.loc[:, 'Population rural']
+        country_level = pd.concat([
+            weighted_group_average(data, 'CF urban', 'Population urban', 'Country', cities),
+            weighted_group_average(data, 'CF rural', 'Population rural', 'Country', sub_regions),
+            weighted_group_average(data, 'CF unspecified', total_population, 'Country', sub_regions),
+            data.loc[cities].groupby('Country')['Population urban'].sum(),
+            data.loc[sub_regions].groupby('Country')['Population rural'].sum()], axis=1)
+        # countries without cities or sub-regions get 0, as the sum of an empty selection
+        country_level = country_level.reindex(countries_of_subregions_to_aggregate).fillna(0)
+        country_level = country_level.rename_axis('Country').reset_index()
+        country_level.loc[:, 'Country-Region'] = country_level.loc[:, 'Country']
+        country_level.loc[:, scale] = 'sub-regions'
+        data = clean_up_dataframe(pd.concat([data, country_level]))
+
+        # we then need to determine intake fractions for countries (these are required for secondary PM),
+        # sub-continents, continents and the world from the intake fractions of cities
+        cities = mask_eq(data, scale, 'city')
+        aggregate_hierarchy(data, 'iF urban', 'Population urban', cities, [
+            ('Country', mask_eq(data, scale, 'sub-regions')),
+            ('Sub-Continent', mask_eq(data, scale, 'sub-continent')),
+            ('Continent', mask_eq(data, scale, 'continent') & ~mask_eq(data, 'Continent', 'Global')),
+            (None, mask_eq(data, scale, 'global') & mask_eq(data, 'Continent', 'Global'))])
+        aggregate_hierarchy(data, 'iF rural', 'Population urban', cities, [
+            ('Country', mask_eq(data, scale, 'sub-regions') &
+             mask_isin(data, 'Country', countries_of_subregions_to_aggregate))])
 
         # remove CFs for cities because we do not provide them in the dev version
         data = data[data.loc[:, 'Native geographical resolution scale'].isin(['sub-regions', 'continent', 'global'])]
@@ -2367,91 +2657,35 @@ class Parse:
         data.loc[:, 'Country_code'] = coco.convert(data.Country, to='ISO2')
 
         # ------------------------------------------ PM 2.5 -----------------------------------------------------
-        particulate_damage = pd.Series(dtype=float)
-
-        for region in conc.index:
-            if conc.loc[region] in data.loc[:, 'Country-Region'].tolist():
-                particulate_damage = pd.concat([particulate_damage,
-                                                pd.Series(data.loc[data.loc[:, 'Country-Region'] == conc.loc[
-                                                    region], 'CF urban'].iloc[0],
-                                                          index=[('Particulates, < 2.5 um, ' + region, 'high. pop.')])])
-                particulate_damage = pd.concat([particulate_damage,
-                                                pd.Series(data.loc[data.loc[:, 'Country-Region'] == conc.loc[
-                                                    region], 'CF rural'].iloc[0],
-                                                          index=[('Particulates, < 2.5 um, ' + region, 'low. pop.')])])
-                particulate_damage = pd.concat([particulate_damage,
-                                                pd.Series(data.loc[data.loc[:, 'Country-Region'] == conc.loc[
-                                                    region], 'CF unspecified'].iloc[0], index=[
-                                                    ('Particulates, < 2.5 um, ' + region, '(unspecified)')])])
-            elif conc.loc[region] in data.loc[:, 'Sub-Continent'].tolist():
-                particulate_damage = pd.concat([particulate_damage,
-                                                pd.Series(data.loc[data.loc[:, 'Sub-Continent'] == conc.loc[
-                                                    region], 'CF urban'].iloc[0],
-                                                          index=[('Particulates, < 2.5 um, ' + region, 'high. pop.')])])
-                particulate_damage = pd.concat([particulate_damage,
-                                                pd.Series(data.loc[data.loc[:, 'Sub-Continent'] == conc.loc[
-                                                    region], 'CF rural'].iloc[0],
-                                                          index=[('Particulates, < 2.5 um, ' + region, 'low. pop.')])])
-                particulate_damage = pd.concat([particulate_damage,
-                                                pd.Series(data.loc[data.loc[:, 'Sub-Continent'] == conc.loc[
-                                                    region], 'CF unspecified'].iloc[0], index=[
-                                                    ('Particulates, < 2.5 um, ' + region, '(unspecified)')])])
-            elif conc.loc[region] in data.loc[:, 'Continent'].tolist():
-                particulate_damage = pd.concat([particulate_damage,
-                                                pd.Series(data.loc[data.loc[:, 'Continent'] == conc.loc[
-                                                    region], 'CF urban'].iloc[0],
-                                                          index=[('Particulates, < 2.5 um, ' + region, 'high. pop.')])])
-                particulate_damage = pd.concat([particulate_damage,
-                                                pd.Series(data.loc[data.loc[:, 'Continent'] == conc.loc[
-                                                    region], 'CF rural'].iloc[0],
-                                                          index=[('Particulates, < 2.5 um, ' + region, 'low. pop.')])])
-                particulate_damage = pd.concat([particulate_damage,
-                                                pd.Series(data.loc[data.loc[:, 'Continent'] == conc.loc[
-                                                    region], 'CF unspecified'].iloc[0], index=[
-                                                    ('Particulates, < 2.5 um, ' + region, '(unspecified)')])])
+        damage_columns = ['CF urban', 'CF rural', 'CF unspecified']
+        sub_compartments = ['high. pop.', 'low. pop.', '(unspecified)']
+
+        # ecoinvent regions take the CFs of the first row of their country-region, or else sub-continent, or else
+        # continent
+        matched = np.zeros(len(conc), dtype=bool)
+        region_cfs = pd.DataFrame(np.nan, index=conc.index, columns=damage_columns)
+        for level in ['Country-Region', 'Sub-Continent', 'Continent']:
+            first_rows = first_row_per_value(data, level).loc[:, damage_columns]
+            found = conc.isin(first_rows.index).to_numpy() & ~matched
+            region_cfs.loc[found] = first_rows.loc[conc[found]].to_numpy()
+            matched |= found
+        region_cfs = region_cfs.loc[matched]
 
         # add other regions (e.g., Andorra)
-        for region in data.Country_code:
-            if region not in conc.index and region != 'not found':
-                particulate_damage = pd.concat([particulate_damage,
-                                                pd.Series(
-                                                    data.loc[data.loc[:, 'Country_code'] == region, 'CF urban'].iloc[0],
-                                                    index=[('Particulates, < 2.5 um, ' + region, 'high. pop.')])])
-                particulate_damage = pd.concat([particulate_damage,
-                                                pd.Series(
-                                                    data.loc[data.loc[:, 'Country_code'] == region, 'CF rural'].iloc[0],
-                                                    index=[('Particulates, < 2.5 um, ' + region, 'low. pop.')])])
-                particulate_damage = pd.concat([particulate_damage,
-                                                pd.Series(data.loc[data.loc[:,
-                                                                   'Country_code'] == region, 'CF unspecified'].iloc[0],
-                                                          index=[
-                                                              ('Particulates, < 2.5 um, ' + region, '(unspecified)')])])
+        other_regions = data.loc[~mask_isin(data, 'Country_code', conc.index) &
+                                 ~mask_eq(data, 'Country_code', 'not found'), 'Country_code']
+        global_cfs = data.loc[mask_eq(data, 'Continent', 'Global'), damage_columns].iloc[0]
 
         # add GLO and RoW values
-        particulate_damage = pd.concat([particulate_damage,
-                                        pd.Series(data.loc[data.loc[:, 'Continent'] == 'Global', 'CF urban'].iloc[0],
-                                                  index=[('Particulates, < 2.5 um, GLO', 'high. pop.')])])
-        particulate_damage = pd.concat([particulate_damage,
-                                        pd.Series(data.loc[data.loc[:, 'Continent'] == 'Global', 'CF rural'].iloc[0],
-                                                  index=[('Particulates, < 2.5 um, GLO', 'low. pop.')])])
-        particulate_damage = pd.concat([particulate_damage,
-                                        pd.Series(
-                                            data.loc[data.loc[:, 'Continent'] == 'Global', 'CF unspecified'].iloc[0],
-                                            index=[('Particulates, < 2.5 um, GLO', '(unspecified)')])])
-        particulate_damage = pd.concat([particulate_damage,
-                                        pd.Series(data.loc[data.loc[:, 'Continent'] == 'Global', 'CF urban'].iloc[0],
-                                                  index=[('Particulates, < 2.5 um, RoW', 'high. pop.')])])
-        particulate_damage = pd.concat([particulate_damage,
-                                        pd.Series(data.loc[data.loc[:, 'Continent'] == 'Global', 'CF rural'].iloc[0],
-                                                  index=[('Particulates, < 2.5 um, RoW', 'low. pop.')])])
-        particulate_damage = pd.concat([particulate_damage,
-                                        pd.Series(
-                                            data.loc[data.loc[:, 'Continent'] == 'Global', 'CF unspecified'].iloc[0],
-                                            index=[('Particulates, < 2.5 um, RoW', '(unspecified)')])])
-
-        particulate_damage.index = pd.MultiIndex.from_tuples(particulate_damage.index)
-        particulate_damage = particulate_damage.reset_index().rename(
-            columns={'level_0': 'Elem flow name', 'level_1': 'Sub-compartment', 0: 'CF value'})
+        region_cfs = pd.concat([region_cfs,
+                                first_row_per_value(data, 'Country_code').loc[other_regions, damage_columns],
+                                pd.DataFrame([global_cfs, global_cfs], index=['GLO', 'RoW'])])
+
+        # one row per region and sub-compartment, in the order of damage_columns
+        particulate_damage = pd.DataFrame({
+            'Elem flow name': np.repeat(['Particulates, < 2.5 um, ' + region for region in region_cfs.index], 3),
+            'Sub-compartment': np.tile(sub_compartments, len(region_cfs)),
+            'CF value': region_cfs.to_numpy(dtype=float).ravel()})
         particulate_damage.loc[:, 'Impact category'] = 'Particulate matter formation'
         particulate_damage.loc[:, 'CF unit'] = 'DALY'
         particulate_damage.loc[:, 'Elem flow unit'] = 'kg'
@@ -2469,202 +2703,51 @@ class Parse:
                                                             pm10_particulate_damage.loc[:, 'Elem flow name']]
 
         # ------------------------------------------ Secondary PM -----------------------------------------------------
-        secondary_pm_if = pd.read_sql(sql='SELECT * FROM [SI - ParticulateMatter - secondary PM intake fractions]',
-                                      con=self.conn).set_index("precursor")
-
-        so2 = particulate_damage.copy()
-        so2.loc[:, 'Elem flow name'] = [i.replace('Particulates, < 2.5 um', 'Sulfur dioxide') for i in
-                                        so2.loc[:, 'Elem flow name']]
-        so2.loc[:, 'CAS number'] = '007446-09-5'
-
-        for flow in so2.index:
-            region = so2.loc[flow, 'Elem flow name'].split('Sulfur dioxide, ')[1]
-            if region in conc.keys():
-                if conc[region] in list(data.Country):
-                    if so2.loc[flow, 'Sub-compartment'] == 'high. pop.':
-                        so2.loc[flow, 'CF value'] = (
-                                so2.loc[flow, 'CF value'] / data.loc[data.Country == conc[region], 'iF urban'].iloc[
-                            0] * secondary_pm_if.loc['SO2', 'urban'])
-                    elif so2.loc[flow, 'Sub-compartment'] == 'low. pop.':
-                        so2.loc[flow, 'CF value'] = (
-                                so2.loc[flow, 'CF value'] / data.loc[data.Country == conc[region], 'iF rural'].iloc[
-                            0] * secondary_pm_if.loc['SO2', 'rural'])
-                    elif so2.loc[flow, 'Sub-compartment'] == '(unspecified)':
-                        so2.loc[flow, 'CF value'] = (so2.loc[flow, 'CF value'] /
-                                                     data.loc[data.Country == conc[region], 'iF unspecified'].iloc[0] *
-                                                     secondary_pm_if.loc['SO2', 'unspecified'])
-                elif conc[region] in list(data.loc[:, 'Continent']):
-                    if so2.loc[flow, 'Sub-compartment'] == 'high. pop.':
-                        so2.loc[flow, 'CF value'] = (so2.loc[flow, 'CF value'] /
-                                                     data.loc[data.Continent == conc[region], 'iF urban'].iloc[0] *
-                                                     secondary_pm_if.loc['SO2', 'urban'])
-                    elif so2.loc[flow, 'Sub-compartment'] == 'low. pop.':
-                        so2.loc[flow, 'CF value'] = (so2.loc[flow, 'CF value'] /
-                                                     data.loc[data.Continent == conc[region], 'iF rural'].iloc[0] *
-                                                     secondary_pm_if.loc['SO2', 'rural'])
-                    elif so2.loc[flow, 'Sub-compartment'] == '(unspecified)':
-                        so2.loc[flow, 'CF value'] = (so2.loc[flow, 'CF value'] /
-                                                     data.loc[data.Continent == conc[region], 'iF unspecified'].iloc[
-                                                         0] * secondary_pm_if.loc['SO2', 'unspecified'])
-            elif region in data.Country_code:
-                if so2.loc[flow, 'Sub-compartment'] == 'high. pop.':
-                    so2.loc[flow, 'CF value'] = (
-                            so2.loc[flow, 'CF value'] / data.loc[data.Country_code == region, 'iF urban'].iloc[0] *
-                            secondary_pm_if.loc['SO2', 'urban'])
-                elif so2.loc[flow, 'Sub-compartment'] == 'low. pop.':
-                    so2.loc[flow, 'CF value'] = (
-                            so2.loc[flow, 'CF value'] / data.loc[data.Country_code == region, 'iF rural'].iloc[0] *
-                            secondary_pm_if.loc['SO2', 'rural'])
-                elif so2.loc[flow, 'Sub-compartment'] == '(unspecified)':
-                    so2.loc[flow, 'CF value'] = (so2.loc[flow, 'CF value'] /
-                                                 data.loc[data.Country_code == region, 'iF unspecified'].iloc[0] *
-                                                 secondary_pm_if.loc['SO2', 'unspecified'])
-            else:
-                # for RoW and GLO
-                if so2.loc[flow, 'Sub-compartment'] == 'high. pop.':
-                    so2.loc[flow, 'CF value'] = (
-                            so2.loc[flow, 'CF value'] / data.loc[data.Continent == 'Global', 'iF urban'].iloc[0] *
-                            secondary_pm_if.loc['SO2', 'urban'])
-                elif so2.loc[flow, 'Sub-compartment'] == 'low. pop.':
-                    so2.loc[flow, 'CF value'] = (
-                            so2.loc[flow, 'CF value'] / data.loc[data.Continent == 'Global', 'iF rural'].iloc[0] *
-                            secondary_pm_if.loc['SO2', 'rural'])
-                elif so2.loc[flow, 'Sub-compartment'] == '(unspecified)':
-                    so2.loc[flow, 'CF value'] = (
-                            so2.loc[flow, 'CF value'] / data.loc[data.Continent == 'Global', 'iF unspecified'].iloc[
-                        0] * secondary_pm_if.loc['SO2', 'unspecified'])
-
-        nh3 = particulate_damage.copy()
-        nh3.loc[:, 'Elem flow name'] = [i.replace('Particulates, < 2.5 um', 'Ammonia') for i in
-                                        nh3.loc[:, 'Elem flow name']]
-        nh3.loc[:, 'CAS number'] = '007664-41-7'
-
-        for flow in nh3.index:
-            region = nh3.loc[flow, 'Elem flow name'].split('Ammonia, ')[1]
-            if region in conc.keys():
-                if conc[region] in list(data.Country):
-                    if nh3.loc[flow, 'Sub-compartment'] == 'high. pop.':
-                        nh3.loc[flow, 'CF value'] = (
-                                nh3.loc[flow, 'CF value'] / data.loc[data.Country == conc[region], 'iF urban'].iloc[
-                            0] * secondary_pm_if.loc['NH3', 'urban'])
-                    elif nh3.loc[flow, 'Sub-compartment'] == 'low. pop.':
-                        nh3.loc[flow, 'CF value'] = (
-                                nh3.loc[flow, 'CF value'] / data.loc[data.Country == conc[region], 'iF rural'].iloc[
-                            0] * secondary_pm_if.loc['NH3', 'rural'])
-                    elif nh3.loc[flow, 'Sub-compartment'] == '(unspecified)':
-                        nh3.loc[flow, 'CF value'] = (nh3.loc[flow, 'CF value'] /
-                                                     data.loc[data.Country == conc[region], 'iF unspecified'].iloc[0] *
-                                                     secondary_pm_if.loc['NH3', 'unspecified'])
-                elif conc[region] in list(data.loc[:, 'Continent']):
-                    if nh3.loc[flow, 'Sub-compartment'] == 'high. pop.':
-                        nh3.loc[flow, 'CF value'] = (nh3.loc[flow, 'CF value'] /
-                                                     data.loc[data.Continent == conc[region], 'iF urban'].iloc[0] *
-                                                     secondary_pm_if.loc['NH3', 'urban'])
-                    elif nh3.loc[flow, 'Sub-compartment'] == 'low. pop.':
-                        nh3.loc[flow, 'CF value'] = (nh3.loc[flow, 'CF value'] /
-                                                     data.loc[data.Continent == conc[region], 'iF rural'].iloc[0] *
-                                                     secondary_pm_if.loc['NH3', 'rural'])
-                    elif nh3.loc[flow, 'Sub-compartment'] == '(unspecified)':
-                        nh3.loc[flow, 'CF value'] = (nh3.loc[flow, 'CF value'] /
-                                                     data.loc[data.Continent == conc[region], 'iF unspecified'].iloc[
-                                                         0] * secondary_pm_if.loc['NH3', 'unspecified'])
-            elif region in data.Country_code:
-                if nh3.loc[flow, 'Sub-compartment'] == 'high. pop.':
-                    nh3.loc[flow, 'CF value'] = (nh3.loc[flow, 'CF value'] /
-                                                 data.loc[data.Country_code == region, 'iF urban'].iloc[0] *
-                                                 secondary_pm_if.loc['NH3', 'urban'])
-                elif nh3.loc[flow, 'Sub-compartment'] == 'low. pop.':
-                    nh3.loc[flow, 'CF value'] = (nh3.loc[flow, 'CF value'] /
-                                                 data.loc[data.Country_code == region, 'iF rural'].iloc[0] *
-                                                 secondary_pm_if.loc['NH3', 'rural'])
-                elif nh3.loc[flow, 'Sub-compartment'] == '(unspecified)':
-                    nh3.loc[flow, 'CF value'] = (nh3.loc[flow, 'CF value'] /
-                                                 data.loc[data.Country_code == region, 'iF unspecified'].iloc[
-                                                     0] * secondary_pm_if.loc['NH3', 'unspecified'])
-            else:
-                # for RoW and GLO
-                if nh3.loc[flow, 'Sub-compartment'] == 'high. pop.':
-                    nh3.loc[flow, 'CF value'] = (
-                            nh3.loc[flow, 'CF value'] / data.loc[data.Continent == 'Global', 'iF urban'].iloc[0] *
-                            secondary_pm_if.loc['NH3', 'urban'])
-                elif nh3.loc[flow, 'Sub-compartment'] == 'low. pop.':
-                    nh3.loc[flow, 'CF value'] = (
-                            nh3.loc[flow, 'CF value'] / data.loc[data.Continent == 'Global', 'iF rural'].iloc[0] *
-                            secondary_pm_if.loc['NH3', 'rural'])
-                elif nh3.loc[flow, 'Sub-compartment'] == '(unspecified)':
-                    nh3.loc[flow, 'CF value'] = (
-                            nh3.loc[flow, 'CF value'] / data.loc[data.Continent == 'Global', 'iF unspecified'].iloc[
-                        0] * secondary_pm_if.loc['NH3', 'unspecified'])
-
-        nox = particulate_damage.copy()
-        nox.loc[:, 'Elem flow name'] = [i.replace('Particulates, < 2.5 um', 'Nitrogen oxides') for i in
-                                        nox.loc[:, 'Elem flow name']]
-        nox.loc[:, 'CAS number'] = '011104-93-1'
-
-        for flow in nox.index:
-            region = nox.loc[flow, 'Elem flow name'].split('Nitrogen oxides, ')[1]
-            if region in conc.keys():
-                if conc[region] in list(data.Country):
-                    if nox.loc[flow, 'Sub-compartment'] == 'high. pop.':
-                        nox.loc[flow, 'CF value'] = (
-                                nox.loc[flow, 'CF value'] / data.loc[data.Country == conc[region], 'iF urban'].iloc[
-                            0] * secondary_pm_if.loc['NOx', 'urban'])
-                    elif nox.loc[flow, 'Sub-compartment'] == 'low. pop.':
-                        nox.loc[flow, 'CF value'] = (
-                                nox.loc[flow, 'CF value'] / data.loc[data.Country == conc[region], 'iF rural'].iloc[
-                            0] * secondary_pm_if.loc['NOx', 'rural'])
-                    elif nox.loc[flow, 'Sub-compartment'] == '(unspecified)':
-                        nox.loc[flow, 'CF value'] = (nox.loc[flow, 'CF value'] /
-                                                     data.loc[data.Country == conc[region], 'iF unspecified'].iloc[0] *
-                                                     secondary_pm_if.loc['NOx', 'unspecified'])
-                elif conc[region] in list(data.loc[:, 'Continent']):
-                    if nox.loc[flow, 'Sub-compartment'] == 'high. pop.':
-                        nox.loc[flow, 'CF value'] = (nox.loc[flow, 'CF value'] /
-                                                     data.loc[data.Continent == conc[region], 'iF urban'].iloc[0] *
-                                                     secondary_pm_if.loc['NOx', 'urban'])
-                    elif nox.loc[flow, 'Sub-compartment'] == 'low. pop.':
-                        nox.loc[flow, 'CF value'] = (nox.loc[flow, 'CF value'] /
-                                                     data.loc[data.Continent == conc[region], 'iF rural'].iloc[0] *
-                                                     secondary_pm_if.loc['NOx', 'rural'])
-                    elif nox.loc[flow, 'Sub-compartment'] == '(unspecified)':
-                        nox.loc[flow, 'CF value'] = (nox.loc[flow, 'CF value'] /
-                                                     data.loc[data.Continent == conc[region], 'iF unspecified'].iloc[
-                                                         0] * secondary_pm_if.loc['NOx', 'unspecified'])
-            elif region in data.Country_code:
-                if nox.loc[flow, 'Sub-compartment'] == 'high. pop.':
-                    nox.loc[flow, 'CF value'] = (
-                            nox.loc[flow, 'CF value'] / data.loc[data.Country_code == region, 'iF urban'].iloc[0] *
-                            secondary_pm_if.loc['NOx', 'urban'])
-                elif nox.loc[flow, 'Sub-compartment'] == 'low. pop.':
-                    nox.loc[flow, 'CF value'] = (
-                            nox.loc[flow, 'CF value'] / data.loc[data.Country_code == region, 'iF rural'].iloc[0] *
-                            secondary_pm_if.loc['NOx', 'rural'])
-                elif nox.loc[flow, 'Sub-compartment'] == '(unspecified)':
-                    nox.loc[flow, 'CF value'] = (nox.loc[flow, 'CF value'] /
-                                                 data.loc[data.Country_code == region, 'iF unspecified'].iloc[0] *
-                                                 secondary_pm_if.loc['NOx', 'unspecified'])
-            else:
-                # for RoW and GLO
-                if nox.loc[flow, 'Sub-compartment'] == 'high. pop.':
-                    nox.loc[flow, 'CF value'] = (
-                            nox.loc[flow, 'CF value'] / data.loc[data.Continent == 'Global', 'iF urban'].iloc[0] *
-                            secondary_pm_if.loc['NOx', 'urban'])
-                elif nox.loc[flow, 'Sub-compartment'] == 'low. pop.':
-                    nox.loc[flow, 'CF value'] = (
-                            nox.loc[flow, 'CF value'] / data.loc[data.Continent == 'Global', 'iF rural'].iloc[0] *
-                            secondary_pm_if.loc['NOx', 'rural'])
-                elif nox.loc[flow, 'Sub-compartment'] == '(unspecified)':
-                    nox.loc[flow, 'CF value'] = (
-                            nox.loc[flow, 'CF value'] / data.loc[data.Continent == 'Global', 'iF unspecified'].iloc[
-                        0] * secondary_pm_if.loc['NOx', 'unspecified'])
+        secondary_pm_if = self.tables.read('SI - ParticulateMatter - secondary PM intake fractions').set_index(
+            "precursor")
+
+        # the primary intake fractions of ecoinvent regions are those of the first row of their country, or else of
+        # their continent (CFs of ecoinvent regions matching neither are not converted), other regions (e.g., RoW,
+        # GLO) use the global intake fractions
+        if_columns = ['iF urban', 'iF rural', 'iF unspecified']
+        regions = region_cfs.index.unique()
+        pm_regions = conc.reindex(regions)
+        converted = ~regions.isin(conc.index)
+        region_ifs = pd.DataFrame(np.nan, index=regions, columns=if_columns)
+        region_ifs.loc[converted] = data.loc[mask_eq(data, 'Continent', 'Global'), if_columns].iloc[0].to_numpy()
+        for level in ['Country', 'Continent']:
+            first_rows = first_row_per_value(data, level).loc[:, if_columns]
+            found = pm_regions.isin(first_rows.index).to_numpy() & ~converted
+            region_ifs.loc[found] = first_rows.loc[pm_regions[found]].to_numpy()
+            converted |= found
+        converted = pd.Series(converted, index=regions)
+
+        # aligned on the rows of particulate_damage
+        primary_if = region_ifs.loc[region_cfs.index].to_numpy(dtype=float).ravel()
+        converted = np.repeat(converted.loc[region_cfs.index].to_numpy(), 3)
+
+        secondary_pms = []
+        for precursor, name, cas in [('SO2', 'Sulfur dioxide', '007446-09-5'),
+                                     ('NH3', 'Ammonia', '007664-41-7'),
+                                     ('NOx', 'Nitrogen oxides', '011104-93-1')]:
+            secondary_pm = particulate_damage.copy()
+            secondary_pm.loc[:, 'Elem flow name'] = [i.replace('Particulates, < 2.5 um', name) for i in
+                                                     secondary_pm.loc[:, 'Elem flow name']]
+            secondary_pm.loc[:, 'CAS number'] = cas
+            secondary_if = np.tile(secondary_pm_if.loc[precursor, ['urban', 'rural', 'unspecified']].to_numpy(
+                dtype=float), len(region_cfs))
+            secondary_pm.loc[converted, 'CF value'] = (secondary_pm.loc[converted, 'CF value'] /
+                                                       primary_if[converted] * secondary_if[converted])
+            secondary_pms.append(secondary_pm)
 
         # concat everything
-        particulate_damage = clean_up_dataframe(pd.concat([particulate_damage, pm10_particulate_damage, so2, nh3, nox]))
+        particulate_damage = clean_up_dataframe(
+            pd.concat([particulate_damage, pm10_particulate_damage] + secondary_pms))
 
         # determine the midpoint
-        reference_value = particulate_damage.loc[[i for i in particulate_damage.index if (
-                particulate_damage.loc[i, 'Elem flow name'] == 'Particulates, < 2.5 um, GLO' and
-                particulate_damage.loc[i, 'Sub-compartment'] == '(unspecified)')], 'CF value'].iloc[0]
+        reference_value = particulate_damage.loc[
+            mask_eq(particulate_damage, 'Elem flow name', 'Particulates, < 2.5 um, GLO') &
+            mask_eq(particulate_damage, 'Sub-compartment', '(unspecified)'), 'CF value'].iloc[0]
         particulate_midpoint = particulate_damage.copy()
         particulate_midpoint.loc[:, 'CF value'] /= reference_value
         particulate_midpoint.loc[:, 'MP or Damage'] = 'Midpoint'
@@ -2677,23 +2760,19 @@ class Parse:
         # re-establish the native geographical resolution scale
         continents = list({k for k, v in conc.items() if v in set(data.loc[:, 'Continent'].dropna())})
         particulate_cfs.loc[:, 'Native geographical resolution scale'] = 'Country'
-        particulate_cfs.loc[[i for i in particulate_cfs.index if particulate_cfs.loc[i, 'Elem flow name'].split(', ')[
-            -1] in continents], 'Native geographical resolution scale'] = 'Other region'
-        particulate_cfs.loc[[i for i in particulate_cfs.index if
-                             particulate_cfs.loc[i, 'Elem flow name'].split(', ')[-1] in [
-                                 'RER', 'RLA', 'RNA', 'RAS', 'RAF', 'OCE', 'RME']],
+        particulate_cfs.loc[mask_region(particulate_cfs, 'Elem flow name', continents),
+                            'Native geographical resolution scale'] = 'Other region'
+        particulate_cfs.loc[mask_region(particulate_cfs, 'Elem flow name',
+                                        ['RER', 'RLA', 'RNA', 'RAS', 'RAF', 'OCE', 'RME']),
                             'Native geographical resolution scale'] = 'Continent'
-        particulate_cfs.loc[[i for i in particulate_cfs.index if
-                             particulate_cfs.loc[i, 'Elem flow name'].split(', ')[-1] == 'GLO'],
+        particulate_cfs.loc[mask_region(particulate_cfs, 'Elem flow name', 'GLO'),
                             'Native geographical resolution scale'] = 'Global'
-        particulate_cfs.loc[[i for i in particulate_cfs.index if
-                             particulate_cfs.loc[i, 'Elem flow name'].split(', ')[-1] == 'RoW'],
+        particulate_cfs.loc[mask_region(particulate_cfs, 'Elem flow name', 'RoW'),
                             'Native geographical resolution scale'] = 'Other region'
 
         # add zero values for PMs above 2.5um
-        big_pms = particulate_cfs.loc[[i for i in particulate_cfs.index if (
-                particulate_cfs.loc[i, 'Elem flow name'] == 'Particulates, < 2.5 um, GLO' and
-                particulate_cfs.loc[i, 'Sub-compartment'] == '(unspecified)')]].copy()
+        big_pms = particulate_cfs.loc[mask_eq(particulate_cfs, 'Elem flow name', 'Particulates, < 2.5 um, GLO') &
+                                      mask_eq(particulate_cfs, 'Sub-compartment', '(unspecified)')].copy()
         big_pms = pd.concat([big_pms] * 2)
         big_pms.loc[:, 'CF value'] = 0
         big_pms.iloc[0, big_pms.columns.get_loc('Elem flow name')] = 'Particulates, > 10 um'
@@ -2701,8 +2780,7 @@ class Parse:
         big_pms.iloc[2, big_pms.columns.get_loc('Elem flow name')] = 'Particulates, > 2.5 um, and < 10um'
         big_pms.iloc[3, big_pms.columns.get_loc('Elem flow name')] = 'Particulates, > 2.5 um, and < 10um'
 
-        self.master_db = pd.concat([self.master_db, particulate_cfs, big_pms])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(particulate_cfs, big_pms)
 
     def load_water_scarcity_cfs(self):
         """
@@ -2714,44 +2792,14 @@ class Parse:
         :return: updated master_db
         """
 
-        data = pd.read_sql('SELECT * FROM "CF - regionalized - WaterScarcity - aggregated"', self.conn)
-        conc = pd.read_sql('SELECT * FROM "SI - Mapping with regions of ecoinvent"', self.conn).set_index(
-            'AWARE').Ecoinvent_short_name
+        data = self.tables.read('CF - regionalized - WaterScarcity - aggregated')
+        mapping = self.tables.read('SI - Mapping with regions of ecoinvent', ['AWARE', 'Ecoinvent_short_name'])
 
         # create the regionalized names (e.g., Water, AF)
-        water_data = pd.DataFrame()
-
-        for i in data.index:
-            if data.ecoinvent_shortname[i] in conc.index:
-                if type(conc.loc[data.ecoinvent_shortname[i]]) == str:
-                    if data.loc[i, 'Water type'] == 'unspecified':
-                        water_data.loc[i, 'Elem flow name'] = 'Water, ' + conc.loc[data.ecoinvent_shortname[i]]
-                    elif data.loc[i, 'Water type'] == 'agri':
-                        water_data.loc[i, 'Elem flow name'] = 'Water, agri, ' + conc.loc[data.ecoinvent_shortname[i]]
-                    elif data.loc[i, 'Water type'] == 'non-agri':
-                        water_data.loc[i, 'Elem flow name'] = 'Water, non-agri, ' + conc.loc[
-                            data.ecoinvent_shortname[i]]
-                    water_data.loc[i, 'CF value'] = data.loc[i, 'Annual']
-                else:
-                    for j in range(0, len(conc.loc[data.ecoinvent_shortname[i]])):
-                        if data.loc[i, 'Water type'] == 'unspecified':
-                            water_data.loc[str(i + j), 'Elem flow name'] = 'Water, ' + \
-                                                                           conc.loc[data.ecoinvent_shortname[i]].iloc[j]
-                        elif data.loc[i, 'Water type'] == 'agri':
-                            water_data.loc[str(i + j), 'Elem flow name'] = 'Water, agri, ' + \
-                                                                           conc.loc[data.ecoinvent_shortname[i]].iloc[j]
-                        elif data.loc[i, 'Water type'] == 'non-agri':
-                            water_data.loc[str(i + j), 'Elem flow name'] = 'Water, non-agri, ' + \
-                                                                           conc.loc[data.ecoinvent_shortname[i]].iloc[j]
-                        water_data.loc[str(i + j), 'CF value'] = data.loc[i, 'Annual']
-            else:
-                if data.loc[i, 'Water type'] == 'unspecified':
-                    water_data.loc[i, 'Elem flow name'] = 'Water, ' + data.ecoinvent_shortname[i]
-                elif data.loc[i, 'Water type'] == 'agri':
-                    water_data.loc[i, 'Elem flow name'] = 'Water, agri, ' + data.ecoinvent_shortname[i]
-                elif data.loc[i, 'Water type'] == 'non-agri':
-                    water_data.loc[i, 'Elem flow name'] = 'Water, non-agri, ' + data.ecoinvent_shortname[i]
-                water_data.loc[i, 'CF value'] = data.loc[i, 'Annual']
+        data = expand_water_regions(data, mapping)
+        prefixes = {'unspecified': 'Water, ', 'agri': 'Water, agri, ', 'non-agri': 'Water, non-agri, '}
+        water_data = pd.DataFrame({'Elem flow name': data.loc[:, 'Water type'].map(prefixes) + data.loc[:, 'Region'],
+                                   'CF value': data.loc[:, 'Annual']})
 
         # formatting the data to IW+ format
         water_data.loc[:, 'Impact category'] = 'Water scarcity'
@@ -2761,7 +2809,7 @@ class Parse:
         water_data.loc[:, 'CAS number'] = '7732-18-5'
         water_data.loc[:, 'Elem flow unit'] = 'm3'
         water_data.loc[:, 'MP or Damage'] = 'Midpoint'
-        water_data.loc[:, 'Native geographical resolution scale'] = 'Country'
+        water_data.loc[:, 'Native geographical resolution scale'] = water_resolution_scales(data.loc[:, 'Region'])
 
         water_data['CF value'] = water_data['CF value'].astype(float)
 
@@ -2773,150 +2821,12 @@ class Parse:
         all_data = pd.concat([water_data, water_extraction_data])
         all_data = clean_up_dataframe(all_data)
 
-        all_data.loc[[i for i in all_data.index if ('RER' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RAS' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RAF' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RLA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'OCE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RNA' in all_data.loc[i, 'Elem flow name'])],
-                     'Native geographical resolution scale'] = 'Continent'
-        all_data.loc[[i for i in all_data.index if 'GLO' in all_data.loc[i, 'Elem flow name']],
-                     'Native geographical resolution scale'] = 'Global'
-        all_data.loc[[i for i in all_data.index if ('RoW' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Akrotiri' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Asia without China' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Australia, including overseas territories' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'BALTSO' in all_data.loc[i, 'Elem flow name'] or
-                                                    'CENTREL' in all_data.loc[i, 'Elem flow name'] or
-                                                    'CUSMA/T-MEC/USMCA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Canada without Alberta' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Canada without Alberta and Quebec' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Canada without Quebec' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Canary Islands' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Central Asia' in all_data.loc[i, 'Elem flow name'] or
-                                                    'China w/o Inner Mongol' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Crimea' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Cyprus No Mans Area' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Dhekelia Base' in all_data.loc[i, 'Elem flow name'] or
-                                                    'ENTSO-E' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Europe without Austria' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Europe without NORDEL (NCPA)' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Europe without Switzerland' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Europe without Switzerland and Austria' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Europe without Switzerland and France' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Europe, without Russia and Türkiye' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'FSU' in all_data.loc[i, 'Elem flow name'] or
-                                                    'France, including overseas territories' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Guantanamo Bay' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IAI Area, Africa' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IAI Area, Asia, without China and GCC' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'IAI Area, EU27 & EFTA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IAI Area, Gulf Cooperation Council' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'IAI Area, North America' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IAI Area, North America, without Quebec' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'IAI Area, Russia & RER w/o EU27 & EFTA' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'IAI Area, South America' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IN-Islands' in all_data.loc[i, 'Elem flow name'] or
-                                                    'MRO' in all_data.loc[i, 'Elem flow name'] or
-                                                    'NAFTA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'NORDEL' in all_data.loc[i, 'Elem flow name'] or
-                                                    'NPCC' in all_data.loc[i, 'Elem flow name'] or
-                                                    'North America without Quebec' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Northern Cyprus' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Québec, HQ distribution network' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'RER w/o AT+BE+CH+DE+FR+IT' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o CH+DE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o DE+NL+NO' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o DE+NL+NO+RU' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o DE+NL+RU' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o RU' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Russia (Asia)' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Russia (Europe)' in all_data.loc[i, 'Elem flow name'] or
-                                                    'SAS' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Siachen Glacier' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Somaliland' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UCTE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UCTE without France' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UCTE without Germany' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UCTE without Germany and France' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'UN-AMERICAS' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-ASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-AUSTRALIANZ' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-CAMERICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-CARIBBEAN' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-EAFRICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-EASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-EEUROPE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-EUROPE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-MAFRICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-MELANESIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-MICRONESIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-NAFRICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-NEUROPE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-OCEANIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-POLYNESIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-SAMERICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-SASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-SEASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-SEUROPE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-WAFRICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-WASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'United States of America, including overseas territories' in
-                                                    all_data.loc[i, 'Elem flow name'] or
-                                                    'WECC' in all_data.loc[i, 'Elem flow name'] or
-                                                    'WEU' in all_data.loc[i, 'Elem flow name']
-                                                    )],
-                     'Native geographical resolution scale'] = 'Other region'
-
-        # adding the different other water flows (lake, river, well, etc.)
-        df_lake = all_data.loc[[i for i in all_data.index if
-                                'agri' not in all_data.loc[i, 'Elem flow name'] and all_data.loc[
-                                    i, 'Compartment'] == 'Raw']].copy()
-        df_lake.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, lake') for i in df_lake.loc[:, 'Elem flow name']]
-        df_river = all_data.loc[[i for i in all_data.index if
-                                 'agri' not in all_data.loc[i, 'Elem flow name'] and all_data.loc[
-                                     i, 'Compartment'] == 'Raw']].copy()
-        df_river.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, river') for i in
-                                             df_river.loc[:, 'Elem flow name']]
-        df_unspe = all_data.loc[[i for i in all_data.index if
-                                 'agri' not in all_data.loc[i, 'Elem flow name'] and all_data.loc[
-                                     i, 'Compartment'] == 'Raw']].copy()
-        df_unspe.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, unspecified natural origin') for i in
-                                             df_unspe.loc[:, 'Elem flow name']]
-        df_well = all_data.loc[[i for i in all_data.index if
-                                'agri' not in all_data.loc[i, 'Elem flow name'] and all_data.loc[
-                                    i, 'Compartment'] == 'Raw']].copy()
-        df_well.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, well, in ground') for i in
-                                            df_well.loc[:, 'Elem flow name']]
-        df_cooling = all_data.loc[[i for i in all_data.index if
-                                   'agri' not in all_data.loc[i, 'Elem flow name'] and all_data.loc[
-                                       i, 'Compartment'] == 'Raw']].copy()
-        df_cooling.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, cooling, unspecified natural origin') for i in
-                                               df_cooling.loc[:, 'Elem flow name']]
-
-        # drop "Water" flow in Raw comp, that flow is only for the water comp
-        all_data = all_data.drop([i for i in all_data.index if
-                                  'agri' not in all_data.loc[i, 'Elem flow name'] and all_data.loc[
-                                      i, 'Compartment'] == 'Raw'])
-
-        all_data = clean_up_dataframe(pd.concat([all_data, df_lake, df_river, df_unspe, df_well, df_cooling]))
-
-        self.master_db = pd.concat([self.master_db, all_data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        # replace the "Water" flow in Raw comp by the different other water flows (lake, river, well, etc.), that flow
+        # is only for the water comp
+        all_data = add_water_flow_variants(all_data, ~mask_contains(all_data, 'Elem flow name', 'agri') &
+                                           mask_eq(all_data, 'Compartment', 'Raw'))
+
+        self.add_to_master_db(all_data)
 
     def load_water_availability_hh_cfs(self):
         """
@@ -2928,26 +2838,14 @@ class Parse:
         :return: update master_db
         """
 
-        data = pd.read_sql('SELECT * FROM "CF - regionalized - WaterAvailability_HH - aggregated"', self.conn).loc[
-               :, ['ecoinvent_shortname', 'CF_tot']]
-        conc = pd.read_sql('SELECT * FROM "SI - Mapping with regions of ecoinvent"', self.conn).set_index(
-            'AWARE').Ecoinvent_short_name
+        data = self.tables.read('CF - regionalized - WaterAvailability_HH - aggregated',
+                                ['ecoinvent_shortname', 'CF_tot'])
+        mapping = self.tables.read('SI - Mapping with regions of ecoinvent', ['AWARE', 'Ecoinvent_short_name'])
 
         # create the regionalized names (e.g., Water, AF)
-        water_data = pd.DataFrame()
-        for i in data.index:
-            if data.ecoinvent_shortname[i] in conc.index:
-                if type(conc.loc[data.ecoinvent_shortname[i]]) == str:
-                    water_data.loc[i, 'Elem flow name'] = 'Water, ' + conc.loc[data.ecoinvent_shortname[i]]
-                    water_data.loc[i, 'CF value'] = data.loc[i, 'CF_tot']
-                else:
-                    for j in range(0, len(conc.loc[data.ecoinvent_shortname[i]])):
-                        water_data.loc[str(i + j), 'Elem flow name'] = 'Water, ' + \
-                                                                       conc.loc[data.ecoinvent_shortname[i]].iloc[j]
-                        water_data.loc[str(i + j), 'CF value'] = data.loc[i, 'CF_tot']
-            else:
-                water_data.loc[i, 'Elem flow name'] = 'Water, ' + data.ecoinvent_shortname[i]
-                water_data.loc[i, 'CF value'] = data.loc[i, 'CF_tot']
+        data = expand_water_regions(data, mapping)
+        water_data = pd.DataFrame({'Elem flow name': 'Water, ' + data.loc[:, 'Region'],
+                                   'CF value': data.loc[:, 'CF_tot']})
 
         # formatting the data to IW+ format
         water_data.loc[:, 'Impact category'] = 'Water availability, human health'
@@ -2957,7 +2855,7 @@ class Parse:
         water_data.loc[:, 'CAS number'] = '7732-18-5'
         water_data.loc[:, 'Elem flow unit'] = 'm3'
         water_data.loc[:, 'MP or Damage'] = 'Damage'
-        water_data.loc[:, 'Native geographical resolution scale'] = 'Country'
+        water_data.loc[:, 'Native geographical resolution scale'] = water_resolution_scales(data.loc[:, 'Region'])
         water_data.loc[:, 'CF value'] = water_data.loc[:, 'CF value'].astype(float)
 
         # create the negative flows for the Water compartment
@@ -2968,141 +2866,14 @@ class Parse:
         all_data = pd.concat([water_data, water_extraction_data])
         all_data = clean_up_dataframe(all_data)
 
-        all_data.loc[[i for i in all_data.index if ('RER' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RAS' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RAF' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RLA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'OCE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RNA' in all_data.loc[i, 'Elem flow name'])],
-                     'Native geographical resolution scale'] = 'Continent'
-        all_data.loc[[i for i in all_data.index if 'GLO' in all_data.loc[i, 'Elem flow name']],
-                     'Native geographical resolution scale'] = 'Global'
-        all_data.loc[[i for i in all_data.index if ('RoW' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Akrotiri' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Asia without China' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Australia, including overseas territories' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'BALTSO' in all_data.loc[i, 'Elem flow name'] or
-                                                    'CENTREL' in all_data.loc[i, 'Elem flow name'] or
-                                                    'CUSMA/T-MEC/USMCA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Canada without Alberta' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Canada without Alberta and Quebec' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Canada without Quebec' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Canary Islands' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Central Asia' in all_data.loc[i, 'Elem flow name'] or
-                                                    'China w/o Inner Mongol' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Crimea' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Cyprus No Mans Area' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Dhekelia Base' in all_data.loc[i, 'Elem flow name'] or
-                                                    'ENTSO-E' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Europe without Austria' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Europe without NORDEL (NCPA)' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Europe without Switzerland' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Europe without Switzerland and Austria' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Europe without Switzerland and France' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Europe, without Russia and Türkiye' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'FSU' in all_data.loc[i, 'Elem flow name'] or
-                                                    'France, including overseas territories' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Guantanamo Bay' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IAI Area, Africa' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IAI Area, Asia, without China and GCC' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'IAI Area, EU27 & EFTA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IAI Area, Gulf Cooperation Council' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'IAI Area, North America' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IAI Area, North America, without Quebec' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'IAI Area, Russia & RER w/o EU27 & EFTA' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'IAI Area, South America' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IN-Islands' in all_data.loc[i, 'Elem flow name'] or
-                                                    'MRO' in all_data.loc[i, 'Elem flow name'] or
-                                                    'NAFTA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'NORDEL' in all_data.loc[i, 'Elem flow name'] or
-                                                    'NPCC' in all_data.loc[i, 'Elem flow name'] or
-                                                    'North America without Quebec' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Northern Cyprus' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Québec, HQ distribution network' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'RER w/o AT+BE+CH+DE+FR+IT' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o CH+DE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o DE+NL+NO' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o DE+NL+NO+RU' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o DE+NL+RU' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o RU' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Russia (Asia)' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Russia (Europe)' in all_data.loc[i, 'Elem flow name'] or
-                                                    'SAS' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Siachen Glacier' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Somaliland' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UCTE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UCTE without France' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UCTE without Germany' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UCTE without Germany and France' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'UN-AMERICAS' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-ASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-AUSTRALIANZ' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-CAMERICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-CARIBBEAN' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-EAFRICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-EASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-EEUROPE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-EUROPE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-MAFRICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-MELANESIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-MICRONESIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-NAFRICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-NEUROPE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-OCEANIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-POLYNESIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-SAMERICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-SASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-SEASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-SEUROPE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-WAFRICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-WASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'United States of America, including overseas territories' in
-                                                    all_data.loc[i, 'Elem flow name'] or
-                                                    'WECC' in all_data.loc[i, 'Elem flow name'] or
-                                                    'WEU' in all_data.loc[i, 'Elem flow name']
-                                                    )],
-                     'Native geographical resolution scale'] = 'Other region'
-
-        # adding the different other water flows (lake, river, well, etc.)
-        df_lake = all_data[all_data.Compartment == 'Raw'].copy()
-        df_lake.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, lake') for i in df_lake.loc[:, 'Elem flow name']]
-        df_river = all_data[all_data.Compartment == 'Raw'].copy()
-        df_river.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, river') for i in
-                                             df_river.loc[:, 'Elem flow name']]
-        df_unspe = all_data[all_data.Compartment == 'Raw'].copy()
-        df_unspe.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, unspecified natural origin') for i in
-                                             df_unspe.loc[:, 'Elem flow name']]
-        df_well = all_data[all_data.Compartment == 'Raw'].copy()
-        df_well.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, well, in ground') for i in
-                                            df_well.loc[:, 'Elem flow name']]
-        df_cooling = all_data[all_data.Compartment == 'Raw'].copy()
-        df_cooling.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, cooling, unspecified natural origin') for i in
-                                               df_cooling.loc[:, 'Elem flow name']]
-
-        # drop "Water" flow in Raw comp, that flow is only for the water comp
-        all_data = all_data[all_data.Compartment != 'Raw']
-
-        all_data = clean_up_dataframe(pd.concat([all_data, df_lake, df_river, df_unspe, df_well, df_cooling]))
+        # replace the "Water" flow in Raw comp by the different other water flows (lake, river, well, etc.), that flow
+        # is only for the water comp
+        all_data = add_water_flow_variants(all_data, mask_eq(all_data, 'Compartment', 'Raw'))
 
         # for missing CFs, forced value to zero
         all_data.loc[:, 'CF value'] = all_data.loc[:, 'CF value'].fillna(0)
 
-        self.master_db = pd.concat([self.master_db, all_data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(all_data)
 
     def load_water_availability_fw_cfs(self):
         """
@@ -3114,27 +2885,14 @@ class Parse:
         :return: update master_db
         """
 
-        data = pd.read_sql(sql='SELECT * FROM [CF - regionalized - WaterAvailability_EQ_fw - native]', con=self.conn)
-        conc = pd.read_sql('SELECT * FROM "SI - Mapping with regions of ecoinvent"', self.conn).set_index(
-            'AWARE').Ecoinvent_short_name
-        geos = pd.read_sql(sql='SELECT * FROM [CF - regionalized - WaterScarcity - aggregated]', con=self.conn).loc[
-               :, 'ecoinvent_shortname'].tolist()
+        data = self.tables.read('CF - regionalized - WaterAvailability_EQ_fw - native')
+        mapping = self.tables.read('SI - Mapping with regions of ecoinvent', ['AWARE', 'Ecoinvent_short_name'])
+        geos = self.tables.read('CF - regionalized - WaterScarcity - aggregated', ['ecoinvent_shortname'])
 
         CF_value = data.loc[:, 'CF value'].median()
         # create the regionalized names (e.g., Water, AF)
-        water_data = pd.DataFrame()
-        for i, geo in enumerate(geos):
-            if geo in conc.index:
-                if type(conc.loc[geo]) == str:
-                    water_data.loc[i, 'Elem flow name'] = 'Water, ' + conc.loc[geo]
-                    water_data.loc[i, 'CF value'] = CF_value
-                else:
-                    for j in range(0, len(conc.loc[geo])):
-                        water_data.loc[str(i + j), 'Elem flow name'] = 'Water, ' + conc.loc[geo].iloc[j]
-                        water_data.loc[str(i + j), 'CF value'] = CF_value
-            else:
-                water_data.loc[i, 'Elem flow name'] = 'Water, ' + geo
-                water_data.loc[i, 'CF value'] = CF_value
+        geos = expand_water_regions(geos, mapping)
+        water_data = pd.DataFrame({'Elem flow name': 'Water, ' + geos.loc[:, 'Region'], 'CF value': CF_value})
 
         # formatting the data to IW+ format
         water_data.loc[:, 'Impact category'] = 'Water availability, freshwater ecosystem'
@@ -3144,7 +2902,7 @@ class Parse:
         water_data.loc[:, 'CAS number'] = '7732-18-5'
         water_data.loc[:, 'Elem flow unit'] = 'm3'
         water_data.loc[:, 'MP or Damage'] = 'Damage'
-        water_data.loc[:, 'Native geographical resolution scale'] = 'Country'
+        water_data.loc[:, 'Native geographical resolution scale'] = water_resolution_scales(geos.loc[:, 'Region'])
         water_data.loc[:, 'CF value'] = water_data.loc[:, 'CF value'].astype(float)
 
         # create the negative flows for the Water compartment
@@ -3155,139 +2913,12 @@ class Parse:
         all_data = pd.concat([water_data, water_extraction_data])
         all_data = clean_up_dataframe(all_data)
 
-        all_data.loc[[i for i in all_data.index if ('RER' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RAS' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RAF' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RLA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'OCE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RNA' in all_data.loc[i, 'Elem flow name'])],
-                     'Native geographical resolution scale'] = 'Continent'
-        all_data.loc[[i for i in all_data.index if 'GLO' in all_data.loc[i, 'Elem flow name']],
-                     'Native geographical resolution scale'] = 'Global'
-        all_data.loc[[i for i in all_data.index if ('RoW' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Akrotiri' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Asia without China' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Australia, including overseas territories' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'BALTSO' in all_data.loc[i, 'Elem flow name'] or
-                                                    'CENTREL' in all_data.loc[i, 'Elem flow name'] or
-                                                    'CUSMA/T-MEC/USMCA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Canada without Alberta' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Canada without Alberta and Quebec' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Canada without Quebec' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Canary Islands' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Central Asia' in all_data.loc[i, 'Elem flow name'] or
-                                                    'China w/o Inner Mongol' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Crimea' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Cyprus No Mans Area' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Dhekelia Base' in all_data.loc[i, 'Elem flow name'] or
-                                                    'ENTSO-E' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Europe without Austria' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Europe without NORDEL (NCPA)' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Europe without Switzerland' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Europe without Switzerland and Austria' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Europe without Switzerland and France' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Europe, without Russia and Türkiye' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'FSU' in all_data.loc[i, 'Elem flow name'] or
-                                                    'France, including overseas territories' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Guantanamo Bay' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IAI Area, Africa' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IAI Area, Asia, without China and GCC' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'IAI Area, EU27 & EFTA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IAI Area, Gulf Cooperation Council' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'IAI Area, North America' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IAI Area, North America, without Quebec' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'IAI Area, Russia & RER w/o EU27 & EFTA' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'IAI Area, South America' in all_data.loc[i, 'Elem flow name'] or
-                                                    'IN-Islands' in all_data.loc[i, 'Elem flow name'] or
-                                                    'MRO' in all_data.loc[i, 'Elem flow name'] or
-                                                    'NAFTA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'NORDEL' in all_data.loc[i, 'Elem flow name'] or
-                                                    'NPCC' in all_data.loc[i, 'Elem flow name'] or
-                                                    'North America without Quebec' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'Northern Cyprus' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Québec, HQ distribution network' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'RER w/o AT+BE+CH+DE+FR+IT' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o CH+DE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o DE+NL+NO' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o DE+NL+NO+RU' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o DE+NL+RU' in all_data.loc[i, 'Elem flow name'] or
-                                                    'RER w/o RU' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Russia (Asia)' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Russia (Europe)' in all_data.loc[i, 'Elem flow name'] or
-                                                    'SAS' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Siachen Glacier' in all_data.loc[i, 'Elem flow name'] or
-                                                    'Somaliland' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UCTE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UCTE without France' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UCTE without Germany' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UCTE without Germany and France' in all_data.loc[
-                                                        i, 'Elem flow name'] or
-                                                    'UN-AMERICAS' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-ASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-AUSTRALIANZ' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-CAMERICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-CARIBBEAN' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-EAFRICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-EASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-EEUROPE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-EUROPE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-MAFRICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-MELANESIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-MICRONESIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-NAFRICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-NEUROPE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-OCEANIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-POLYNESIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-SAMERICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-SASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-SEASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-SEUROPE' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-WAFRICA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'UN-WASIA' in all_data.loc[i, 'Elem flow name'] or
-                                                    'United States of America, including overseas territories' in
-                                                    all_data.loc[i, 'Elem flow name'] or
-                                                    'WECC' in all_data.loc[i, 'Elem flow name'] or
-                                                    'WEU' in all_data.loc[i, 'Elem flow name']
-                                                    )],
-                     'Native geographical resolution scale'] = 'Other region'
-
-        # adding the different other water flows (lake, river, well, etc.)
-        df_lake = all_data[all_data.Compartment == 'Raw'].copy()
-        df_lake.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, lake') for i in df_lake.loc[:, 'Elem flow name']]
-        df_river = all_data[all_data.Compartment == 'Raw'].copy()
-        df_river.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, river') for i in
-                                             df_river.loc[:, 'Elem flow name']]
-        df_unspe = all_data[all_data.Compartment == 'Raw'].copy()
-        df_unspe.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, unspecified natural origin') for i in
-                                             df_unspe.loc[:, 'Elem flow name']]
-        df_well = all_data[all_data.Compartment == 'Raw'].copy()
-        df_well.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, well, in ground') for i in
-                                            df_well.loc[:, 'Elem flow name']]
-        df_cooling = all_data[all_data.Compartment == 'Raw'].copy()
-        df_cooling.loc[:, 'Elem flow name'] = [i.replace('Water', 'Water, cooling, unspecified natural origin') for i in
-                                               df_cooling.loc[:, 'Elem flow name']]
-
-        # drop "Water" flow in Raw comp, that flow is only for the water comp
-        all_data = all_data[all_data.Compartment != 'Raw']
-
-        all_data = clean_up_dataframe(pd.concat([all_data, df_lake, df_river, df_unspe, df_well, df_cooling]))
+        # replace the "Water" flow in Raw comp by the different other water flows (lake, river, well, etc.), that flow
+        # is only for the water comp
+        all_data = add_water_flow_variants(all_data, mask_eq(all_data, 'Compartment', 'Raw'))
 
         # concat with master_db
-        self.master_db = pd.concat([self.master_db, all_data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(all_data)
 
     def load_water_availability_terr_cfs(self):
         """
@@ -3299,26 +2930,13 @@ class Parse:
         :return: update master_db
         """
 
-        data = pd.read_sql('SELECT * FROM "CF - regionalized - WaterAvailability_EQ_terr - aggregated"', self.conn)
-        conc = pd.read_sql('SELECT * FROM "SI - Mapping with regions of ecoinvent"', self.conn).set_index(
-            'AWARE').Ecoinvent_short_name
+        data = self.tables.read('CF - regionalized - WaterAvailability_EQ_terr - aggregated')
+        mapping = self.tables.read('SI - Mapping with regions of ecoinvent', ['AWARE', 'Ecoinvent_short_name'])
 
         # create the regionalized names (e.g., Water, AF)
-        water_data = pd.DataFrame()
-        for i in data.index:
-            if data.ecoinvent_shortname[i] in conc.index:
-                if type(conc.loc[data.ecoinvent_shortname[i]]) == str:
-                    water_data.loc[i, 'Elem flow name'] = 'Water, well, in ground, ' + conc.loc[
-                        data.ecoinvent_shortname[i]]
-                    water_data.loc[i, 'CF value'] = data.loc[i, 'CF (PDF.m2.yr/m3)']
-                else:
-                    for j in range(0, len(conc.loc[data.ecoinvent_shortname[i]])):
-                        water_data.loc[str(i + j), 'Elem flow name'] = 'Water, well, in ground, ' + \
-                                                                       conc.loc[data.ecoinvent_shortname[i]].iloc[j]
-                        water_data.loc[str(i + j), 'CF value'] = data.loc[i, 'CF (PDF.m2.yr/m3)']
-            else:
-                water_data.loc[i, 'Elem flow name'] = 'Water, well, in ground, ' + data.ecoinvent_shortname[i]
-                water_data.loc[i, 'CF value'] = data.loc[i, 'CF (PDF.m2.yr/m3)']
+        data = expand_water_regions(data, mapping)
+        water_data = pd.DataFrame({'Elem flow name': 'Water, well, in ground, ' + data.loc[:, 'Region'],
+                                   'CF value': data.loc[:, 'CF (PDF.m2.yr/m3)']})
 
         water_data.loc[:, 'Impact category'] = 'Water availability, terrestrial ecosystem'
         water_data.loc[:, 'CF unit'] = 'PDF.m2.yr'
@@ -3327,128 +2945,10 @@ class Parse:
         water_data.loc[:, 'CAS number'] = '7732-18-5'
         water_data.loc[:, 'Elem flow unit'] = 'm3'
         water_data.loc[:, 'MP or Damage'] = 'Damage'
-        water_data.loc[:, 'Native geographical resolution scale'] = 'Country'
+        water_data.loc[:, 'Native geographical resolution scale'] = water_resolution_scales(data.loc[:, 'Region'])
         water_data.loc[:, 'CF value'] = water_data.loc[:, 'CF value'].astype(float)
 
-        water_data.loc[[i for i in water_data.index if ('RER' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RAS' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RAF' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RLA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'OCE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RNA' in water_data.loc[i, 'Elem flow name'])],
-                       'Native geographical resolution scale'] = 'Continent'
-        water_data.loc[[i for i in water_data.index if 'GLO' in water_data.loc[i, 'Elem flow name']],
-                       'Native geographical resolution scale'] = 'Global'
-        water_data.loc[[i for i in water_data.index if ('RoW' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Akrotiri' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Asia without China' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Australia, including overseas territories' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'BALTSO' in water_data.loc[i, 'Elem flow name'] or
-                                                        'CENTREL' in water_data.loc[i, 'Elem flow name'] or
-                                                        'CUSMA/T-MEC/USMCA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Canada without Alberta' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Canada without Alberta and Quebec' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Canada without Quebec' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Canary Islands' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Central Asia' in water_data.loc[i, 'Elem flow name'] or
-                                                        'China w/o Inner Mongol' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Crimea' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Cyprus No Mans Area' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Dhekelia Base' in water_data.loc[i, 'Elem flow name'] or
-                                                        'ENTSO-E' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Europe without Austria' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Europe without NORDEL (NCPA)' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Europe without Switzerland' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Europe without Switzerland and Austria' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Europe without Switzerland and France' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Europe, without Russia and Türkiye' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'FSU' in water_data.loc[i, 'Elem flow name'] or
-                                                        'France, including overseas territories' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Guantanamo Bay' in water_data.loc[i, 'Elem flow name'] or
-                                                        'IAI Area, Africa' in water_data.loc[i, 'Elem flow name'] or
-                                                        'IAI Area, Asia, without China and GCC' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IAI Area, EU27 & EFTA' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IAI Area, Gulf Cooperation Council' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IAI Area, North America' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IAI Area, North America, without Quebec' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IAI Area, Russia & RER w/o EU27 & EFTA' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IAI Area, South America' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IN-Islands' in water_data.loc[i, 'Elem flow name'] or
-                                                        'MRO' in water_data.loc[i, 'Elem flow name'] or
-                                                        'NAFTA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'NORDEL' in water_data.loc[i, 'Elem flow name'] or
-                                                        'NPCC' in water_data.loc[i, 'Elem flow name'] or
-                                                        'North America without Quebec' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Northern Cyprus' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Québec, HQ distribution network' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'RER w/o AT+BE+CH+DE+FR+IT' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'RER w/o CH+DE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RER w/o DE+NL+NO' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RER w/o DE+NL+NO+RU' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RER w/o DE+NL+RU' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RER w/o RU' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Russia (Asia)' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Russia (Europe)' in water_data.loc[i, 'Elem flow name'] or
-                                                        'SAS' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Siachen Glacier' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Somaliland' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UCTE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UCTE without France' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UCTE without Germany' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UCTE without Germany and France' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'UN-AMERICAS' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-ASIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-AUSTRALIANZ' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-CAMERICA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-CARIBBEAN' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-EAFRICA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-EASIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-EEUROPE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-EUROPE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-MAFRICA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-MELANESIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-MICRONESIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-NAFRICA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-NEUROPE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-OCEANIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-POLYNESIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-SAMERICA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-SASIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-SEASIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-SEUROPE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-WAFRICA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-WASIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'United States of America, including overseas territories' in
-                                                        water_data.loc[i, 'Elem flow name'] or
-                                                        'WECC' in water_data.loc[i, 'Elem flow name'] or
-                                                        'WEU' in water_data.loc[i, 'Elem flow name'])],
-                       'Native geographical resolution scale'] = 'Other region'
-
-        self.master_db = pd.concat([self.master_db, water_data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(water_data)
 
     def load_thermally_polluted_water_cfs(self):
         """
@@ -3460,28 +2960,15 @@ class Parse:
         :return: update master_db
         """
 
-        data = pd.read_sql('SELECT * FROM "CF - not regionalized - ThermallyPollutedWater"', self.conn)
-        conc = pd.read_sql('SELECT * FROM "SI - Mapping with regions of ecoinvent"', self.conn).set_index(
-            'AWARE').Ecoinvent_short_name
-        geos = pd.read_sql(sql='SELECT * FROM [CF - regionalized - WaterScarcity - aggregated]', con=self.conn).loc[
-               :, 'ecoinvent_shortname'].tolist()
+        data = self.tables.read('CF - not regionalized - ThermallyPollutedWater')
+        mapping = self.tables.read('SI - Mapping with regions of ecoinvent', ['AWARE', 'Ecoinvent_short_name'])
+        geos = self.tables.read('CF - regionalized - WaterScarcity - aggregated', ['ecoinvent_shortname'])
 
         CF_value = data.loc[:, 'CF value'].iloc[0]
         # create the regionalized names (e.g., Water, AF)
-        water_data = pd.DataFrame()
-        for i, geo in enumerate(geos):
-            if geo in conc.index:
-                if type(conc.loc[geo]) == str:
-                    water_data.loc[i, 'Elem flow name'] = 'Water, cooling, unspecified natural origin, ' + conc.loc[geo]
-                    water_data.loc[i, 'CF value'] = CF_value
-                else:
-                    for j in range(0, len(conc.loc[geo])):
-                        water_data.loc[str(i + j), 'Elem flow name'] = 'Water, cooling, unspecified natural origin, ' + \
-                                                                       conc.loc[geo].iloc[j]
-                        water_data.loc[str(i + j), 'CF value'] = CF_value
-            else:
-                water_data.loc[i, 'Elem flow name'] = 'Water, cooling, unspecified natural origin, ' + geo
-                water_data.loc[i, 'CF value'] = CF_value
+        geos = expand_water_regions(geos, mapping)
+        water_data = pd.DataFrame({'Elem flow name': 'Water, cooling, unspecified natural origin, ' +
+                                                     geos.loc[:, 'Region'], 'CF value': CF_value})
 
         # formatting the data to IW+ format
         water_data.loc[:, 'Impact category'] = 'Thermally polluted water'
@@ -3491,129 +2978,11 @@ class Parse:
         water_data.loc[:, 'CAS number'] = '7732-18-5'
         water_data.loc[:, 'Elem flow unit'] = 'm3'
         water_data.loc[:, 'MP or Damage'] = 'Damage'
-        water_data.loc[:, 'Native geographical resolution scale'] = 'Country'
+        water_data.loc[:, 'Native geographical resolution scale'] = water_resolution_scales(geos.loc[:, 'Region'])
         water_data.loc[:, 'CF value'] = water_data.loc[:, 'CF value'].astype(float)
 
-        water_data.loc[[i for i in water_data.index if ('RER' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RAS' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RAF' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RLA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'OCE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RNA' in water_data.loc[i, 'Elem flow name'])],
-                       'Native geographical resolution scale'] = 'Continent'
-        water_data.loc[[i for i in water_data.index if 'GLO' in water_data.loc[i, 'Elem flow name']],
-                       'Native geographical resolution scale'] = 'Global'
-        water_data.loc[[i for i in water_data.index if ('RoW' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Akrotiri' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Asia without China' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Australia, including overseas territories' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'BALTSO' in water_data.loc[i, 'Elem flow name'] or
-                                                        'CENTREL' in water_data.loc[i, 'Elem flow name'] or
-                                                        'CUSMA/T-MEC/USMCA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Canada without Alberta' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Canada without Alberta and Quebec' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Canada without Quebec' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Canary Islands' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Central Asia' in water_data.loc[i, 'Elem flow name'] or
-                                                        'China w/o Inner Mongol' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Crimea' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Cyprus No Mans Area' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Dhekelia Base' in water_data.loc[i, 'Elem flow name'] or
-                                                        'ENTSO-E' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Europe without Austria' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Europe without NORDEL (NCPA)' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Europe without Switzerland' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Europe without Switzerland and Austria' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Europe without Switzerland and France' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Europe, without Russia and Türkiye' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'FSU' in water_data.loc[i, 'Elem flow name'] or
-                                                        'France, including overseas territories' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Guantanamo Bay' in water_data.loc[i, 'Elem flow name'] or
-                                                        'IAI Area, Africa' in water_data.loc[i, 'Elem flow name'] or
-                                                        'IAI Area, Asia, without China and GCC' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IAI Area, EU27 & EFTA' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IAI Area, Gulf Cooperation Council' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IAI Area, North America' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IAI Area, North America, without Quebec' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IAI Area, Russia & RER w/o EU27 & EFTA' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IAI Area, South America' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'IN-Islands' in water_data.loc[i, 'Elem flow name'] or
-                                                        'MRO' in water_data.loc[i, 'Elem flow name'] or
-                                                        'NAFTA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'NORDEL' in water_data.loc[i, 'Elem flow name'] or
-                                                        'NPCC' in water_data.loc[i, 'Elem flow name'] or
-                                                        'North America without Quebec' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'Northern Cyprus' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Québec, HQ distribution network' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'RER w/o AT+BE+CH+DE+FR+IT' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'RER w/o CH+DE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RER w/o DE+NL+NO' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RER w/o DE+NL+NO+RU' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RER w/o DE+NL+RU' in water_data.loc[i, 'Elem flow name'] or
-                                                        'RER w/o RU' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Russia (Asia)' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Russia (Europe)' in water_data.loc[i, 'Elem flow name'] or
-                                                        'SAS' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Siachen Glacier' in water_data.loc[i, 'Elem flow name'] or
-                                                        'Somaliland' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UCTE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UCTE without France' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UCTE without Germany' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UCTE without Germany and France' in water_data.loc[
-                                                            i, 'Elem flow name'] or
-                                                        'UN-AMERICAS' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-ASIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-AUSTRALIANZ' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-CAMERICA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-CARIBBEAN' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-EAFRICA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-EASIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-EEUROPE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-EUROPE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-MAFRICA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-MELANESIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-MICRONESIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-NAFRICA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-NEUROPE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-OCEANIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-POLYNESIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-SAMERICA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-SASIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-SEASIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-SEUROPE' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-WAFRICA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'UN-WASIA' in water_data.loc[i, 'Elem flow name'] or
-                                                        'United States of America, including overseas territories' in
-                                                        water_data.loc[i, 'Elem flow name'] or
-                                                        'WECC' in water_data.loc[i, 'Elem flow name'] or
-                                                        'WEU' in water_data.loc[i, 'Elem flow name'])],
-                       'Native geographical resolution scale'] = 'Other region'
-
         # concat with master_db
-        self.master_db = pd.concat([self.master_db, water_data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(water_data)
 
     def load_physical_effects_cfs(self):
         """
@@ -3625,8 +2994,7 @@ class Parse:
         :return: update master_db
         """
 
-        original_cfs = pd.read_sql('SELECT * from "CF - not regionalized - PhysicalImpactonBiota"',
-                                   con=self.conn)
+        original_cfs = self.tables.read('CF - not regionalized - PhysicalImpactonBiota')
 
         original_cfs.drop(['Geometric st.dev.', 'Lower limit 95% CI', 'Upper limit 95% CI'], axis=1, inplace=True)
         original_cfs.loc[:, 'Impact category'] = 'Physical effects on biota'
@@ -3665,23 +3033,20 @@ class Parse:
                          'Film fragments': 100,
                          'Microfibers/cylinders': 10}
         for shape in default_sizes.keys():
-            df = original_cfs.loc[[i for i in original_cfs.index if
-                                   shape == original_cfs.loc[i, 'Shape'] and default_sizes[shape] == original_cfs.loc[
-                                       i, 'Size']]].copy()
+            df = original_cfs.loc[mask_eq(original_cfs, 'Shape', shape) &
+                                  mask_eq(original_cfs, 'Size', default_sizes[shape])].copy()
             df.loc[:, 'Elem flow name'] = [i.split(str(default_sizes[shape]) + ' µm diameter')[0] + 'default)' for i in
                                            df.loc[:, 'Elem flow name']]
             original_cfs = clean_up_dataframe(pd.concat([original_cfs, df]))
 
         original_cfs.drop(['Polymer type', 'Size', 'Shape'], axis=1, inplace=True)
 
-        self.master_db = pd.concat([self.master_db, original_cfs])
-        self.master_db = clean_up_dataframe(self.master_db)
-
         # have an unspecified sub-compartment in the water compartment for plastics
-        df = self.master_db.loc[self.master_db.loc[:, 'Impact category'] == 'Physical effects on biota'].loc[
-            self.master_db.loc[:, 'Sub-compartment'] == 'lake'].copy()
+        df = original_cfs.loc[(original_cfs.loc[:, 'Impact category'] == 'Physical effects on biota') &
+                              (original_cfs.loc[:, 'Sub-compartment'] == 'lake')].copy()
         df.loc[:, 'Sub-compartment'] = '(unspecified)'
-        self.master_db = clean_up_dataframe(pd.concat([self.master_db, df]))
+
+        self.add_to_master_db(original_cfs, df)
 
     def load_fisheries_cfs(self):
         """
@@ -3693,10 +3058,8 @@ class Parse:
         :return: update master_db
         """
 
-        cfs = pd.read_sql("SELECT * FROM [CF - regionalized - Fisheries]", self.conn)
-
         # only keep data that are classifies as the most robust, i.e., class I
-        cfs = cfs.loc[cfs.loc[:, 'class'] == 'I']
+        cfs = self.tables.read('CF - regionalized - Fisheries', where="[class] = 'I'")
         # change FAO_zone from numbers to strings
         cfs['FAO_num'] = cfs['FAO_num'].astype(str)
         # convert the species/yr cf to PDF.m2.yr
@@ -3707,13 +3070,13 @@ class Parse:
 
         # aggregate impacts of fish per type of fish, i.e., pelagic or demersal
         cf_regions = pd.DataFrame(
-            index=pd.MultiIndex.from_product([list(set(cfs.loc[:, 'FAO_num'])), ['Demersal', 'Pelagic']]),
+            index=pd.MultiIndex.from_product([sorted(set(cfs.loc[:, 'FAO_num'])), ['Demersal', 'Pelagic']]),
             columns=['CF (PDF.m2.yr)'])
-        for FAO_zone in set(cfs.loc[:, 'FAO_num']):
+        for FAO_zone in sorted(set(cfs.loc[:, 'FAO_num'])):
             biomass_demersal_in_zone = 0
             biomass_pelagic_in_zone = 0
             try:
-                cf_regions.loc[[(FAO_zone, 'Demersal')], 'CF (PDF.m2.yr)'] = gmean(
+                cf_regions.loc[[(FAO_zone, 'Demersal')], 'CF (PDF.m2.yr)'] = stats.gmean(
                     cfs.loc[cfs.loc[:, 'FAO_num'] == FAO_zone].loc[cfs.loc[:, 'Type'] == 'Demersal', 'CF (PDF.m2.yr)'],
                     weights=cfs.loc[cfs.loc[:, 'FAO_num'] == FAO_zone].loc[
                         cfs.loc[:, 'Type'] == 'Demersal', 'B (tonnes)'])
@@ -3722,7 +3085,7 @@ class Parse:
             except ZeroDivisionError:
                 pass
             try:
-                cf_regions.loc[[(FAO_zone, 'Pelagic')], 'CF (PDF.m2.yr)'] = gmean(
+                cf_regions.loc[[(FAO_zone, 'Pelagic')], 'CF (PDF.m2.yr)'] = stats.gmean(
                     cfs.loc[cfs.loc[:, 'FAO_num'] == FAO_zone].loc[cfs.loc[:, 'Type'] == 'Pelagic', 'CF (PDF.m2.yr)'],
                     weights=cfs.loc[cfs.loc[:, 'FAO_num'] == FAO_zone].loc[
                         cfs.loc[:, 'Type'] == 'Pelagic', 'B (tonnes)'])
@@ -3741,9 +3104,9 @@ class Parse:
                 math.log(cf_regions.loc[[(FAO_zone, 'Demersal')], 'CF (PDF.m2.yr)'].iloc[0]) * biomass_demersal_in_zone)
 
         # determine global values for CF and discard CF
-        glo = pd.DataFrame([gmean(cfs.loc[cfs.loc[:, 'Type'] == 'Demersal', 'CF (PDF.m2.yr)'],
+        glo = pd.DataFrame([stats.gmean(cfs.loc[cfs.loc[:, 'Type'] == 'Demersal', 'CF (PDF.m2.yr)'],
                                   weights=cfs.loc[cfs.loc[:, 'Type'] == 'Demersal', 'B (tonnes)']),
-                            gmean(cfs.loc[cfs.loc[:, 'Type'] == 'Pelagic', 'CF (PDF.m2.yr)'],
+                            stats.gmean(cfs.loc[cfs.loc[:, 'Type'] == 'Pelagic', 'CF (PDF.m2.yr)'],
                                   weights=cfs.loc[cfs.loc[:, 'Type'] == 'Pelagic', 'B (tonnes)'])],
                            index=pd.MultiIndex.from_product([['GLO'], ['Demersal', 'Pelagic']]),
                            columns=['CF (PDF.m2.yr)'])
@@ -3762,12 +3125,10 @@ class Parse:
         cf_regions.loc[:, 'Discard CF (PDF.m2.yr/t discarded fish)'] = cf_regions.loc[:,
                                                                        'Discard CF (PDF.m2.yr/t discarded fish)'].fillna(
             glo.loc[:, 'Discard CF (PDF.m2.yr/t discarded fish)'].iloc[0])
-        cf_regions.loc[[i for i in cf_regions.index if i[1] == 'Pelagic'], 'CF (PDF.m2.yr)'] = cf_regions.loc[
-            [i for i in cf_regions.index if i[1] == 'Pelagic'], 'CF (PDF.m2.yr)'].fillna(
-            glo.loc[('GLO', 'Pelagic'), 'CF (PDF.m2.yr)'])
-        cf_regions.loc[[i for i in cf_regions.index if i[1] == 'Demersal'], 'CF (PDF.m2.yr)'] = cf_regions.loc[
-            [i for i in cf_regions.index if i[1] == 'Demersal'], 'CF (PDF.m2.yr)'].fillna(
-            glo.loc[('GLO', 'Demersal'), 'CF (PDF.m2.yr)'])
+        for fish_type in ['Pelagic', 'Demersal']:
+            fish_type_rows = cf_regions.index.get_level_values(1) == fish_type
+            cf_regions.loc[fish_type_rows, 'CF (PDF.m2.yr)'] = cf_regions.loc[
+                fish_type_rows, 'CF (PDF.m2.yr)'].fillna(glo.loc[('GLO', fish_type), 'CF (PDF.m2.yr)'])
 
         data = pd.DataFrame()
 
@@ -3796,20 +3157,76 @@ class Parse:
         data = clean_up_dataframe(data)
         data.loc[:, 'Impact category'] = 'Fisheries impact'
         data.loc[:, 'CF unit'] = 'PDF.m2.yr'
-        data.loc[[i for i in data.index if 'discarded' not in data.loc[i, 'Elem flow name']], 'Compartment'] = 'Raw'
-        data.loc[[i for i in data.index if 'discarded' in data.loc[i, 'Elem flow name']], 'Compartment'] = 'Water'
+        data.loc[~mask_contains(data, 'Elem flow name', 'discarded'), 'Compartment'] = 'Raw'
+        data.loc[mask_contains(data, 'Elem flow name', 'discarded'), 'Compartment'] = 'Water'
         data.loc[
-            [i for i in data.index if 'discarded' not in data.loc[i, 'Elem flow name']], 'Sub-compartment'] = 'biotic'
-        data.loc[[i for i in data.index if 'discarded' in data.loc[i, 'Elem flow name']], 'Sub-compartment'] = 'ocean'
+            data.index[~mask_contains(data, 'Elem flow name', 'discarded')], 'Sub-compartment'] = 'biotic'
+        data.loc[mask_contains(data, 'Elem flow name', 'discarded'), 'Sub-compartment'] = 'ocean'
         data.loc[:, 'Elem flow unit'] = 'kg'
         data.loc[:, 'MP or Damage'] = 'Damage'
         data.loc[:, 'Native geographical resolution scale'] = 'Country'
         data = clean_up_dataframe(data)
-        data.loc[[i for i in data.index if ', GLO' in data.loc[i, 'Elem flow name']],
+        data.loc[mask_contains(data, 'Elem flow name', ', GLO'),
                  'Native geographical resolution scale'] = 'Global'
 
-        self.master_db = pd.concat([self.master_db, data])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(data)
+
+    def apply_stoichiometric_ratios(self):
+        """
+        Extrapolates CFs of other substances from the CFs of proxy substances using the stoechiometric ratios of the
+        'SI - Stoechiometry' table, e.g., Ammonium carbonate from Ammonia. All the impact categories are treated at
+        once by joining the stoechiometry table to the CFs of the proxies on the impact category and the compartment.
+
+        Concerned impact categories:
+            - Freshwater acidification
+            - Terrestrial acidification
+            - Marine eutrophication
+            - Freshwater eutrophication
+
+        :return: updated master_db
+        """
+
+        stoc = self.tables.read('SI - Stoechiometry')
+
+        # name of the proxy substance in the CFs of each impact category, freshwater eutrophication only relies on
+        # phosphate whatever the proxy molecule
+        proxies = {(category, molecule): flow for category, spec in AGGREGATED_CF_TABLES.items()
+                   for flow, cas, molecule in spec['substances']}
+        stoc.loc[:, 'Proxy name'] = [
+            'Phosphate' if category == 'Freshwater eutrophication' else proxies.get((category, molecule))
+            for category, molecule in zip(stoc.loc[:, 'Impact category'], stoc.loc[:, 'Proxy molecule'])]
+        # don't create a duplicate of the proxy itself
+        stoc = stoc.loc[stoc.loc[:, 'Proxy name'].notna() &
+                        (stoc.loc[:, 'Elem flow name'] != stoc.loc[:, 'Proxy name'])]
+        stoc = stoc.loc[:, ['Impact category', 'Compartment', 'Elem flow name', 'CAS number', 'Proxy ratio',
+                            'Proxy name']].rename(columns={'Elem flow name': 'New name', 'CAS number': 'New CAS'})
+        # the ratios are applied in the order of the table, a substance extrapolated from a ratio can itself be the
+        # proxy of the ratios coming after it (e.g., a name containing "Nitric acid" created from Ammonia)
+        stoc.loc[:, 'Ratio'] = range(len(stoc))
+
+        cfs = self.master_db.loc[mask_isin(self.master_db, 'Impact category', stoc.loc[:, 'Impact category'])]
+        cfs = cfs.assign(Ratio=-1)
+        extrapolated = []
+        while not cfs.empty:
+            df = cfs.merge(stoc, on=['Impact category', 'Compartment'], suffixes=('', ' applied'))
+            df = df.loc[df.loc[:, 'Ratio applied'] > df.loc[:, 'Ratio']]
+            selected = np.zeros(len(df), dtype=bool)
+            for proxy in df.loc[:, 'Proxy name'].unique():
+                rows = mask_eq(df, 'Proxy name', proxy)
+                selected[rows] = mask_contains(df.loc[rows], 'Elem flow name', proxy)
+                if proxy == 'Ammonia':
+                    selected[rows] &= ~mask_contains(df.loc[rows], 'Elem flow name', 'Ammonia, as N')
+            df = df.loc[selected]
+
+            df.loc[:, 'Elem flow name'] = [name.replace(proxy, new) for name, proxy, new in zip(
+                df.loc[:, 'Elem flow name'], df.loc[:, 'Proxy name'], df.loc[:, 'New name'])]
+            df.loc[:, 'CAS number'] = df.loc[:, 'New CAS']
+            df.loc[:, 'CF value'] = df.loc[:, 'CF value'] * df.loc[:, 'Proxy ratio']
+            cfs = df.loc[:, cfs.columns.drop('Ratio').tolist() + ['Ratio applied']].rename(
+                columns={'Ratio applied': 'Ratio'})
+            extrapolated.append(cfs.drop('Ratio', axis=1))
+
+        self.add_to_master_db(*extrapolated)
 
     def harmonize_regionalized_substances(self):
         """
@@ -3820,7 +3237,7 @@ class Parse:
         :return: updated self.master_db
         """
 
-        map = pd.read_sql('SELECT * FROM [SI - Mapping countries to continents]', self.conn).set_index('country')
+        map = self.tables.read('SI - Mapping countries to continents').set_index('country')
 
         for substance in ['Ammonia', 'Nitrogen oxides', 'Sulfur dioxide']:
             all_existing_geos = set(self.master_db.loc[(self.master_db.loc[:, 'Elem flow name'].str.contains(
@@ -3929,9 +3346,8 @@ class Parse:
         proxy = pd.DataFrame()
         for comp in subcomps.keys():
             if comp != 'Raw':
-                unspecified = self.master_db.loc[
-                    [i for i in self.master_db.index if (self.master_db.loc[i, 'Compartment'] == comp and
-                                                         self.master_db.loc[i, 'Sub-compartment'] == '(unspecified)')]]
+                unspecified = self.master_db.loc[mask_eq(self.master_db, 'Compartment', comp) &
+                                                 mask_eq(self.master_db, 'Sub-compartment', '(unspecified)')]
                 dff = unspecified.copy()
                 for subcomp in subcomps[comp]:
                     df = unspecified.copy()
@@ -3942,33 +3358,24 @@ class Parse:
             else:
                 # For the Fossil and nuclear energy use category
                 unspecified = self.master_db.loc[
-                    [i for i in self.master_db.index if (self.master_db.loc[i, 'Compartment'] == 'Raw' and
-                                                         self.master_db.loc[i, 'Sub-compartment'] == '(unspecified)' and
-                                                         self.master_db.loc[
-                                                             i, 'Impact category'] == 'Fossil and nuclear energy use')]]
-                biotic = unspecified.loc[
-                    [i for i in unspecified.index if ('wood' in unspecified.loc[i, 'Elem flow name'].lower() or
-                                                      'peat' in unspecified.loc[
-                                                          i, 'Elem flow name'].lower())]].copy()
-                fossil = unspecified.loc[
-                    [i for i in unspecified.index if ('wood' not in unspecified.loc[i, 'Elem flow name'].lower() and
-                                                      'peat' not in unspecified.loc[
-                                                          i, 'Elem flow name'].lower())]].copy()
+                    mask_eq(self.master_db, 'Compartment', 'Raw') &
+                    mask_eq(self.master_db, 'Sub-compartment', '(unspecified)') &
+                    mask_eq(self.master_db, 'Impact category', 'Fossil and nuclear energy use')]
+                biotic_flows = mask_contains(unspecified, 'Elem flow name', ['wood', 'peat'], case=False)
+                biotic = unspecified.loc[biotic_flows].copy()
+                fossil = unspecified.loc[~biotic_flows].copy()
                 biotic.loc[:, 'Sub-compartment'] = 'biotic'
                 fossil.loc[:, 'Sub-compartment'] = 'in ground'
                 proxy = pd.concat([proxy, unspecified, biotic, fossil])
 
                 # For the water flows
                 unspecified = self.master_db.loc[
-                    [i for i in self.master_db.index if (
-                            self.master_db.loc[i, 'Compartment'] == 'Raw' and
-                            self.master_db.loc[i, 'Sub-compartment'] == '(unspecified)' and
-                            self.master_db.loc[i, 'Impact category'] in ['Water scarcity',
-                                                                         'Thermally polluted water',
-                                                                         'Water availability, terrestrial ecosystem',
-                                                                         'Water availability, freshwater ecosystem',
-                                                                         'Water availability, human health']
-                    )]]
+                    mask_eq(self.master_db, 'Compartment', 'Raw') &
+                    mask_eq(self.master_db, 'Sub-compartment', '(unspecified)') &
+                    mask_isin(self.master_db, 'Impact category',
+                              ['Water scarcity', 'Thermally polluted water',
+                               'Water availability, terrestrial ecosystem', 'Water availability, freshwater ecosystem',
+                               'Water availability, human health'])]
                 dff = unspecified.copy()
                 dff.loc[:, 'Sub-compartment'] = 'in water'
                 proxy = pd.concat([proxy, dff])
@@ -3991,8 +3398,7 @@ class Parse:
         # ------------ groundwater and ocean subcomps ------------
 
         # for the groundwater and ocean subcomps, only in some impact categories are the values equal to unspecified
-        water_comp = self.master_db.loc[
-            [i for i in self.master_db.index if self.master_db.loc[i, 'Compartment'] == 'Water']]
+        water_comp = self.master_db.loc[mask_eq(self.master_db, 'Compartment', 'Water')]
         to_unspecified = {'groundwater': ['Water availability, freshwater ecosystem',
                                           'Water availability, human health',
                                           'Water scarcity'],
@@ -4064,15 +3470,11 @@ class Parse:
         for subcomp in to_unspecified:
             for cat in to_unspecified[subcomp]:
                 if cat not in already_has_groundwater_values:
-                    data = water_comp.loc[
-                        [i for i in water_comp.index if (water_comp.loc[i, 'Impact category'] == cat and
-                                                         water_comp.loc[
-                                                             i, 'Sub-compartment'] == '(unspecified)')]]
+                    data = water_comp.loc[mask_eq(water_comp, 'Impact category', cat) &
+                                          mask_eq(water_comp, 'Sub-compartment', '(unspecified)')]
                 else:
-                    data = water_comp.loc[
-                        [i for i in water_comp.index if (water_comp.loc[i, 'Impact category'] == cat and
-                                                         water_comp.loc[
-                                                             i, 'Sub-compartment'] == 'groundwater')]]
+                    data = water_comp.loc[mask_eq(water_comp, 'Impact category', cat) &
+                                          mask_eq(water_comp, 'Sub-compartment', 'groundwater')]
                 proxy = data.copy()
                 proxy.loc[:, 'Sub-compartment'] = subcomp
                 proxy.set_index(['Impact category', 'CF unit', 'Compartment', 'Sub-compartment', 'Elem flow name'],
@@ -4085,9 +3487,8 @@ class Parse:
 
         for subcomp in to_zero:
             for cat in to_zero[subcomp]:
-                data = water_comp.loc[[i for i in water_comp.index if (water_comp.loc[i, 'Impact category'] == cat and
-                                                                       water_comp.loc[
-                                                                           i, 'Sub-compartment'] == '(unspecified)')]]
+                data = water_comp.loc[mask_eq(water_comp, 'Impact category', cat) &
+                                      mask_eq(water_comp, 'Sub-compartment', '(unspecified)')]
                 proxy = data.copy()
                 proxy.loc[:, 'Sub-compartment'] = subcomp
                 proxy.loc[:, 'CF value'] = 0
@@ -4110,17 +3511,15 @@ class Parse:
 
         for subcomp in long_term_subcomps.keys():
             # slice dataframe to only keep the corresponding subcomp (low. pop., long-term)
-            data = self.master_db.loc[[i for i in self.master_db.index if (self.master_db.loc[i, 'Sub-compartment']
-                                                                           == long_term_subcomps[subcomp])]].copy()
+            data = self.master_db.loc[mask_eq(self.master_db, 'Sub-compartment', long_term_subcomps[subcomp])].copy()
             # remove already existing subcomp values, these values will be redefined properly in this function
-            self.master_db.drop(
-                [i for i in self.master_db.index if (self.master_db.loc[i, 'Sub-compartment'] == subcomp and
-                                                     ','.join(self.master_db.loc[i, 'Impact category'].split(',')[
-                                                              :-1]) in long_term_cats)], inplace=True)
+            self.master_db.drop(self.master_db.index[
+                mask_eq(self.master_db, 'Sub-compartment', subcomp) &
+                mask_values(self.master_db.loc[:, 'Impact category'],
+                            lambda ic: ','.join(ic.split(',')[:-1]) in long_term_cats)], inplace=True)
             for cat in long_term_cats:
                 # slice dataframe to only keep corresponding impact category
-                df = data.loc[[i for i in data.index if (cat in data.loc[i, 'Impact category'] and
-                                                         cat != data.loc[i, 'Impact category'])]]
+                df = data.loc[mask_contains(data, 'Impact category', cat) & ~mask_eq(data, 'Impact category', cat)]
                 # remove the "short term" and "long term" from impact category name
                 df.loc[:, 'Impact category'] = [','.join(i.split(',')[:-1]) for i in df.loc[:, 'Impact category']]
                 # now that they have the same category name, we can add their CF value by merging dataframes
@@ -4150,10 +3549,8 @@ class Parse:
 
         # now for midpoint categories
         for subcomp in long_term_subcomps.keys():
-            data = self.master_db.loc[[i for i in self.master_db.index if (self.master_db.loc[i, 'Sub-compartment']
-                                                                           == long_term_subcomps[subcomp] and
-                                                                           self.master_db.loc[
-                                                                               i, 'MP or Damage'] == 'Midpoint')]].copy()
+            data = self.master_db.loc[mask_eq(self.master_db, 'Sub-compartment', long_term_subcomps[subcomp]) &
+                                      mask_eq(self.master_db, 'MP or Damage', 'Midpoint')].copy()
             df = data.copy()
             df.loc[:, 'Sub-compartment'] = subcomp
             self.master_db = pd.concat([self.master_db, df])
@@ -4166,12 +3563,9 @@ class Parse:
                'Terrestrial acidification', 'Particulate matter formation', 'Ionizing radiations, ecosystem quality',
                'Ionizing radiations, human health', 'Freshwater acidification']
         for subcomp in long_term_subcomps.keys():
-            data = self.master_db.loc[[i for i in self.master_db.index if (self.master_db.loc[i, 'Sub-compartment']
-                                                                           == long_term_subcomps[subcomp] and
-                                                                           self.master_db.loc[
-                                                                               i, 'Impact category'] in ics and
-                                                                           self.master_db.loc[
-                                                                               i, 'MP or Damage'] == 'Damage')]].copy()
+            data = self.master_db.loc[mask_eq(self.master_db, 'Sub-compartment', long_term_subcomps[subcomp]) &
+                                      mask_isin(self.master_db, 'Impact category', ics) &
+                                      mask_eq(self.master_db, 'MP or Damage', 'Damage')].copy()
             df = data.copy()
             df.loc[:, 'Sub-compartment'] = subcomp
             self.master_db = pd.concat([self.master_db, df])
@@ -4184,14 +3578,12 @@ class Parse:
         df = self.master_db[self.master_db['Elem flow name'] == 'Water, lake, GLO'].copy()
         df['Elem flow name'] = 'Water, salt, ocean'
         df['CF value'] = 0
-        self.master_db = pd.concat([self.master_db, df])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(df)
         # add zero flows for saline water to make it explicit for the user
         df = self.master_db[self.master_db['Elem flow name'] == 'Water, lake, GLO'].copy()
         df['Elem flow name'] = 'Water, salt, sole'
         df['CF value'] = 0
-        self.master_db = pd.concat([self.master_db, df])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(df)
 
     def create_not_regio_flows(self):
         """
@@ -4200,12 +3592,10 @@ class Parse:
         :return:
         """
 
-        global_values = [i for i in self.master_db.index if ', GLO' in
-                         self.master_db.loc[i, 'Elem flow name']]
+        global_values = self.master_db.index[mask_contains(self.master_db, 'Elem flow name', ', GLO')]
         df = self.master_db.loc[global_values]
         df['Elem flow name'] = [i.split(', GLO')[0] for i in df['Elem flow name']]
-        self.master_db = pd.concat([self.master_db, df])
-        self.master_db = clean_up_dataframe(self.master_db)
+        self.add_to_master_db(df)
 
     def create_regio_flows_for_not_regio_ic(self):
         """
@@ -4273,10 +3663,9 @@ class Parse:
         self.master_db = self.master_db.sort_values(by=['Impact category', 'Elem flow name'])
         self.master_db = self.master_db.reset_index().drop('index', axis=1)
 
-        DALY = self.master_db.loc[[i for i in self.master_db.index if self.master_db.loc[i, 'CF unit'] == 'DALY']]
-        PDF = self.master_db.loc[[i for i in self.master_db.index if self.master_db.loc[i, 'CF unit'] == 'PDF.m2.yr']]
-        MP = self.master_db.loc[
-            [i for i in self.master_db.index if self.master_db.loc[i, 'MP or Damage'] == 'Midpoint']]
+        DALY = self.master_db.loc[mask_eq(self.master_db, 'CF unit', 'DALY')]
+        PDF = self.master_db.loc[mask_eq(self.master_db, 'CF unit', 'PDF.m2.yr')]
+        MP = self.master_db.loc[mask_eq(self.master_db, 'MP or Damage', 'Midpoint')]
 
         self.master_db = clean_up_dataframe(pd.concat([MP, DALY, PDF]))
 
@@ -4364,9 +3753,9 @@ class Parse:
             pd.concat([self.master_db_carbon_neutrality, co2_bio_release, co2_bio_uptake,
                        co_bio_release, co2_to_soil]))
 
-        self.master_db_carbon_neutrality.loc[[i for i in self.master_db_carbon_neutrality.index if (
-                'Marine acidification' in self.master_db_carbon_neutrality.loc[i, 'Impact category'] and
-                self.master_db_carbon_neutrality.loc[i, 'Elem flow name'] == 'Methane, biogenic')], 'CF value'] = 0
+        self.master_db_carbon_neutrality.loc[
+            mask_contains(self.master_db_carbon_neutrality, 'Impact category', 'Marine acidification') &
+            mask_eq(self.master_db_carbon_neutrality, 'Elem flow name', 'Methane, biogenic'), 'CF value'] = 0
 
     def deal_with_temporary_storage_of_carbon(self):
         """
@@ -4491,35 +3880,37 @@ class Parse:
         ecoinvent versions.
         """
 
-        self.master_db_not_regio = self.master_db.loc[[i for i in self.master_db.index if
-                                                       self.master_db.loc[
-                                                           i, 'Native geographical resolution scale'] not in [
-                                                           'Continent', 'Country', 'Other region']]].copy()
+        regio_scales = ['Continent', 'Country', 'Other region']
+
+        self.master_db_not_regio = self.master_db.loc[
+            ~mask_isin(self.master_db, 'Native geographical resolution scale', regio_scales)].copy()
 
         # dropping flow names with ", GLO" in them
-        self.master_db_not_regio.drop([i for i in self.master_db_not_regio.index if ', GLO' in
-                                       self.master_db_not_regio.loc[i, 'Elem flow name']], inplace=True)
+        self.master_db_not_regio.drop(self.master_db_not_regio.index[
+            mask_contains(self.master_db_not_regio, 'Elem flow name', ', GLO')], inplace=True)
 
         self.master_db_not_regio_carbon_neutrality = self.master_db_carbon_neutrality.loc[
-            [i for i in self.master_db_carbon_neutrality.index if
-             self.master_db_carbon_neutrality.loc[i, 'Native geographical resolution scale'] not in [
-                 'Continent', 'Country', 'Other region']]].copy()
+            ~mask_isin(self.master_db_carbon_neutrality, 'Native geographical resolution scale', regio_scales)].copy()
 
         # dropping flow names with ", GLO" in them
-        self.master_db_not_regio_carbon_neutrality.drop(
-            [i for i in self.master_db_not_regio_carbon_neutrality.index if ', GLO' in
-             self.master_db_not_regio_carbon_neutrality.loc[i, 'Elem flow name']], inplace=True)
+        self.master_db_not_regio_carbon_neutrality.drop(self.master_db_not_regio_carbon_neutrality.index[
+            mask_contains(self.master_db_not_regio_carbon_neutrality, 'Elem flow name', ', GLO')], inplace=True)
 
     def link_to_ecoinvent(self):
         """
         Function that links names of substance from IW+ to the names of ecoinvent.
-        :return: e.g., self.ei310_iw, self.ei311_iw, etc.
+        :return: self.ei_iw and self.ei_iw_carbon_neutrality, from which self.ei310_iw, self.ei311_iw, etc. are selected
         """
 
-        latest_ei_version = '3.12'
-
-        elem_flow_uuid = pd.read_excel(pkg_resources.resource_stream(
-            __name__, '/Data/mappings/ei' + latest_ei_version.replace('.', '') + '/ei_elem_flow_uuids.xlsx'))
+        elem_flow_uuid = self.read_data_file(EI_MAPPING_FOLDER + 'ei_elem_flow_uuids.xlsx')
+        mapping = self.read_data_file(EI_MAPPING_FOLDER + 'ei_iw_mapping.xlsx')
+        ei_mapping = mapping.loc[:, ['ecoinvent name', 'iw name']].dropna()
+        # latest version of ecoinvent introducing each elementary flow
+        introduced = {}
+        versions = mapping.dropna(subset=['iw name', 'introduced in ei v.'])
+        for name, version in zip(versions.loc[:, 'ecoinvent name'], versions.loc[:, 'introduced in ei v.']):
+            if name not in introduced or ei_version_key(version) > introduced[name]:
+                introduced[name] = ei_version_key(version)
 
         for db_format in ['normal', 'carbon neutrality']:
             if db_format == 'normal':
@@ -4529,40 +3920,21 @@ class Parse:
 
             # -------------- Mapping substances --------------
 
-            mapping = pd.read_excel(pkg_resources.resource_stream(
-                __name__, '/Data/mappings/ei' + latest_ei_version.replace('.', '') + '/ei_iw_mapping.xlsx'))
-            ei_mapping = mapping.loc[:, ['ecoinvent name', 'iw name']].dropna()
-            not_one_for_one = ei_mapping[ei_mapping.loc[:, 'iw name'].duplicated(False)]
-            one_for_one = ei_mapping[~ei_mapping.loc[:, 'iw name'].duplicated(False)]
-
-            # for one_for_one it's easy! We just replace one for one
-            ei_iw_db.loc[:, 'Elem flow name'] = ei_iw_db.loc[:, 'Elem flow name'].replace(
-                one_for_one.loc[:, 'iw name'].tolist(), one_for_one.loc[:, 'ecoinvent name'].tolist())
-
-            # for not_one_for_one it's harder, e.g., the "Zinc" substance from iw+ must be linked to multiple elementary flows in ecoinvent
-            unique_not_one_for_one = set(not_one_for_one.loc[:, 'iw name'])
-            for subst in tqdm(unique_not_one_for_one, leave=True):
-                ei_df = not_one_for_one.loc[not_one_for_one['iw name']==subst]
-                iw_df = ei_iw_db.loc[ei_iw_db['Elem flow name']==subst]
-                new_df = pd.concat([iw_df] * len(ei_df))
-                new_df = new_df.reset_index().drop('index', axis=1)
-                for i, new_name in enumerate(ei_df.loc[:, 'ecoinvent name']):
-                    new_df.loc[len(iw_df) * i:len(iw_df) * (i + 1), 'Elem flow name'] = new_name
-                ei_iw_db = pd.concat([ei_iw_db, new_df])
-                ei_iw_db = clean_up_dataframe(ei_iw_db)
+            # one-to-one names are replaced, substances linked to multiple elementary flows in ecoinvent (e.g., "Zinc")
+            # are copied once per flow
+            ei_iw_db = map_names(ei_iw_db, ei_mapping, 'iw name', 'ecoinvent name')
 
             # remove CFs from IW for substances that are not in ecoinvent
-            ei_iw_db = ei_iw_db.loc[[i for i in ei_iw_db.index if
-                                     ei_iw_db.loc[i, 'Elem flow name'] in ei_mapping.loc[:, 'ecoinvent name'].tolist()]]
+            ei_iw_db = ei_iw_db.loc[mask_isin(ei_iw_db, 'Elem flow name', ei_mapping.loc[:, 'ecoinvent name'].tolist())]
             # CFs for resources "in ground" should only be for Fossil and nuclear energy use
-            minerals = [i for i in ei_iw_db.index if (', in ground' in ei_iw_db.loc[i, 'Elem flow name'] and
-                                                      ei_iw_db.loc[i, 'Impact category'] not in [
-                                                          'Fossil and nuclear energy use', 'Mineral resources use'] and
-                                                      'Water' not in ei_iw_db.loc[i, 'Elem flow name'])]
+            minerals = ei_iw_db.index[
+                mask_contains(ei_iw_db, 'Elem flow name', ', in ground') &
+                ~mask_isin(ei_iw_db, 'Impact category', ['Fossil and nuclear energy use', 'Mineral resources use']) &
+                ~mask_contains(ei_iw_db, 'Elem flow name', 'Water')]
             ei_iw_db.drop(minerals, axis=0, inplace=True)
             # ions are only available in Water compartments! So remove those ions in air that don't make any sense.
-            ions = [i for i in ei_iw_db.index if (', ion' in ei_iw_db.loc[i, 'Elem flow name'] and
-                                                  ei_iw_db.loc[i, 'Compartment'] != 'Water')]
+            ions = ei_iw_db.index[
+                mask_contains(ei_iw_db, 'Elem flow name', ', ion') & ~mask_eq(ei_iw_db, 'Compartment', 'Water')]
             ei_iw_db.drop(ions, axis=0, inplace=True)
 
             # clean-up
@@ -4574,11 +3946,9 @@ class Parse:
 
             # --------- Comp & subcomp shenanigans ------------
 
-            with open(pkg_resources.resource_filename(
-                    __name__, "Data/mappings/ei" + latest_ei_version.replace('.', '') + "/comps.json"), "r") as f:
+            with open(pkg_resources.resource_filename(__name__, EI_MAPPING_FOLDER + 'comps.json'), 'r') as f:
                 comps = json.load(f)
-            with open(pkg_resources.resource_filename(
-                    __name__, "Data/mappings/ei" + latest_ei_version.replace('.', '') + "/subcomps.json"), "r") as f:
+            with open(pkg_resources.resource_filename(__name__, EI_MAPPING_FOLDER + 'subcomps.json'), 'r') as f:
                 subcomps = json.load(f)
 
             ei_iw_db.Compartment = [comps[i] for i in ei_iw_db.Compartment]
@@ -4587,34 +3957,29 @@ class Parse:
 
             # special cases: forestry subcomp = unspecified subcomp
             df = ei_iw_db.loc[
-                [i for i in ei_iw_db.index if (ei_iw_db.loc[i, 'Sub-compartment'] == 'unspecified' and
-                                               ei_iw_db.loc[i, 'Compartment'] == 'soil')]].copy()
+                mask_eq(ei_iw_db, 'Sub-compartment', 'unspecified') & mask_eq(ei_iw_db, 'Compartment', 'soil')].copy()
             df.loc[:, 'Sub-compartment'] = 'forestry'
             ei_iw_db = pd.concat([ei_iw_db, df])
             ei_iw_db = clean_up_dataframe(ei_iw_db)
 
             # special cases: fossil well subcomp in water comp = ground- subcomp
-            df = ei_iw_db.loc[[i for i in ei_iw_db.index if (ei_iw_db.loc[i, 'Sub-compartment'] == 'ground-' and
-                                                             ei_iw_db.loc[i, 'Compartment'] == 'water')]].copy()
+            df = ei_iw_db.loc[
+                mask_eq(ei_iw_db, 'Sub-compartment', 'ground-') & mask_eq(ei_iw_db, 'Compartment', 'water')].copy()
             df.loc[:, 'Sub-compartment'] = 'fossil well'
             ei_iw_db = pd.concat([ei_iw_db, df])
             ei_iw_db = clean_up_dataframe(ei_iw_db)
 
             # special cases: fossil well subcomp in raw comp = in ground subcomp
-            df = ei_iw_db.loc[[i for i in ei_iw_db.index if (ei_iw_db.loc[i, 'Sub-compartment'] == 'in ground' and
-                                                             ei_iw_db.loc[
-                                                                 i, 'Compartment'] == 'natural resource')]].copy()
+            df = ei_iw_db.loc[mask_eq(ei_iw_db, 'Sub-compartment', 'in ground') &
+                              mask_eq(ei_iw_db, 'Compartment', 'natural resource')].copy()
             df.loc[:, 'Sub-compartment'] = 'fossil well'
             ei_iw_db = pd.concat([ei_iw_db, df])
             ei_iw_db = clean_up_dataframe(ei_iw_db)
 
             # ----------- Unit shenanigans -------------
-            ei_iw_db.loc[
-                [i for i in ei_iw_db.index if ei_iw_db.loc[i, 'Elem flow unit'] == 'Bq'], 'CF value'] *= 1000
-            ei_iw_db.loc[
-                [i for i in ei_iw_db.index if ei_iw_db.loc[i, 'Elem flow unit'] == 'Bq'], 'Elem flow unit'] = 'kBq'
-            ei_iw_db.loc[[i for i in ei_iw_db.index if
-                          ei_iw_db.loc[i, 'Elem flow unit'] == 'm2.yr'], 'Elem flow unit'] = 'm2*year'
+            ei_iw_db.loc[mask_eq(ei_iw_db, 'Elem flow unit', 'Bq'), 'CF value'] *= 1000
+            ei_iw_db.loc[mask_eq(ei_iw_db, 'Elem flow unit', 'Bq'), 'Elem flow unit'] = 'kBq'
+            ei_iw_db.loc[mask_eq(ei_iw_db, 'Elem flow unit', 'm2.yr'), 'Elem flow unit'] = 'm2*year'
 
             # ---------- Odd cases ------------
 
@@ -4667,63 +4032,20 @@ class Parse:
                                                          'Methane, from soil or biomass stock']) &
                         ei_iw_db['Impact category'].str.contains(', fossil', na=False), 'Impact category']]
 
-                # start with latest available version of ecoinvent
-                self.ei312_iw = ei_iw_db.copy('deep')
-
-                # add ecoinvent elem flow uuids
-                self.ei312_iw = self.ei312_iw.merge(
-                    elem_flow_uuid.loc[:, ['Name', 'Compartment', 'Subcompartment', 'ID']],
-                    right_on=['Name', 'Compartment', 'Subcompartment'],
-                    left_on=['Elem flow name', 'Compartment', 'Sub-compartment'],
-                    how='left')
-
-                only_in_312 = list(mapping[mapping.loc[:, 'introduced in ei v.'] == 3.12].dropna(
-                    subset=['iw name']).loc[:, 'ecoinvent name'])
-
-                self.ei311_iw = self.ei312_iw.drop(
-                    [i for i in self.ei312_iw.index if self.ei312_iw.loc[i, 'Elem flow name'] in
-                     only_in_312]).copy('deep')
-
-                only_in_311 = list(mapping[mapping.loc[:, 'introduced in ei v.'] == 3.11].dropna(
-                    subset=['iw name']).loc[:, 'ecoinvent name'])
-
-                self.ei310_iw = self.ei311_iw.drop(
-                    [i for i in self.ei311_iw.index if self.ei311_iw.loc[i, 'Elem flow name'] in
-                     only_in_311]).copy('deep')
-
-                self.ei312_iw = self.ei312_iw.dropna(subset=['ID']).drop_duplicates()
-                self.ei311_iw = self.ei311_iw.dropna(subset=['ID']).drop_duplicates()
-                self.ei310_iw = self.ei310_iw.dropna(subset=['ID']).drop_duplicates()
+            # add ecoinvent elem flow uuids
+            ei_iw_db = ei_iw_db.merge(
+                elem_flow_uuid.loc[:, ['Name', 'Compartment', 'Subcompartment', 'ID']],
+                right_on=['Name', 'Compartment', 'Subcompartment'],
+                left_on=['Elem flow name', 'Compartment', 'Sub-compartment'],
+                how='left')
+            # the CFs of the older versions of ecoinvent are the ones of the elementary flows introduced until then
+            ei_iw_db.loc[:, 'introduced in ei v.'] = ei_iw_db.loc[:, 'Elem flow name'].map(introduced)
+            ei_iw_db = ei_iw_db.dropna(subset=['ID']).drop_duplicates()
 
+            if db_format == 'normal':
+                self.ei_iw = ei_iw_db
             elif db_format == 'carbon neutrality':
-
-                self.ei312_iw_carbon_neutrality = ei_iw_db.copy('deep')
-                # add ecoinvent elem flow uuids
-                self.ei312_iw_carbon_neutrality = self.ei312_iw_carbon_neutrality.merge(
-                    elem_flow_uuid.loc[:, ['Name', 'Compartment', 'Subcompartment', 'ID']],
-                    right_on=['Name', 'Compartment', 'Subcompartment'],
-                    left_on=['Elem flow name', 'Compartment', 'Sub-compartment'],
-                    how='left')
-
-                only_in_312 = list(mapping[mapping.loc[:, 'introduced in ei v.'] == 3.12].dropna(
-                    subset=['iw name']).loc[:, 'ecoinvent name'])
-
-                self.ei311_iw_carbon_neutrality = self.ei312_iw_carbon_neutrality.drop(
-                    [i for i in self.ei312_iw_carbon_neutrality.index if
-                     self.ei312_iw_carbon_neutrality.loc[i, 'Elem flow name'] in
-                     only_in_312]).copy('deep')
-
-                only_in_311 = list(mapping[mapping.loc[:, 'introduced in ei v.'] == 3.11].dropna(
-                    subset=['iw name']).loc[:, 'ecoinvent name'])
-
-                self.ei310_iw_carbon_neutrality = self.ei311_iw_carbon_neutrality.drop(
-                    [i for i in self.ei311_iw_carbon_neutrality.index if
-                     self.ei311_iw_carbon_neutrality.loc[i, 'Elem flow name'] in
-                     only_in_311]).copy('deep')
-
-                self.ei312_iw_carbon_neutrality = self.ei312_iw_carbon_neutrality.dropna(subset=['ID']).drop_duplicates()
-                self.ei311_iw_carbon_neutrality = self.ei311_iw_carbon_neutrality.dropna(subset=['ID']).drop_duplicates()
-                self.ei310_iw_carbon_neutrality = self.ei310_iw_carbon_neutrality.dropna(subset=['ID']).drop_duplicates()
+                self.ei_iw_carbon_neutrality = ei_iw_db
 
     def link_to_sp(self):
         """
@@ -4738,7 +4060,7 @@ class Parse:
             # -------------------------------- MAPPING -------------------------------------
 
             # apply the mapping with the different SP flow names
-            sp = pd.read_excel(pkg_resources.resource_filename(__name__, '/Data/mappings/SP/sp_mapping.xlsx'), None)
+            sp = self.read_data_file('/Data/mappings/SP/sp_mapping.xlsx', sheet_name=None)
             sp = clean_up_dataframe(pd.concat([sp['Non regionalized'], sp['Regionalized']]))
             sp = sp.loc[:, ['Name', 'Name IW+']].dropna()
             differences = sp.loc[sp.Name != sp.loc[:, 'Name IW+']]
@@ -4783,8 +4105,7 @@ class Parse:
             db.loc[db['Elem flow name'] == 'Water, non-agri', 'Elem flow name'] = 'Water/m3, non-agri'
 
             # need an unspecified subcomp for mineral resource uses, for some databases in SP (e.g., Industry2.0)
-            df = db.loc[
-                [i for i in db.index if db.loc[i, 'Impact category'] == 'Mineral resources use']].copy()
+            df = db.loc[mask_eq(db, 'Impact category', 'Mineral resources use')].copy()
             df['Sub-compartment'] = '(unspecified)'
             db = clean_up_dataframe(pd.concat([db, df]))
 
@@ -4822,8 +4143,8 @@ class Parse:
             gj_flows = sp.loc[sp.loc[:, 'Name'].str.contains('GJ'), 'Name']
             for flow in gj_flows:
                 if 'IN-GJ' not in flow:
-                    db.loc[[i for i in db.index if db.loc[i, 'Elem flow name'] == flow and
-                            db.loc[i, 'Impact category'] == 'Fossil and nuclear energy use'], 'CF value'] = float(
+                    db.loc[mask_eq(db, 'Elem flow name', flow) &
+                           mask_eq(db, 'Impact category', 'Fossil and nuclear energy use'), 'CF value'] = float(
                         flow.split(' GJ')[0].split(', ')[-1]) * 1000
 
             # ensure units are coherent for energy flows
@@ -4878,8 +4199,8 @@ class Parse:
                 db.loc[db['Elem flow name'] == problem_child, 'CF value'] /= 1000
 
             # change Becquerels into kiloBecquerels
-            db.loc[[i for i in db.index if db.loc[i, 'Elem flow unit'] == 'Bq'], 'CF value'] *= 1000
-            db.loc[[i for i in db.index if db.loc[i, 'Elem flow unit'] == 'Bq'], 'Elem flow unit'] = 'kBq'
+            db.loc[mask_eq(db, 'Elem flow unit', 'Bq'), 'CF value'] *= 1000
+            db.loc[mask_eq(db, 'Elem flow unit', 'Bq'), 'Elem flow unit'] = 'kBq'
 
             # finally, SimaPro limits to 12 characters the size of the CF unit. We rename some to avoid issues
             db.loc[db.loc[:, 'CF unit'] == 'kg CFC-11 eq', 'CF unit'] = 'kg CFC11 eq'
@@ -4981,9 +4302,8 @@ class Parse:
 
             # -------------------------------- MAPPING -------------------------------------
 
-            olca = pd.read_excel(pkg_resources.resource_filename(
-                __name__, '/Data/mappings/oLCA/v2.5/oLCA_mapping.xlsx'), index_col=0).loc[:,
-                   ['Name', 'Name IW+']].dropna()
+            olca = self.read_data_file('/Data/mappings/oLCA/v2.5/oLCA_mapping.xlsx', index_col=0).loc[
+                :, ['Name', 'Name IW+']].dropna()
             differences = olca.loc[olca.Name != olca.loc[:, 'Name IW+']]
             double_iw_flow = olca.loc[olca.loc[:, 'Name IW+'].duplicated(), 'Name IW+'].tolist()
 
@@ -5017,8 +4337,8 @@ class Parse:
             gj_flows = olca.loc[olca.loc[:, 'Name'].str.contains('GJ'), 'Name']
             for flow in gj_flows:
                 if 'IN-GJ' not in flow:
-                    db.loc[[i for i in db.index if db.loc[i, 'Elem flow name'] == flow and
-                            db.loc[i, 'Impact category'] == 'Fossil and nuclear energy use'], 'CF value'] = float(
+                    db.loc[mask_eq(db, 'Elem flow name', flow) &
+                           mask_eq(db, 'Impact category', 'Fossil and nuclear energy use'), 'CF value'] = float(
                         flow.split(' GJ')[0].split(', ')[-1]) * 1000
 
             # some other flows from oLCA that require conversions because of units
@@ -5134,8 +4454,7 @@ class Parse:
                           (db.loc[:, 'Impact category'] == 'Adaptation to resources services loss (beta)'))]
 
             # --------------------------- ADD OLCA UUIDS ------------------------------------
-            olca_flows = pd.read_excel(pkg_resources.resource_filename(
-                __name__, '/Data/mappings/oLCA/v2.5/all_stressors.xlsx'))
+            olca_flows = self.read_data_file('/Data/mappings/oLCA/v2.5/all_stressors.xlsx')
 
             # split comps and subcomps in two columns for matching with db
             olca_flows['Compartment'] = [i.split('/')[1] for i in olca_flows['comp']]
@@ -5210,8 +4529,8 @@ class Parse:
         """
 
         for exio_version in ['3.8', '3.9']:
-            EXIO_IW_concordance = pd.read_excel(pkg_resources.resource_filename(
-                __name__, 'Data/mappings/exiobase/EXIO_' + exio_version.replace('.', '_') + '_IW_concordance.xlsx'))
+            EXIO_IW_concordance = self.read_data_file(
+                'Data/mappings/exiobase/EXIO_' + exio_version.replace('.', '_') + '_IW_concordance.xlsx')
             EXIO_IW_concordance.set_index('EXIOBASE', inplace=True)
 
             C = pd.DataFrame(0, EXIO_IW_concordance.index,
@@ -5255,17 +4574,7 @@ class Parse:
                     # dumping the CF values in the C matrix
                     C.update(pd.DataFrame(CFs).T)
 
-            # EXIOBASE land occupation in km2 while IW in m2, so we convert
-            C.loc[:, [i for i in C.columns if 'Land' in i[0]]] *= 1000000
-            # EXIOBASE energy flows in TJ while IW in MJ, so we convert
-            C.loc[:, 'Fossil and nuclear energy use'] = C.loc[:, 'Fossil and nuclear energy use'].values * 1000000
-            if exio_version == '3.9':
-                C.loc[:, 'Domestic Extraction Used - Fossil Fuels - Natural gas'] /= 0.7 #0.7=density of natural gas
-            # EXIOBASE mineral flows in kt while IW in kg, so we convert
-            C.loc[:, 'Mineral resources use'] = C.loc[:, 'Mineral resources use'].values * 1000000
-
-            # EXIOBASE water flows in Mm3 while IW in m3, so we convert
-            C.loc[:, [i for i in C.columns if 'Water' in i[0]]] *= 1000000
+            convert_exiobase_units(C, exio_version)
             # more common to have impact categories as index
             C = C.T
             # keep same index format as previously
@@ -5293,39 +4602,32 @@ class Parse:
         for exio_iw in [self.exio_iw_38, self.exio_iw_39]:
 
             # loading the file with metal content information (obtained from the EXIOBASE team)
-            metal_concentration_exiobase = pd.read_csv(pkg_resources.resource_filename(
-                __name__, 'Data/metadata/exiobase/All_factors_applied_to_Exiobase_metals_minerals.csv'), sep=';')
+            metal_concentration_exiobase = self.read_data_file(
+                'Data/metadata/exiobase/All_factors_applied_to_Exiobase_metals_minerals.csv', sep=';')
 
             # extracting the average amount of metal per ore from this file
             average_gold_per_ore = metal_concentration_exiobase.loc[
-                [i for i in metal_concentration_exiobase.index if
-                 'Gold' in metal_concentration_exiobase.CommodityName[i] and
-                 'Global average\r' in metal_concentration_exiobase.UsedComment[i]]].Concentration.mean()
+                mask_contains(metal_concentration_exiobase, 'CommodityName', 'Gold') &
+                mask_contains(metal_concentration_exiobase, 'UsedComment', 'Global average\r')].Concentration.mean()
             average_lead_per_ore = metal_concentration_exiobase.loc[
-                [i for i in metal_concentration_exiobase.index if
-                 'Lead' in metal_concentration_exiobase.CommodityName[i]]].Concentration.mean()
+                mask_contains(metal_concentration_exiobase, 'CommodityName', 'Lead')].Concentration.mean()
             average_copper_per_ore = metal_concentration_exiobase.loc[
-                [i for i in metal_concentration_exiobase.index if
-                 'opper' in metal_concentration_exiobase.CommodityName[i]]].Concentration.mean()
+                mask_contains(metal_concentration_exiobase, 'CommodityName', 'opper')].Concentration.mean()
             average_silver_per_ore = metal_concentration_exiobase.loc[
-                [i for i in metal_concentration_exiobase.index if
-                 'Silver' in metal_concentration_exiobase.CommodityName[i] and
-                 'Global average\r' in metal_concentration_exiobase.UsedComment[i]]].Concentration.mean()
+                mask_contains(metal_concentration_exiobase, 'CommodityName', 'Silver') &
+                mask_contains(metal_concentration_exiobase, 'UsedComment', 'Global average\r')].Concentration.mean()
             average_iron_per_ore = metal_concentration_exiobase.loc[
-                [i for i in metal_concentration_exiobase.index if
-                 'Iron' in metal_concentration_exiobase.CommodityName[i] and
-                 'Global average\r' in metal_concentration_exiobase.UsedComment[i]]].Concentration.mean()
+                mask_contains(metal_concentration_exiobase, 'CommodityName', 'Iron') &
+                mask_contains(metal_concentration_exiobase, 'UsedComment', 'Global average\r')].Concentration.mean()
             average_nickel_per_ore = metal_concentration_exiobase.loc[
-                [i for i in metal_concentration_exiobase.index if
-                 'Nickel' in metal_concentration_exiobase.CommodityName[i] and
-                 'Global average\r' in metal_concentration_exiobase.UsedComment[i]]].Concentration.mean()
+                mask_contains(metal_concentration_exiobase, 'CommodityName', 'Nickel') &
+                mask_contains(metal_concentration_exiobase, 'UsedComment', 'Global average\r')].Concentration.mean()
             average_zinc_per_ore = metal_concentration_exiobase.loc[
-                [i for i in metal_concentration_exiobase.index if
-                 'Zinc' in metal_concentration_exiobase.CommodityName[i]]].Concentration.mean()
+                mask_contains(metal_concentration_exiobase, 'CommodityName', 'Zinc')].Concentration.mean()
             average_pgm_per_ore = metal_concentration_exiobase.loc[
-                [i for i in metal_concentration_exiobase.index if
-                 'Platinum-group (PGM)' in metal_concentration_exiobase.CommodityName[i] and
-                 'By-products of other ore' in metal_concentration_exiobase.UsedComment[i]]].UsedFactor.mean()
+                mask_contains(metal_concentration_exiobase, 'CommodityName', 'Platinum-group (PGM)') &
+                mask_contains(metal_concentration_exiobase, 'UsedComment',
+                              'By-products of other ore')].UsedFactor.mean()
 
             df = self.master_db_carbon_neutrality.copy()
             df = df.set_index(['Elem flow name', 'Compartment', 'Sub-compartment'])
@@ -5351,13 +4653,12 @@ class Parse:
                     average_pgm_per_ore * df.loc[('Platinum', 'Raw', 'in ground'), 'CF value'].iloc[0] * 1000000)
 
             # loading the file describing which metals EXIOBASE includes in their other non-ferrous metals flow
-            other_categories_composition = pd.read_excel(pkg_resources.resource_filename(
-                __name__, 'Data/mappings/exiobase/Mineral_extension_exio_detailed_2016.xlsx'))
+            other_categories_composition = self.read_data_file(
+                'Data/mappings/exiobase/Mineral_extension_exio_detailed_2016.xlsx')
 
             # identify non ferrous metals among the list of mineral resources
-            other_non_ferrous_metals_index = [i for i in other_categories_composition.index if
-                                              'Other non-ferrous metal ores' in
-                                              other_categories_composition.PhysicalTypeName[i]]
+            other_non_ferrous_metals_index = mask_contains(other_categories_composition, 'PhysicalTypeName',
+                                                           'Other non-ferrous metal ores')
             # delete duplicated other non ferrous metals identified
             other_non_ferrous_metals = other_categories_composition.loc[other_non_ferrous_metals_index].groupby(
                 other_categories_composition.CommodityName).head(1)
@@ -5370,9 +4671,9 @@ class Parse:
                 # if we can find a global average value pick it
                 try:
                     average_metal_content = metal_concentration_exiobase.loc[
-                        [i for i in metal_concentration_exiobase.index if
-                         metal in metal_concentration_exiobase.CommodityName[i] and
-                         'Global average' in metal_concentration_exiobase.UsedComment[i]]].Concentration.mean()
+                        mask_contains(metal_concentration_exiobase, 'CommodityName', metal) &
+                        mask_contains(metal_concentration_exiobase, 'UsedComment',
+                                      'Global average')].Concentration.mean()
                 except TypeError:
                     pass
                 # if we didn't have a match
@@ -5380,9 +4681,9 @@ class Parse:
                     # try with By-product of other ores
                     try:
                         average_metal_content = metal_concentration_exiobase.loc[
-                            [i for i in metal_concentration_exiobase.index if
-                             metal in metal_concentration_exiobase.CommodityName[i] and
-                             'By-product of other ores' in metal_concentration_exiobase.UsedComment[i]]].UsedFactor.mean()
+                            mask_contains(metal_concentration_exiobase, 'CommodityName', metal) &
+                            mask_contains(metal_concentration_exiobase, 'UsedComment',
+                                          'By-product of other ores')].UsedFactor.mean()
                     except TypeError:
                         pass
                 # if for whatever reason we have a completely ridiculous concentration drop it
@@ -5393,15 +4694,15 @@ class Parse:
             # use 0.001 as default value
             other_non_ferrous_metals = other_non_ferrous_metals.fillna(0.001)
 
-            abundance = pd.read_excel(pkg_resources.resource_filename(
-                __name__, 'Data/metadata/exiobase/USGS_extraction_volumes.xlsx'), 'metals')
+            abundance = self.read_data_file('Data/metadata/exiobase/USGS_extraction_volumes.xlsx',
+                                            sheet_name='metals')
             abundance.set_index('Unnamed: 0', inplace=True)
             abundance /= abundance.sum()
             assert (other_non_ferrous_metals.index == abundance.index).all()
             other_non_ferrous_metals.loc[:, 'Ore abundance'] = abundance.values
 
-            other_metal_concordance = pd.read_excel(pkg_resources.resource_filename(
-                __name__, 'Data/mappings/exiobase/other_metals_matching.xlsx')).drop('comments', axis=1)
+            other_metal_concordance = self.read_data_file(
+                'Data/mappings/exiobase/other_metals_matching.xlsx').drop('comments', axis=1)
             other_metal_concordance.set_index('Unnamed: 0', inplace=True)
             other_metal_concordance.dropna(inplace=True)
 
@@ -5422,8 +4723,7 @@ class Parse:
 
             # first we identify which mineral are part of "other minerals"
             other_minerals = other_categories_composition.loc[
-                [i for i in other_categories_composition.index if
-                 'Other minerals' in other_categories_composition.PhysicalTypeName[i]]].groupby(
+                mask_contains(other_categories_composition, 'PhysicalTypeName', 'Other minerals')].groupby(
                 other_categories_composition.CommodityName).head(1).drop(
                 ['PhysicalTypeName', 'ProductTypeCode', 'CountryCode', 'ISOAlpha2', 'AccountingYear'], axis=1)
             other_minerals.index = other_minerals.CommodityName
@@ -5449,8 +4749,8 @@ class Parse:
                 df.loc[('Pumice', 'Raw', 'in ground'), 'CF value'].iloc[0]
             other_minerals.loc['Calcite', 'CF'] = df.loc[('Calcite', 'Raw', 'in ground'), 'CF value'].iloc[0]
 
-            abundance_minerals = pd.read_excel(pkg_resources.resource_filename(
-                __name__, 'Data/metadata/exiobase/USGS_extraction_volumes.xlsx'), 'minerals')
+            abundance_minerals = self.read_data_file(
+                'Data/metadata/exiobase/USGS_extraction_volumes.xlsx', sheet_name='minerals')
 
             # Include those in the dataframe containing all intel on other minerals
             other_minerals = pd.concat([other_minerals, abundance_minerals.set_index('CommodityName')], axis=1)
@@ -5464,15 +4764,30 @@ class Parse:
 
     def get_simplified_versions(self, bw_only:bool):
         if not bw_only:
-            # SimaPro
-            self.simplified_version_sp = clean_up_dataframe(
-                produce_simplified_version(self.iw_sp_carbon_neutrality).reindex(
-                    self.iw_sp_carbon_neutrality.columns, axis=1))
+            self.get_simplified_sp_and_olca_versions()
+        self.get_simplified_ei_versions()
 
-            # openLCA
-            self.simplified_version_olca = clean_up_dataframe(
-                produce_simplified_version(self.olca_iw_carbon_neutrality).reindex(
-                self.olca_iw_carbon_neutrality.columns, axis=1))
+    def get_simplified_sp_and_olca_versions(self):
+        """
+        Footprint versions of the SimaPro and openLCA CFs.
+        :return:
+        """
+
+        # SimaPro
+        self.simplified_version_sp = clean_up_dataframe(
+            produce_simplified_version(self.iw_sp_carbon_neutrality).reindex(
+                self.iw_sp_carbon_neutrality.columns, axis=1))
+
+        # openLCA
+        self.simplified_version_olca = clean_up_dataframe(
+            produce_simplified_version(self.olca_iw_carbon_neutrality).reindex(
+            self.olca_iw_carbon_neutrality.columns, axis=1))
+
+    def get_simplified_ei_versions(self):
+        """
+        Footprint versions of the ecoinvent CFs.
+        :return:
+        """
 
         # ecoinvent
         self.simplified_version_ei310 = clean_up_dataframe(
@@ -5954,13 +5269,12 @@ def produce_simplified_version(complete_dataframe):
                      'Terrestrial ecotoxicity, long term', 'Total human health', 'Total ecosystem quality']
 
     # dropping midpoint_drop
-    simplified_version.drop([i for i in simplified_version.index if (
-            simplified_version.loc[i, 'Impact category'] in midpoint_drop and
-            simplified_version.loc[i, 'MP or Damage'] == 'Midpoint')],
-                            inplace=True)
+    simplified_version.drop(simplified_version.index[
+        mask_isin(simplified_version, 'Impact category', midpoint_drop) &
+        mask_eq(simplified_version, 'MP or Damage', 'Midpoint')], inplace=True)
     # dropping endpoint_drop
-    simplified_version.drop([i for i in simplified_version.index if
-                             simplified_version.loc[i, 'Impact category'] in endpoint_drop], inplace=True)
+    simplified_version.drop(simplified_version.index[
+        mask_isin(simplified_version, 'Impact category', endpoint_drop)], inplace=True)
     # storing the cas number to put them back at the end
     cas = simplified_version[['Elem flow name', 'CAS number']].drop_duplicates().set_index('Elem flow name').to_dict()[
         'CAS number']
@@ -6021,19 +5335,920 @@ def produce_simplified_version(complete_dataframe):
 
     simplified_version = clean_up_dataframe(simplified_version)
 
-    simplified_version.loc[[i for i in simplified_version.index if simplified_version.loc[i, 'Impact category'] ==
-                            'Climate change, short term'], 'Impact category'] = 'Carbon footprint'
-    simplified_version.loc[[i for i in simplified_version.index if simplified_version.loc[i, 'Impact category'] ==
-                            'Water scarcity'], 'Impact category'] = 'Water footprint - Scarcity'
-    simplified_version.loc[[i for i in simplified_version.index if simplified_version.loc[i, 'Impact category'] ==
-                            'Fossil and nuclear energy use'], 'Impact category'] = 'Energetic resource depletion'
+    simplified_version.loc[mask_eq(simplified_version, 'Impact category', 'Climate change, short term'),
+                           'Impact category'] = 'Carbon footprint'
+    simplified_version.loc[mask_eq(simplified_version, 'Impact category', 'Water scarcity'),
+                           'Impact category'] = 'Water footprint - Scarcity'
+    simplified_version.loc[mask_eq(simplified_version, 'Impact category', 'Fossil and nuclear energy use'),
+                           'Impact category'] = 'Energetic resource depletion'
 
     return simplified_version
 
 
+def convert_exiobase_units(C, exio_version):
+    """
+    Converts the CFs linked to the environmental extensions of EXIOBASE (see Parse.link_to_exiobase()) from the units
+    of IW+ to the units of the extensions.
+    :param C: dataframe of the CFs, with the extensions as index and (impact category, CF unit) as columns, modified
+              in place
+    :param exio_version: the version of EXIOBASE, '3.8' or '3.9'
+    :return: the converted dataframe
+    """
+    # EXIOBASE land occupation in km2 while IW in m2, so we convert
+    C.loc[:, [i for i in C.columns if 'Land' in i[0]]] *= 1000000
+    # EXIOBASE energy flows in TJ while IW in MJ, so we convert
+    C.loc[:, 'Fossil and nuclear energy use'] = C.loc[:, 'Fossil and nuclear energy use'].values * 1000000
+    if exio_version == '3.9':
+        # the natural gas extension is a row of C, all its CFs are converted
+        C.loc['Domestic Extraction Used - Fossil Fuels - Natural gas'] /= 0.7 #0.7=density of natural gas
+    # EXIOBASE mineral flows in kt while IW in kg, so we convert
+    C.loc[:, 'Mineral resources use'] = C.loc[:, 'Mineral resources use'].values * 1000000
+
+    # EXIOBASE water flows in Mm3 while IW in m3, so we convert
+    C.loc[:, [i for i in C.columns if 'Water' in i[0]]] *= 1000000
+    return C
+
+
 def clean_up_dataframe(df):
     # remove duplicates
     df = df.drop_duplicates()
     # fix index
     df = df.reset_index().drop('index', axis=1)
     return df
+
+
+def hash_sql_table(conn, table):
+    """
+    Hashes the content of a table of the SQLite database, used to detect changes in the inputs of load_cfs().
+    :param conn: connection to the SQLite database
+    :param table: name of the table
+    :return: hexadecimal digest
+    """
+    h = hashlib.sha256(table.encode())
+    cursor = conn.execute('SELECT * FROM [' + table + ']')
+    h.update(repr([column[0] for column in cursor.description]).encode())
+    for row in cursor:
+        h.update(repr(row).encode())
+    return h.hexdigest()
+
+
+def hash_file(path):
+    """
+    Hashes the content of a file. Missing files get a constant hash so that their later addition is detected.
+    :param path: path of the file
+    :return: hexadecimal digest
+    """
+    h = hashlib.sha256()
+    if not os.path.exists(path):
+        h.update(b'missing')
+        return h.hexdigest()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_dataframe(data):
+    """
+    Hashes the content of a dataframe replacing a data file (see Parse.data_files).
+    :param data: the dataframe, or dictionary of dataframes for several sheets
+    :return: hexadecimal digest
+    """
+    h = hashlib.sha256()
+    for sheet, df in (sorted(data.items()) if isinstance(data, dict) else [(None, data)]):
+        h.update(repr((sheet, list(df.columns))).encode())
+        h.update(pd.util.hash_pandas_object(df).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode='wb', opener=open, **kwargs):
+    """
+    Context manager opening a temporary file that replaces the file at path once it is completely written, so that an
+    interrupted run (or another process reading the file) never sees a partially written file.
+    :param path: path of the file
+    :param mode: mode in which the file is opened, e.g., 'w' for text
+    :param opener: function opening the file, e.g., bz2.open for a compressed file
+    :param kwargs: other arguments of opener, e.g., encoding
+    :return: the temporary file object
+    """
+    # the temporary file is specific to the process, several processes may write the same file
+    temporary = path + '.' + str(os.getpid()) + '.tmp'
+    try:
+        with opener(temporary, mode, **kwargs) as f:
+            yield f
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+# data files (mappings, metadata) already parsed by the process, see read_data_file()
+parsed_data_files = {}
+
+
+def read_data_file(file, cache_dir=None, **kwargs):
+    """
+    Reads an Excel or csv file of the Data folder once per process. Parsing an Excel file being slow, the parsed data
+    can also be stored as a pickle in cache_dir, named after the hash of the content of the file, so that the next runs
+    only parse the files that changed. Nothing is written to the package or read from it other than the file itself.
+    :param file: path of the file in the package, e.g., '/Data/mappings/SP/sp_mapping.xlsx'
+    :param cache_dir: optional folder where the parsed data is stored, e.g., the cache_dir of Parse
+    :param kwargs: arguments of pd.read_excel() or pd.read_csv(), e.g., sheet_name=None for all the sheets
+    :return: dataframe (or dictionary of dataframes for several sheets) that the caller is free to modify
+    """
+    key = (file.lstrip('/'), tuple(sorted(kwargs.items())))
+    if key not in parsed_data_files:
+        path = pkg_resources.resource_filename(__name__, key[0])
+        cache_path = None
+        if cache_dir:
+            # the pickles of the file read with the same arguments share a prefix, the ones of former versions of the
+            # file are removed when a new one is stored
+            folder = os.path.join(cache_dir, 'data_files')
+            prefix = os.path.basename(path) + '.' + hashlib.sha256(repr(key).encode()).hexdigest()[:8] + '.'
+            cache_path = os.path.join(folder, prefix + hash_file(path)[:16] + '.pickle')
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, 'rb') as f:
+                parsed_data_files[key] = pickle.load(f)
+        else:
+            if path.endswith('.csv'):
+                parsed_data_files[key] = pd.read_csv(path, **kwargs)
+            else:
+                parsed_data_files[key] = pd.read_excel(path, **kwargs)
+            if cache_path:
+                os.makedirs(folder, exist_ok=True)
+                for name in os.listdir(folder):
+                    if name.startswith(prefix) and name.endswith('.pickle'):
+                        os.remove(os.path.join(folder, name))
+                with atomic_write(cache_path) as f:
+                    pickle.dump(parsed_data_files[key], f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    data = parsed_data_files[key]
+    if isinstance(data, dict):
+        return {sheet: df.copy() for sheet, df in data.items()}
+    return data.copy()
+
+
+# connection to the SQLite database of a process running loaders, and the tables it read (see SourceTables)
+loader_worker_conn = None
+loader_worker_tables = None
+
+
+def connect_loader_worker(path_access_db):
+    """
+    Initializer of the processes running the loaders: each process opens its own connection to the SQLite database.
+    :param path_access_db: path to the SQLite database
+    :return:
+    """
+    global loader_worker_conn, loader_worker_tables
+    loader_worker_conn = sqlite3.connect(path_access_db)
+    loader_worker_tables = SourceTables(loader_worker_conn)
+
+
+def run_loader(loader):
+    """
+    Runs a loader of Parse in a process initialized by connect_loader_worker().
+    :param loader: name of the load_*_cfs method to run
+    :return: the CFs produced by the loader, see loader_fragments()
+    """
+    return loader_fragments(loader, logging.getLogger('IW_Reborn'), loader_worker_conn, loader_worker_tables)
+
+
+def loader_fragments(loader, logger, conn, tables):
+    """
+    Runs a loader of Parse on its own and returns the CFs it produced as it produced them, i.e., the dataframe assigned
+    to master_db (load_basic_cfs()) or the dataframes appended with add_to_master_db(). They are not concatenated
+    here: concatenating them on their own could change the dtype of their columns (e.g., 0 becoming 0.0), they are
+    only concatenated with the rest of master_db, as in a serial run.
+    :param loader: name of the load_*_cfs method to run
+    :param logger: logger of the loader
+    :param conn: connection to the SQLite database
+    :param tables: SourceTables of the connection, shared by the loaders run by the process
+    :return: list of the dataframes of CFs, see Parse.add_loader_output()
+    """
+    # the loaders only need the connection, the logger and master_db, the rest of __init__ is skipped
+    parser = Parse.__new__(Parse)
+    parser.logger = logger
+    parser.conn = conn
+    parser.tables = tables
+    empty = pd.DataFrame()
+    parser.master_db = empty
+    getattr(parser, loader)()
+    return ([] if parser._master_db is empty else [parser._master_db]) + parser.master_db_fragments
+
+
+def run_bw_project(state, step, project, *args):
+    """
+    Runs a step of the brightway export for one brightway project, in a process of Parse.run_bw_projects(). The logs
+    of the step are collected to be forwarded to the logger of the parent process.
+    :param state: attributes of the parser, as given by Parse.bw_project_state()
+    :param step: name of the method to run
+    :param project: name of the brightway project
+    :param args: other arguments of the step
+    :return: the result of the step, the log records of the step
+    """
+    parser = Parse.__new__(Parse)
+    parser.__dict__.update(state)
+    records = queue.SimpleQueue()
+    parser.logger = logging.getLogger('IW_Reborn')
+    parser.logger.setLevel(logging.INFO)
+    parser.logger.handlers = [logging.handlers.QueueHandler(records)]
+    parser.logger.propagate = False
+    result = getattr(parser, step)(project, *args)
+    return result, [records.get() for _ in range(records.qsize())]
+
+
+def compact_dataframes(dfs, columns=CATEGORICAL_COLUMNS):
+    """
+    Converts the given columns of the dataframes to categoricals. The categories of a column are shared by all the
+    dataframes, so that their codes are comparable and concatenating them keeps the categorical dtype. The dataframes
+    are modified in place, column by column, so that only the converted column exists twice at any time instead of
+    copies of all the dataframes.
+    :param dfs: list of dataframes
+    :param columns: the columns to convert, when present in the dataframes
+    :return: the list of compacted dataframes
+    """
+    dtypes = {}
+    for column in columns:
+        categories = set()
+        for df in dfs:
+            if column in df.columns:
+                categories.update(df[column].dropna().unique())
+        dtypes[column] = pd.CategoricalDtype(sorted(categories, key=str))
+
+    for df in dfs:
+        for column in columns:
+            if column in df.columns:
+                df[column] = df[column].astype(object).astype(dtypes[column])
+    return dfs
+
+
+# ---------------------------------------------- Row selection -------------------------------------------------------
+# The following functions return boolean numpy masks selecting the rows of a dataframe, to be combined with &, | and ~
+# and used with .loc, e.g. df.loc[mask_eq(df, 'CF unit', 'DALY') & ~mask_contains(df, 'Elem flow name', 'agri')]
+
+def mask_eq(df, column, value):
+    """
+    :param df: the dataframe
+    :param column: the column tested
+    :param value: the value searched
+    :return: mask of the rows where column is equal to value
+    """
+    return (df[column] == value).to_numpy(dtype=bool)
+
+
+def mask_isin(df, column, values):
+    """
+    :param df: the dataframe
+    :param column: the column tested
+    :param values: the values searched
+    :return: mask of the rows where column is one of values
+    """
+    return df[column].isin(values).to_numpy(dtype=bool)
+
+
+def mask_contains(df, column, substrings, case=True):
+    """
+    :param df: the dataframe
+    :param column: the column tested, containing strings
+    :param substrings: a substring or a list of substrings
+    :param case: if False, the search is case insensitive
+    :return: mask of the rows where column contains (one of) the substring(s)
+    """
+    if isinstance(substrings, str):
+        substrings = [substrings]
+    if not case:
+        substrings = [substring.lower() for substring in substrings]
+        return mask_values(df[column], lambda value: any(substring in value.lower() for substring in substrings))
+    return mask_values(df[column], lambda value: any(substring in value for substring in substrings))
+
+
+def mask_region(df, column, regions):
+    """
+    :param df: the dataframe
+    :param column: the column tested, containing regionalized names such as "Ammonia, RER"
+    :param regions: a region or a list of regions
+    :return: mask of the rows where the last element of column (after ', ') is (one of) the region(s)
+    """
+    if isinstance(regions, str):
+        regions = [regions]
+    regions = set(regions)
+    return mask_values(df[column], lambda value: value.split(', ')[-1] in regions)
+
+
+def mask_values(series, predicate):
+    """
+    Evaluates a predicate once per distinct value of the series instead of once per row. Missing values are never
+    selected.
+    :param series: the series tested
+    :param predicate: function taking a value and returning a boolean
+    :return: mask of the rows for which the predicate is True
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # the predicate is evaluated once per category of the tables compacted by compact_dataframes()
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    # codes of missing values are -1, i.e., the last element appended
+    selected = np.array([bool(predicate(value)) for value in uniques] + [False])
+    return selected[codes]
+
+
+# ------------------------------------------------ Name mapping ------------------------------------------------------
+def map_names(df, mapping, source, target, column='Elem flow name'):
+    """
+    Links the names of a column to the names of another nomenclature in a single merge. Names mapped to a single name
+    are replaced, rows of names mapped to several names (e.g., "Zinc" to all the zinc elementary flows of ecoinvent)
+    are kept and copied once per mapped name. Replacements happen first, so a replaced name that is itself mapped to
+    several names gets copied too (e.g., "Aluminum" -> "Aluminium" -> "Aluminium, in ground").
+    :param df: dataframe of CFs
+    :param mapping: dataframe with the mapped names in its source and target columns
+    :param source: column of mapping with the names of df
+    :param target: column of mapping with the names of the other nomenclature
+    :param column: column of df with the names to map
+    :return: dataframe with the mapped names, without duplicates
+    """
+    pairs = mapping.loc[:, [source, target]].dropna().drop_duplicates()
+    one_to_many = pairs.loc[:, source].duplicated(False)
+    replaced = dict(zip(pairs.loc[~one_to_many, source], pairs.loc[~one_to_many, target]))
+
+    df = df.copy()
+    df[column] = df[column].replace(replaced)
+    copies = df.merge(pairs.loc[one_to_many], left_on=column, right_on=source)
+    copies[column] = copies[target]
+
+    return clean_up_dataframe(pd.concat([df, copies.loc[:, df.columns]]))
+
+
+# --------------------------------------------- ecoinvent versions ---------------------------------------------------
+def ei_version_key(version):
+    """
+    :param version: version of ecoinvent as written in the mappings, e.g., '3.10', 3.11, '3.7.1' or '3.5 or earlier'
+    :return: the version as an integer, which compares as versions do, e.g., 3010000 for '3.10' > 3009000 for '3.9'
+    """
+    return sum(int(part) * 1000 ** (2 - i) for i, part in enumerate(str(version).split(' ')[0].split('.')))
+
+
+def select_ei_version(df, ei_version):
+    """
+    Selects the CFs available in an ecoinvent version from a table of all the versions, i.e., the CFs of the elementary
+    flows introduced in this version or an earlier one (column 'introduced in ei v.', holding the ei_version_key() of
+    the version, empty if always available).
+    :param df: the CF table of all the versions, e.g., Parse.ei_iw
+    :param ei_version: the ecoinvent version, e.g., '3.10'
+    :return: the CF table of the version, without the column 'introduced in ei v.'
+    """
+    if 'introduced in ei v.' not in df.columns:
+        return df
+    # the keys are numbers, compared at once, and the flows always available (NaN) are never introduced later
+    available = ~(df.loc[:, 'introduced in ei v.'] > ei_version_key(ei_version)).values
+    return df.loc[available, [column for column in df.columns if column != 'introduced in ei v.']]
+
+
+# ------------------------------------------- Weighted aggregation ---------------------------------------------------
+def weighted_group_average(df, value, weight, key=None, rows=None):
+    """
+    Weighted average of a column computed for every group of rows at once with groupby, e.g., the population-weighted
+    CF of the cities of each country.
+    :param df: the native table
+    :param value: the column averaged
+    :param weight: the column of the weights, or a series aligned on df
+    :param key: the column defining the groups, None for a single group of all the rows (labelled 'GLO')
+    :param rows: mask of the rows averaged, all rows if None
+    :return: series of the weighted averages indexed by group
+    """
+    weights = df.loc[:, weight] if isinstance(weight, str) else weight
+    if rows is not None:
+        df, weights = df.loc[rows], weights.loc[rows]
+    groups = df.loc[:, key] if key is not None else pd.Series('GLO', index=df.index)
+    contributions = df.loc[:, value] * weights / weights.groupby(groups).transform('sum')
+    return contributions.groupby(groups).sum().rename(value)
+
+
+def aggregate_hierarchy(df, value, weight, rows, hierarchy):
+    """
+    Aggregates a column from the lowest level of a geographical hierarchy (e.g., cities) to each of its higher levels
+    (e.g., country -> sub-continent -> continent -> GLO) with weighted averages. Rows of a level whose group contains
+    none of the aggregated rows get 0, as the sum of an empty selection.
+    :param df: the native table, updated in place
+    :param value: the column aggregated
+    :param weight: the column of the weights, or a series aligned on df
+    :param rows: mask of the rows of the lowest level
+    :param hierarchy: list of (key, target) tuples, key being the column grouping the rows for that level (None for
+                      the global level) and target the mask of the rows of that level
+    """
+    for key, target in hierarchy:
+        averages = weighted_group_average(df, value, weight, key, rows)
+        if key is None:
+            df.loc[target, value] = averages.get('GLO', 0)
+        else:
+            target = target & df.loc[:, key].notna().to_numpy()
+            df.loc[target, value] = df.loc[target, key].map(averages).fillna(0)
+
+
+def first_row_per_value(df, column):
+    """
+    :param df: the dataframe
+    :param column: the column looked up
+    :return: the first row of df for each value of column, indexed by these values
+    """
+    return df.dropna(subset=[column]).drop_duplicates(subset=[column]).set_index(column)
+
+
+# ------------------------------------------------ Water regions -----------------------------------------------------
+def expand_water_regions(data, mapping, column='ecoinvent_shortname'):
+    """
+    Expands AWARE regions to the ecoinvent regions they correspond to, with a single merge.
+    :param data: table with one row per AWARE region
+    :param mapping: the 'SI - Mapping with regions of ecoinvent' table
+    :param column: the column of data containing the AWARE regions
+    :return: data with one row per ecoinvent region in the column 'Region' (AWARE regions without correspondence are
+             kept as is)
+    """
+    regions = mapping.loc[:, ['AWARE', 'Ecoinvent_short_name']].dropna(subset=['AWARE'])
+    data = data.merge(regions, left_on=column, right_on='AWARE', how='left')
+    data.loc[:, 'Region'] = data.loc[:, 'Ecoinvent_short_name'].fillna(data.loc[:, column])
+    return data.drop(['AWARE', 'Ecoinvent_short_name'], axis=1)
+
+
+def water_resolution_scales(regions):
+    """
+    :param regions: series of ecoinvent regions
+    :return: array of the native geographical resolution scales of the regions, looked up once per distinct region
+    """
+    codes, uniques = pd.factorize(regions)
+    scales = []
+    for region in uniques:
+        scale = 'Country'
+        for candidate, pattern in WATER_SCALES:
+            if pattern.search(region):
+                scale = candidate
+        scales.append(scale)
+    # codes of missing values are -1, i.e., the last element appended
+    return np.array(scales + ['Country'], dtype=object)[codes]
+
+
+def add_water_flow_variants(df, rows):
+    """
+    Replaces the "Water" flows selected by the other water flows (lake, river, well, etc.) with a cross join.
+    :param df: the water CFs
+    :param rows: mask of the "Water" flows replaced
+    :return: df with the variants of the flows selected instead of these flows
+    """
+    variants = pd.DataFrame({'Variant': WATER_FLOW_VARIANTS}).merge(df.loc[rows], how='cross')
+    variants.loc[:, 'Elem flow name'] = [name.replace('Water', variant) for name, variant in
+                                         zip(variants.loc[:, 'Elem flow name'], variants.loc[:, 'Variant'])]
+    return clean_up_dataframe(pd.concat([df.loc[~rows], variants.drop('Variant', axis=1)]))
+
+
+# ------------------------------------------- Aggregated CF tables ---------------------------------------------------
+def aggregated_cfs_to_long(data, impact_category):
+    """
+    Turns an aggregated regionalized table (one row per region, one column per substance and CF unit) into the IW+
+    format in a single melt, driven by the column specification of the impact category in AGGREGATED_CF_TABLES.
+    :param data: the aggregated table
+    :param impact_category: the impact category of the table
+    :return: the CFs in the IW+ format, per region and then in the order of the specification
+    """
+    spec = AGGREGATED_CF_TABLES[impact_category]
+    columns = pd.DataFrame([('CF ' + molecule + ' (' + unit + ')', flow, cas, unit, level)
+                            for flow, cas, molecule in spec['substances']
+                            for unit, level in [(spec['midpoint unit'], 'Midpoint'), ('PDF.m2.yr', 'Damage')]],
+                           columns=['Column', 'Substance', 'CAS number', 'CF unit', 'MP or Damage'])
+
+    cfs = data.reset_index(drop=True).rename_axis('Row').reset_index().melt(
+        id_vars=['Row', 'Short name ecoinvent'], value_vars=columns.loc[:, 'Column'].tolist(), var_name='Column',
+        value_name='CF value')
+    # melt stacks the columns one after the other, a stable sort brings back the rows of each region together
+    cfs = cfs.sort_values('Row', kind='stable').merge(columns, on='Column', how='left')
+
+    cfs.loc[:, 'Impact category'] = impact_category
+    cfs.loc[:, 'Compartment'] = spec['compartment']
+    cfs.loc[:, 'Sub-compartment'] = '(unspecified)'
+    cfs.loc[:, 'Elem flow name'] = cfs.loc[:, 'Substance'] + ', ' + cfs.loc[:, 'Short name ecoinvent']
+    cfs.loc[:, 'Elem flow unit'] = 'kg'
+    cfs.loc[:, 'Native geographical resolution scale'] = 'Country'
+    cfs.loc[mask_region(cfs, 'Elem flow name', ['RNA', 'RLA', 'RER', 'RAS', 'RAF', 'RME', 'UN-OCEANIA']),
+            'Native geographical resolution scale'] = 'Continent'
+    cfs.loc[mask_region(cfs, 'Elem flow name', 'GLO'), 'Native geographical resolution scale'] = 'Global'
+    cfs.loc[mask_region(cfs, 'Elem flow name', spec['other regions']),
+            'Native geographical resolution scale'] = 'Other region'
+
+    return cfs.loc[:, ['Impact category', 'CF unit', 'Compartment', 'Sub-compartment', 'Elem flow name', 'CAS number',
+                       'CF value', 'Elem flow unit', 'MP or Damage', 'Native geographical resolution scale']]
+
+
+# ------------------------------------------------- Profiling --------------------------------------------------------
+def dataframe_rows(parser):
+    """
+    :param parser: a Parse object, or None
+    :return: number of rows of each non-empty dataframe of the object, master_db counting its pending fragments
+    """
+    if parser is None:
+        return {}
+    rows = {}
+    for name, value in parser.__dict__.items():
+        if isinstance(value, pd.DataFrame) and len(value):
+            rows[name.lstrip('_')] = len(value)
+    fragments = sum(len(df) for df in parser.__dict__.get('master_db_fragments', []))
+    if fragments:
+        rows['master_db'] = rows.get('master_db', 0) + fragments
+    return rows
+
+
+def peak_rss_mb():
+    """
+    :return: peak resident memory of the process since its start, in MB, None if it cannot be determined
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+# ------------------------------------------------ Output files ------------------------------------------------------
+def write_table(df, path, output_format='xlsx'):
+    """
+    Writes a CF table in one of the OUTPUT_FORMATS.
+    :param df: the CF table
+    :param path: path of the file, without extension
+    :param output_format: format of the file
+    :return: path of the file, with extension
+    """
+
+    path += OUTPUT_FORMATS[output_format]
+    if output_format == 'xlsx':
+        write_xlsx(df, path)
+    elif output_format == 'parquet':
+        stable_schema(df).to_parquet(path, index=False)
+    elif output_format == 'feather':
+        stable_schema(df).to_feather(path)
+    elif output_format == 'csv':
+        # without a modification time in the gzip header, unchanged tables give identical files
+        stable_schema(df).to_csv(path, index=False, compression={'method': 'gzip', 'mtime': 0})
+    return path
+
+
+def write_table_artifact(df, path, output_format='xlsx'):
+    """
+    Writes a CF table as a job of Parse.output_jobs().
+    :param df: the CF table
+    :param path: path of the file, without extension
+    :param output_format: format of the file
+    :return: dictionary with the number of rows of the table, with the path of the file as key
+    """
+
+    return {write_table(df, path, output_format): len(df)}
+
+
+def publish_staged_files(staging, path):
+    """
+    Moves the files written in a staging folder to their final folder. Each file replaces its previous version in a
+    single atomic rename, the manifest being moved last.
+    :param staging: the staging folder
+    :param path: the final folder
+    :return:
+    """
+
+    files = sorted(os.path.relpath(os.path.join(root, file), staging)
+                   for root, dirs, names in os.walk(staging) for file in names)
+    files.sort(key=lambda file: file == 'manifest.json')
+    for file in files:
+        os.makedirs(os.path.dirname(os.path.join(path, file)), exist_ok=True)
+        os.replace(os.path.join(staging, file), os.path.join(path, file))
+
+
+def stable_schema(df):
+    """
+    Gives a CF table a schema that only depends on its columns: categorical columns are stored as their values (their
+    categories would otherwise change the schema from one build to the next) and the index is dropped.
+    :param df: the CF table
+    :return: the CF table with a stable schema
+    """
+
+    return df.reset_index(drop=True).astype(
+        {column: object for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)})
+
+
+def write_xlsx(df, path):
+    """
+    Writes a CF table in an Excel file with the layout of DataFrame.to_excel(), i.e., with the index as first column.
+    Rows are written one at a time with the constant memory mode of xlsxwriter, so the memory used does not grow with
+    the size of the table (to_excel() writes the cells column by column and cannot use this mode).
+    :param df: the CF table
+    :param path: path of the file
+    :return:
+    """
+
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True, 'nan_inf_to_errors': True})
+    worksheet = workbook.add_worksheet()
+    header = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+    worksheet.write_row(0, 1, [str(column) for column in df.columns], header)
+    for n, row in enumerate(df.itertuples(name=None), start=1):
+        # missing values are left empty, as with to_excel()
+        worksheet.write_row(n, 0, [None if isinstance(value, float) and math.isnan(value) else value
+                                   for value in row])
+    workbook.close()
+
+
+def write_manifest(path, artifacts, **metadata):
+    """
+    Writes the manifest of the IW+ files, listing every file generated with its number of rows and its hash.
+    :param path: folder of the IW+ files, where manifest.json is written
+    :param artifacts: dictionary of the number of rows of the files, with their paths as keys
+    :param metadata: other information stored in the manifest, e.g., the version of IW+
+    :return:
+    """
+
+    manifest = dict(metadata, created=datetime.now().isoformat(timespec='seconds'), files=[
+        {'file': os.path.relpath(file, path).replace(os.sep, '/'), 'rows': rows, 'bytes': os.path.getsize(file),
+         'sha256': hash_file(file)} for file, rows in sorted(artifacts.items())])
+    with atomic_write(os.path.join(path, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+# -------------------------------------------------- SimaPro ---------------------------------------------------------
+def sp_impact_categories(df, method):
+    """
+    Lists the impact categories of a SimaPro method, in their order of appearance in the CF table.
+    :param df: CF table linked to SimaPro
+    :param method: type of the method, "midpoint", "damage", "combined" or "simplified"
+    :return: list of (name of the impact category in SimaPro, impact category, CF unit)
+    """
+
+    if method in ['midpoint', 'damage']:
+        # a single unit per impact category, the last one found
+        ic_unit = dict(df.loc[mask_eq(df, 'MP or Damage', method.capitalize()), ['Impact category', 'CF unit']]
+                       .drop_duplicates().itertuples(index=False, name=None))
+        return [(ic, ic, unit) for ic, unit in ic_unit.items()]
+
+    categories = []
+    for ic, unit in df.loc[:, ['Impact category', 'CF unit']].drop_duplicates().itertuples(index=False, name=None):
+        if method == 'combined' and ic in SAME_NAME_CATEGORIES:
+            categories.append((ic + (' (damage)' if unit in ['DALY', 'PDF.m2.yr'] else ' (midpoint)'), ic, unit))
+        else:
+            categories.append((ic, ic, unit))
+    return categories
+
+
+def sp_impact_category_rows(df, categories, blank_cas=True):
+    """
+    Generator of the rows of the impact categories of a SimaPro method: the header of each impact category, followed
+    by its substances. Only the substances of one impact category are converted to rows at a time.
+    :param df: CF table linked to SimaPro
+    :param categories: impact categories, as given by sp_impact_categories()
+    :param blank_cas: if True, missing CAS numbers are written as empty strings
+    :return: rows of the impact categories
+    """
+
+    rows = df.groupby(['Impact category', 'CF unit'], observed=True, sort=False).indices
+    for name, ic, unit in categories:
+        yield ['', '', '', '', '', '']
+        yield ['Impact category', '', '', '', '', '']
+        yield [name, unit, '', '', '', '']
+        yield ['', '', '', '', '', '']
+        yield ['Substances', '', '', '', '', '']
+        substances = df.iloc[rows.get((ic, unit), [])].loc[:, SP_SUBSTANCE_COLUMNS]
+        cas = substances.loc[:, 'CAS number'].astype(object)
+        if blank_cas:
+            cas = ['' if isinstance(number, float) else number for number in cas]
+        # csv accepts strings only
+        yield from zip(substances.loc[:, 'Compartment'], substances.loc[:, 'Sub-compartment'],
+                       substances.loc[:, 'Elem flow name'], cas, substances.loc[:, 'CF value'].astype(str),
+                       substances.loc[:, 'Elem flow unit'])
+
+
+# ----------------------------------------------- openLCA JSON-LD ----------------------------------------------------
+def olca_key(*args):
+    """
+    Derives a UUID from strings, the same way openLCA does (KeyGen): the lower-cased, stripped strings are joined with
+    "/" and hashed in a name-based UUID. Keys are thus stable from one run to the next.
+    :param args: strings identifying the object
+    :return: the UUID as a string
+    """
+
+    name = '/'.join(str(arg).strip().lower() for arg in args)
+    return str(uuid.UUID(bytes=hashlib.md5(name.encode('utf-8')).digest(), version=3))
+
+
+def olca_ref(olca_type, olca_id, **fields):
+    """
+    Creates the JSON-LD reference to an openLCA object.
+    :param olca_type: type of the object, e.g., "Flow"
+    :param olca_id: UUID of the object
+    :param fields: other fields of the reference, e.g., name
+    :return: dictionary of the reference
+    """
+
+    return {'@type': olca_type, '@id': olca_id, **fields}
+
+
+def olca_impact_factors(df, locations=None):
+    """
+    Creates the JSON-LD impact factors of the CFs of an impact category.
+    :param df: olca CFs of the impact category, with the "flow_id", "CF value" and "Location" columns
+    :param locations: optional dictionary of location codes to UUIDs. When given, CFs of the other locations are
+                      skipped. Otherwise, the UUIDs of the locations are derived from their codes.
+    :return: list of the impact factors, set of the skipped locations
+    """
+
+    codes = [code if isinstance(code, str) else None for code in df.loc[:, 'Location'].astype(object)]
+    undefined = set()
+    impact_factors = []
+    for flow_id, value, code in zip(df.loc[:, 'flow_id'], df.loc[:, 'CF value'].astype(float), codes):
+        impact_factor = {'@type': 'ImpactFactor', 'flow': olca_ref('Flow', flow_id), 'value': value}
+        # for regionalized impact categories, we need to add the location
+        if code is not None:
+            if locations is None:
+                impact_factor['location'] = olca_ref('Location', olca_key(code), code=code)
+            elif code in locations:
+                impact_factor['location'] = olca_ref('Location', locations[code], code=code)
+            else:
+                undefined.add(code)
+                continue
+        impact_factors.append(impact_factor)
+    return impact_factors, undefined
+
+
+def olca_location_ids(reference_zip):
+    """
+    Reads the UUIDs of the locations of a JSON-LD package exported from openLCA.
+    :param reference_zip: path of the JSON-LD package
+    :return: dictionary of location codes to UUIDs
+    """
+
+    locations = {}
+    with zipfile.ZipFile(reference_zip) as package:
+        for name in package.namelist():
+            if name.startswith('locations/') and name.endswith('.json'):
+                location = json.loads(package.read(name))
+                locations[location.get('code')] = location['@id']
+    return locations
+
+
+# ------------------------------------------------- brightway --------------------------------------------------------
+# indexes of the biosphere databases already read by the process, with their fingerprints as keys
+biosphere_indexes = {}
+
+
+def biosphere_fingerprint(biosphere_db_name):
+    """
+    Fingerprints a biosphere database of the current brightway project from its metadata, without reading its flows.
+    brightway updates the modification date of a database each time it is written, so the fingerprint changes with
+    the content of the database. Projects copied from one another share the fingerprint of their biosphere.
+    :param biosphere_db_name: name of the biosphere database
+    :return: hexadecimal digest
+    """
+
+    metadata = bd.databases[biosphere_db_name]
+    h = hashlib.sha256(str(BIOSPHERE_INDEX_VERSION).encode())
+    h.update(repr((biosphere_db_name, metadata.get('modified'), metadata.get('number'),
+                   len(bd.Database(biosphere_db_name)))).encode())
+    return h.hexdigest()
+
+
+def scan_biosphere_flows(biosphere_db_name):
+    """
+    Reads the name, compartment, sub-compartment and code of all the flows of a biosphere database.
+    :param biosphere_db_name: name of the biosphere database
+    :return: dataframe of the flows
+    """
+
+    rows = []
+    for flow in bd.Database(biosphere_db_name):
+        flow = flow.as_dict()
+        categories = flow['categories']
+        rows.append((flow['name'], categories[0], categories[1] if len(categories) == 2 else 'unspecified',
+                     flow['code']))
+    return pd.DataFrame(rows, columns=BIOSPHERE_INDEX_COLUMNS)
+
+
+def biosphere_flows_index(biosphere_db_name, cache_dir=None):
+    """
+    Returns the index of the flows of a biosphere database of the current brightway project. The index is kept in
+    memory and, if a cache_dir is given, stored there as one compressed array per column. The database is only scanned
+    when no index has the fingerprint of the database.
+    :param biosphere_db_name: name of the biosphere database
+    :param cache_dir: optional folder where the indexes are stored
+    :return: dataframe with the "Elem flow name", "Compartment", "Sub-compartment" and "code" of the flows
+    """
+
+    key = biosphere_fingerprint(biosphere_db_name)
+    if key not in biosphere_indexes:
+        path = os.path.join(cache_dir, 'biosphere_' + key[:16] + '.npz') if cache_dir else None
+        if path and os.path.exists(path):
+            with np.load(path) as arrays:
+                biosphere_indexes[key] = pd.DataFrame({column: arrays[column].astype(object)
+                                                       for column in BIOSPHERE_INDEX_COLUMNS})
+        else:
+            biosphere_indexes[key] = scan_biosphere_flows(biosphere_db_name)
+            if path:
+                os.makedirs(cache_dir, exist_ok=True)
+                with atomic_write(path) as f:
+                    np.savez_compressed(f, **{column: biosphere_indexes[key].loc[:, column].to_numpy(dtype=str)
+                                              for column in BIOSPHERE_INDEX_COLUMNS})
+    return biosphere_indexes[key].copy()
+
+
+def bw_characterization_factors(df, biosphere_db_name):
+    """
+    Creates the brightway CFs ((biosphere database, code), CF value) of all the impact categories of a dataframe in one
+    pass, instead of looking the CFs up one impact category at a time.
+    :param df: dataframe of CFs with the "Impact category", "CF unit", "code" and "CF value" columns
+    :param biosphere_db_name: name of the biosphere database of the brightway project
+    :return: dictionary of the lists of CFs, with (impact category, CF unit) as keys
+    """
+
+    cfs = list(zip(((biosphere_db_name, code) for code in df.loc[:, 'code']), df.loc[:, 'CF value'].tolist()))
+    rows = df.groupby(['Impact category', 'CF unit'], observed=True, sort=False).indices
+    return {ic: [cfs[i] for i in ix] for ic, ix in rows.items()}
+
+
+def current_biosphere_name():
+    """
+    :return: name of the biosphere database of the current brightway project, "biosphere3" with brightway2 or the
+             first database with "biosphere" in its name with brightway2.5
+    """
+
+    if 'biosphere3' in bd.databases:
+        return 'biosphere3'
+    return [i for i in bd.databases if 'biosphere' in i][0]
+
+
+def bw_biosphere_name(bw_version, ei_version):
+    """
+    Name of the biosphere database of brightway for an ecoinvent version, as created by the bw2io importers.
+    :param bw_version: the version of brightway, '2' or '2.5'
+    :param ei_version: the ecoinvent version, e.g., '3.10'
+    :return: name of the biosphere database
+    """
+
+    if bw_version == '2':
+        return 'biosphere3'
+    return 'ecoinvent-' + ei_version + '-biosphere'
+
+
+def write_bw2package(methods, path):
+    """
+    Writes brightway methods in a bw2package file, i.e., the bz2-compressed JSON read by
+    bw2io.package.BW2Package.import_file(). The methods have the fields and metadata written by
+    BW2Package.export_objs(), and are serialized with the JsonSanitizer of bw2data, as BW2Package does.
+    :param methods: list of (name, unit, CFs) of the methods to write
+    :param path: path of the bw2package file
+    :return: the number of CFs written
+    """
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    objs = [{'metadata': {'abbreviation': bd_ia_data_store.abbreviate(name), 'unit': unit, 'num_cfs': len(data)},
+             'name': tuple(name), 'class': {'module': 'bw2data.method', 'name': 'Method'},
+             'data': [(tuple(key), value) for key, value in data]} for name, unit, data in methods]
+    with atomic_write(path, 'wt', bz2.open, encoding='utf-8') as f:
+        json.dump(bd_serialization.JsonSanitizer.sanitize(objs), f, ensure_ascii=False)
+    return sum(len(data) for name, unit, data in methods)
+
+
+@contextlib.contextmanager
+def deferred_flush(store):
+    """
+    Context manager deferring the saves of a brightway metadata store (e.g., bd.methods) to a single one, at its exit.
+    brightway saves the whole metadata file of the project each time one of its entries changes, i.e., several times
+    per method written, so writing the hundreds of methods of IW+ saves the file thousands of times. The flush() of the
+    store is replaced by a no-op on the store object only while the context is open, and the store is saved at the exit
+    even if an error occurred, so that the file records all the methods written until then. brightway has a single
+    current project per process, and the brightway projects are exported in separate processes (see
+    Parse.run_bw_projects()), so a store is never written by several threads at once.
+    :param store: the metadata store, a bw2data SerializedDict
+    :return: the store
+    """
+
+    # an instance attribute is restored as it was, otherwise the flush() of the class of the store is used again
+    instance_flush = vars(store).get('flush')
+    flush = store.flush
+    store.flush = lambda: None
+    try:
+        yield store
+    finally:
+        if instance_flush is None:
+            del store.flush
+        else:
+            store.flush = instance_flush
+        flush()
+
+
+def write_bw_methods(methods):
+    """
+    Registers and writes brightway methods. brightway has no bulk API for methods, so each method is still registered,
+    written and processed on its own. Only the metadata file of the methods, which brightway saves entirely each time a
+    method is registered or written, is batched: it is saved once, after all the methods were written (see
+    deferred_flush()).
+    :param methods: list of (name, unit, CFs) of the methods to write
+    :return:
+    """
+
+    with deferred_flush(bd.methods):
+        for name, unit, data in methods:
+            new_method = bd.Method(name)
+            new_method.register()
+            new_method.metadata["unit"] = unit
+            new_method.write(data)
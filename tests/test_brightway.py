@@ -0,0 +1,86 @@
+import os
+import tempfile
+
+import pandas as pd
+import pytest
+
+# brightway stores its projects in BRIGHTWAY2_DIR, read when bw2data is imported
+os.environ.setdefault('BRIGHTWAY2_DIR', tempfile.mkdtemp())
+bw2data = pytest.importorskip('bw2data')
+
+import parse_iw
+
+PROJECT = 'parse_iw ecoinvent3.12'
+
+
+@pytest.fixture
+def project():
+    bw2data.projects.set_current(PROJECT)
+    biosphere = bw2data.Database('biosphere3')
+    biosphere.write({('biosphere3', code): {'name': name, 'categories': categories, 'unit': 'kilogram',
+                                            'type': 'emission'}
+                     for code, name, categories in [('co2', 'Carbon dioxide, fossil', ('air',)),
+                                                    ('ch4', 'Methane, fossil', ('air', 'urban air close to ground')),
+                                                    ('nh3', 'Ammonia', ('air',))]})
+    yield
+    for name in list(bw2data.methods):
+        bw2data.Method(name).deregister()
+    bw2data.projects.set_current('default')
+    bw2data.projects.delete_project(PROJECT, delete_dir=True)
+
+
+def test_write_bw_methods_flushes_methods_written_before_an_error(project):
+    methods = [(('IW+', 'Climate change'), 'kg CO2 eq', [(('biosphere3', 'co2'), 1), (('biosphere3', 'ch4'), 29.8)]),
+               (('IW+', 'Marine eutrophication'), 'kg N N-lim eq', [(('biosphere3', 'nh3'), 0.09)]),
+               # a CF without value, brightway fails when processing the method
+               (('IW+', 'Broken'), 'kg', [(('biosphere3', 'co2'),)]),
+               (('IW+', 'Never written'), 'kg', [(('biosphere3', 'co2'), 1)])]
+
+    with pytest.raises(IndexError):
+        parse_iw.write_bw_methods(methods)
+
+    # the flush of the metadata store is restored and the file on disk has every method registered before the error
+    assert 'flush' not in vars(bw2data.methods)
+    on_disk = bw2data.methods.deserialize()
+    assert on_disk == bw2data.methods.data
+    assert {('IW+', 'Climate change'), ('IW+', 'Marine eutrophication'), ('IW+', 'Broken')} == set(on_disk)
+    assert on_disk[('IW+', 'Climate change')]['unit'] == 'kg CO2 eq'
+    assert on_disk[('IW+', 'Climate change')]['num_cfs'] == 2
+    assert bw2data.Method(('IW+', 'Marine eutrophication')).load() == [(('biosphere3', 'nh3'), 0.09)]
+
+
+def test_bw2package_round_trip(project, tmp_path):
+    bw2io = pytest.importorskip('bw2io')
+    columns = ['Impact category', 'CF unit', 'Compartment', 'Sub-compartment', 'Elem flow name', 'CAS number',
+               'CF value', 'Elem flow unit', 'MP or Damage', 'Native geographical resolution scale', 'ID',
+               'introduced in ei v.']
+    ei_iw = pd.DataFrame([
+        ('Climate change, short term', 'kg CO2 eq (short)', 'air', 'unspecified', 'Carbon dioxide, fossil', '124-38-9',
+         1.0, 'kg', 'Midpoint', 'Global', 'co2', None),
+        ('Climate change, short term', 'kg CO2 eq (short)', 'air', 'urban air close to ground', 'Methane, fossil',
+         '74-82-8', 81.2, 'kg', 'Midpoint', 'Global', 'ch4', None),
+        # a flow unknown to the biosphere database of the project
+        ('Climate change, short term', 'kg CO2 eq (short)', 'air', 'unspecified', 'Carbon dioxide, new', None,
+         1.0, 'kg', 'Midpoint', 'Global', 'not-in-biosphere', None),
+        ('Climate change, human health, short term', 'DALY', 'air', 'unspecified', 'Carbon dioxide, fossil',
+         '124-38-9', 8.1e-7, 'kg', 'Damage', 'Global', 'co2', None),
+        ('Climate change, ecosystem quality, short term', 'PDF.m2.yr', 'air', 'unspecified', 'Carbon dioxide, fossil',
+         '124-38-9', 0.2, 'kg', 'Damage', 'Global', 'co2', None)], columns=columns)
+    parser = parse_iw.Parse(':memory:', '2.1', [PROJECT], '2')
+    parser.ei_iw = ei_iw
+    parser.ei_iw_carbon_neutrality = ei_iw.copy()
+    parser.simplified_version_ei312 = ei_iw.loc[[0, 1, 2]].assign(**{'Impact category': 'Carbon footprint'})
+
+    rows = parser.write_bw2packages(str(tmp_path), ['3.12'])
+
+    assert len(rows) == 3
+    for path in rows:
+        bw2io.BW2Package.import_file(path)
+    midpoint = ('IMPACT World+ Midpoint 2.1 for ecoinvent v3.12 (incl. CO2 uptake)', 'Midpoint',
+                'Climate change, short term')
+    assert bw2data.methods[midpoint]['unit'] == 'kg CO2 eq (short)'
+    assert sorted(bw2data.Method(midpoint).load()) == [(('biosphere3', 'ch4'), 81.2), (('biosphere3', 'co2'), 1.0)]
+    total_hh = ('IMPACT World+ Damage 2.1 for ecoinvent v3.12', 'Human health', 'Total human health')
+    assert bw2data.Method(total_hh).load() == [(('biosphere3', 'co2'), 8.1e-7)]
+    footprint = ('IMPACT World+ Footprint 2.1 for ecoinvent v3.12', 'Carbon footprint')
+    assert len(bw2data.Method(footprint).load()) == 2
@@ -0,0 +1,23 @@
+import glob
+import os
+
+import pandas as pd
+import pkg_resources
+
+import parse_iw
+
+FILE = 'Data/mappings/SP/sp_mapping.xlsx'
+
+
+def test_parsed_data_files_are_cached_in_cache_dir_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(parse_iw, 'parsed_data_files', {})
+    data = parse_iw.read_data_file(FILE, str(tmp_path))
+    pickles = glob.glob(str(tmp_path / 'data_files' / '*.pickle'))
+    assert len(pickles) == 1
+    data_folder = os.path.dirname(pkg_resources.resource_filename('parse_iw', FILE))
+    assert not glob.glob(os.path.join(data_folder, '.*.pickle'))
+
+    # a new process reads the pickle instead of the Excel file
+    monkeypatch.setattr(parse_iw, 'parsed_data_files', {})
+    monkeypatch.setattr(pd, 'read_excel', None)
+    pd.testing.assert_frame_equal(parse_iw.read_data_file(FILE, str(tmp_path)), data)
@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+
+import parse_iw
+
+NATURAL_GAS = 'Domestic Extraction Used - Fossil Fuels - Natural gas'
+CRUDE_OIL = 'Domestic Extraction Used - Fossil Fuels - Crude oil'
+
+
+def cfs():
+    columns = pd.MultiIndex.from_tuples([('Climate change, short term', 'kg CO2 eq (short)'),
+                                         ('Fossil and nuclear energy use', 'MJ deprived'),
+                                         ('Land occupation, biodiversity', 'PDF.m2.yr'),
+                                         ('Mineral resources use', 'kg deprived'),
+                                         ('Water scarcity', 'm3 world-eq')], names=['Impact category', 'CF unit'])
+    return pd.DataFrame([[2.0, 40.0, 0.0, 0.0, 0.0], [3.0, 50.0, 0.0, 0.0, 0.0], [0.0, 0.0, 0.5, 0.2, 0.1]],
+                        [NATURAL_GAS, CRUDE_OIL, 'Other'], columns)
+
+
+@pytest.mark.parametrize('exio_version, density', [('3.8', 1), ('3.9', 0.7)])
+def test_natural_gas_row_converted_with_its_density(exio_version, density):
+    C = parse_iw.convert_exiobase_units(cfs(), exio_version)
+
+    assert C.loc[NATURAL_GAS].tolist() == pytest.approx([2 / density, 40e6 / density, 0, 0, 0])
+    assert C.loc[CRUDE_OIL].tolist() == pytest.approx([3, 50e6, 0, 0, 0])
+    assert C.loc['Other'].tolist() == pytest.approx([0, 0, 0.5e6, 0.2e6, 0.1e6])
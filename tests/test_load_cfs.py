@@ -0,0 +1,64 @@
+import json
+import logging
+import os
+
+import pandas as pd
+import pytest
+
+import benchmark_iw
+import parse_iw
+
+# the loaders and the stages applying to their CFs, up to the first stage rewriting master_db as a whole
+LAST_STAGE = 'harmonize'
+
+
+@pytest.fixture(scope='module')
+def synthetic_db(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('db') / 'synthetic_iw.db')
+    benchmark_iw.write_synthetic_database(path, scale=1, seed=0)
+    return path
+
+
+def load_cfs(path, last_stage=LAST_STAGE, **kwargs):
+    parser = parse_iw.Parse(path, '2.1', [], '2', data_files=benchmark_iw.synthetic_data_files(1), **kwargs)
+    parser.logger.setLevel(logging.WARNING)
+    try:
+        parser.load_cfs(last_stage=last_stage)
+    finally:
+        parser.conn.close()
+    return parser
+
+
+def test_pool_gives_serial_master_db(synthetic_db):
+    serial = load_cfs(synthetic_db, benchmark_iw.LAST_LOADER_STAGE).master_db
+    pool = load_cfs(synthetic_db, benchmark_iw.LAST_LOADER_STAGE, n_jobs=2).master_db
+
+    pd.testing.assert_frame_equal(serial, pool, check_exact=True)
+
+
+def test_checkpointed_load_cfs_gives_unstaged_master_db(synthetic_db, tmp_path):
+    parser = load_cfs(synthetic_db)
+    unstaged = parser.master_db
+    stages = [stage for stage, message, steps in parser.get_load_cfs_stages(False)]
+    stages = stages[:stages.index(LAST_STAGE) + 1]
+
+    # first run, every stage and loader computed and stored
+    checkpoint_dir = str(tmp_path / 'checkpoints')
+    pd.testing.assert_frame_equal(load_cfs(synthetic_db, checkpoint_dir=checkpoint_dir).master_db, unstaged,
+                                  check_exact=True)
+
+    # resumed from a middle stage, the outputs of the later loaders being reused
+    middle = stages.index('particulates')
+    for file in os.listdir(checkpoint_dir):
+        if file.endswith('.pickle') and file.rsplit('_', 1)[0] in stages[middle + 1:]:
+            os.remove(os.path.join(checkpoint_dir, file))
+    resumed = load_cfs(synthetic_db, checkpoint_dir=checkpoint_dir)
+    with open(os.path.join(checkpoint_dir, 'build_manifest.json')) as f:
+        loaders = json.load(f)['loaders']
+    assert loaders['load_basic_cfs']['status'] == 'restored'
+    assert loaders['load_fisheries_cfs']['status'] == 'reused'
+    pd.testing.assert_frame_equal(resumed.master_db, unstaged, check_exact=True)
+
+    # restored from the checkpoint of the last stage
+    pd.testing.assert_frame_equal(load_cfs(synthetic_db, checkpoint_dir=checkpoint_dir).master_db, unstaged,
+                                  check_exact=True)
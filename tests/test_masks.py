@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+
+import parse_iw
+
+
+@pytest.mark.parametrize('mask', [lambda df: parse_iw.mask_contains(df, 'Elem flow name', ', FR'),
+                                  lambda df: parse_iw.mask_contains(df, 'Elem flow name', 'AMMONIA', case=False),
+                                  lambda df: parse_iw.mask_region(df, 'Elem flow name', ['FR', 'RER']),
+                                  lambda df: parse_iw.mask_eq(df, 'Elem flow name', 'Ammonia'),
+                                  lambda df: parse_iw.mask_isin(df, 'Elem flow name', ['Ammonia', 'Ammonia, FR'])])
+def test_masks_of_compacted_columns(mask):
+    df = pd.DataFrame({'Elem flow name': ['Ammonia, FR', 'Ammonia', None, 'Ammonia, FR', 'Nitrogen oxides, RER']})
+    compacted = df.copy()
+    # categories that no row uses are never selected
+    compacted['Elem flow name'] = compacted['Elem flow name'].astype('category').cat.add_categories(['Zinc, FR'])
+
+    assert (mask(df) == mask(compacted)).all()